@@ -5,7 +5,10 @@ Similar to Windows 'Everything' app but runs in terminal
 """
 
 import argparse
+import errno
 import os
+import select
+import struct
 import sys
 import time
 from pathlib import Path
@@ -15,9 +18,10 @@ import re
 import fnmatch
 from datetime import datetime, timedelta
 import threading
+import queue
 import signal
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Color codes for terminal output
 class Colors:
@@ -41,16 +45,123 @@ class FileEntry:
     is_directory: bool
     extension: str
 
+@dataclass
+class DirectoryState:
+    """Directory mtime and child count as of its last listing"""
+    path: str
+    mtime: float
+    child_count: int
+    scanned_time: float
+    children: Optional[set] = None  # Paths seen in that listing, to detect removals
+    own_size: int = 0  # Totals over the files directly inside, from the same listing
+    own_files: int = 0
+    own_newest: float = 0.0
+
+@dataclass
+class DirectoryRollup:
+    """Recursive totals for a directory"""
+    path: str
+    size: int
+    file_count: int
+    newest_mtime: float
+
 class DatabaseManager:
     """Manages SQLite database for file indexing"""
     
+    # Secondary indexes on files; dropped during initial bulk builds and recreated once at the end
+    INDEXES = {
+        'idx_name': 'name',
+        'idx_path': 'path',
+        'idx_extension': 'extension',
+        'idx_size': 'size',
+        'idx_modified': 'modified_time',
+    }
+    
+    # Triggers that keep the trigram name index in step with files
+    SEARCH_TRIGGERS = {
+        'files_fts_insert': """
+            CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+                INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+            END
+        """,
+        'files_fts_delete': """
+            CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+                INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+        """,
+        'files_fts_update': """
+            CREATE TRIGGER IF NOT EXISTS files_fts_update AFTER UPDATE OF name ON files
+            WHEN old.name IS NOT new.name BEGIN
+                INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+            END
+        """,
+    }
+    
+    # Triggers that keep the single stats row in step with files, inside the writing transaction
+    STATS_TRIGGERS = {
+        'stats_insert': """
+            CREATE TRIGGER IF NOT EXISTS stats_insert AFTER INSERT ON files BEGIN
+                UPDATE stats SET
+                    total_entries = total_entries + 1,
+                    total_directories = total_directories + new.is_directory,
+                    total_size = total_size + CASE WHEN new.is_directory THEN 0 ELSE new.size END
+                WHERE id = 1;
+            END
+        """,
+        'stats_delete': """
+            CREATE TRIGGER IF NOT EXISTS stats_delete AFTER DELETE ON files BEGIN
+                UPDATE stats SET
+                    total_entries = total_entries - 1,
+                    total_directories = total_directories - old.is_directory,
+                    total_size = total_size - CASE WHEN old.is_directory THEN 0 ELSE old.size END
+                WHERE id = 1;
+            END
+        """,
+        'stats_update': """
+            CREATE TRIGGER IF NOT EXISTS stats_update AFTER UPDATE OF size, is_directory ON files BEGIN
+                UPDATE stats SET
+                    total_directories = total_directories - old.is_directory + new.is_directory,
+                    total_size = total_size
+                        - CASE WHEN old.is_directory THEN 0 ELSE old.size END
+                        + CASE WHEN new.is_directory THEN 0 ELSE new.size END
+                WHERE id = 1;
+            END
+        """,
+    }
+    
+    # Upsert keeps the row id stable, so the external-content search index stays consistent
+    UPSERT_SQL = """
+        INSERT INTO files
+        (path, name, size, modified_time, is_directory, extension, indexed_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            name = excluded.name,
+            size = excluded.size,
+            modified_time = excluded.modified_time,
+            is_directory = excluded.is_directory,
+            extension = excluded.extension,
+            indexed_time = excluded.indexed_time
+    """
+    
+    # Below this many rows a LIKE scan is as fast as the trigram index
+    FTS_MIN_ROWS = 20000
+    
+    # meta key set while a bulk load runs without its indexes and triggers
+    BULK_LOAD_FLAG = 'bulk_load_in_progress'
+    
     def __init__(self, db_path: str = "everything_cli.db"):
         self.db_path = db_path
+        self.has_fts = False
+        # One bulk writer at a time: a watcher sync waits while a foreground index or sync runs
+        self.write_lock = threading.Lock()
         self.init_database()
     
     def init_database(self):
         """Initialize the database with required tables"""
         with sqlite3.connect(self.db_path) as conn:
+            # WAL is persistent: readers never block the indexer and commits skip the rollback journal
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS files (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -63,20 +174,166 @@ class DatabaseManager:
                     indexed_time REAL NOT NULL
                 )
             """)
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_name ON files(name)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_path ON files(path)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_extension ON files(extension)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_size ON files(size)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_modified ON files(modified_time)")
+            # One row per listed directory; incremental syncs skip directories whose mtime is unchanged
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime REAL NOT NULL,
+                    child_count INTEGER NOT NULL,
+                    scanned_time REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent)")
+            # own_* cover the files directly inside a directory; size/file_count/newest_mtime the whole subtree
+            rollups_existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'dir_rollup'").fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dir_rollup (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    own_size INTEGER NOT NULL,
+                    own_files INTEGER NOT NULL,
+                    own_newest REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    file_count INTEGER NOT NULL,
+                    newest_mtime REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_parent ON dir_rollup(parent)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_size ON dir_rollup(size)")
+            if not rollups_existed:
+                conn.execute("DELETE FROM dirs")  # Older index: make the next sync list everything once
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_entries INTEGER NOT NULL,
+                    total_directories INTEGER NOT NULL,
+                    total_size INTEGER NOT NULL
+                )
+            """)
+            if not conn.execute("SELECT 1 FROM stats").fetchone():
+                self.refresh_stats(conn)
+            # Small key/value flags, e.g. a bulk load that has not reached its final pass yet
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID")
+            existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'files_fts'").fetchone()
+            try:
+                # Trigram tokens make any substring of 3+ characters an index lookup (SQLite 3.34+)
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS files_fts
+                    USING fts5(name, content='files', content_rowid='id', tokenize='trigram')
+                """)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                self.has_fts = False  # No FTS5/trigram in this SQLite build: searches use LIKE
+            conn.commit()
+            bulk_load = self.bulk_load_pending(conn)
+            if bulk_load and self.writer_active():
+                return  # A load is running: its indexes and triggers come back when it finishes
+            self.create_indexes(conn)
+            if self.has_fts and not existed:
+                self.rebuild_search_index(conn)
+            if bulk_load:
+                # A bulk load died before its final pass: the search index, stats and rollups never saw its rows
+                self.rebuild_search_index(conn)
+                self.refresh_stats(conn)
+                self.refresh_rollups(conn, [path for path, in conn.execute("SELECT path FROM dir_rollup")])
+                self.set_bulk_load_flag(conn, False)
+    
+    def bulk_load_pending(self, conn: sqlite3.Connection) -> bool:
+        """True if a bulk load that runs without its indexes and triggers has not finished (one key lookup)"""
+        return conn.execute("SELECT 1 FROM meta WHERE key = ?", (self.BULK_LOAD_FLAG,)).fetchone() is not None
+    
+    def writer_active(self) -> bool:
+        """True if another connection holds the write lock, e.g. a bulk load that is still running"""
+        probe = sqlite3.connect(self.db_path, timeout=0, isolation_level=None)
+        try:
+            probe.execute("BEGIN IMMEDIATE")
+            probe.execute("ROLLBACK")
+            return False
+        except sqlite3.OperationalError:
+            return True
+        finally:
+            probe.close()
+    
+    def set_bulk_load_flag(self, conn: sqlite3.Connection, in_progress: bool):
+        if in_progress:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, 1)", (self.BULK_LOAD_FLAG,))
+        else:
+            conn.execute("DELETE FROM meta WHERE key = ?", (self.BULK_LOAD_FLAG,))
+    
+    def create_indexes(self, conn: sqlite3.Connection):
+        """Create any missing secondary indexes and search-index triggers on the files table"""
+        for name, column in self.INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON files({column})")
+        for sql in self.STATS_TRIGGERS.values():
+            conn.execute(sql)
+        if self.has_fts:
+            for sql in self.SEARCH_TRIGGERS.values():
+                conn.execute(sql)
+    
+    def drop_indexes(self, conn: sqlite3.Connection):
+        """Drop the secondary indexes and triggers so a bulk load only maintains the table itself"""
+        for name in self.INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name in (*self.SEARCH_TRIGGERS, *self.STATS_TRIGGERS):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    
+    def rebuild_search_index(self, conn: sqlite3.Connection):
+        """Regenerate the trigram index from the files table in one pass"""
+        if self.has_fts:
+            conn.execute("INSERT INTO files_fts(files_fts) VALUES ('rebuild')")
+    
+    def refresh_stats(self, conn: sqlite3.Connection):
+        """Recompute the stats row with one scan, after loads that ran without the triggers"""
+        conn.execute("""
+            INSERT OR REPLACE INTO stats (id, total_entries, total_directories, total_size)
+            SELECT 1, COUNT(*), COALESCE(SUM(is_directory), 0),
+                   COALESCE(SUM(CASE WHEN is_directory THEN 0 ELSE size END), 0)
+            FROM files
+        """)
+    
+    def refresh_rollups(self, conn: sqlite3.Connection, paths):
+        """Recompute recursive totals for paths and every indexed ancestor, deepest first
+        
+        Each directory adds its own files to the totals of its direct
+        subdirectories, which are already current by the time it is reached.
+        """
+        pending = set(paths)
+        order = list(pending)
+        for path in order:  # Grows while walking up
+            parent = os.path.dirname(path)
+            if parent != path and parent not in pending and conn.execute(
+                    "SELECT 1 FROM dir_rollup WHERE path = ?", (parent,)).fetchone():
+                pending.add(parent)
+                order.append(parent)
+        order.sort(key=lambda path: path.count(os.sep), reverse=True)
+        conn.executemany("""
+            UPDATE dir_rollup SET (size, file_count, newest_mtime) = (
+                SELECT dir_rollup.own_size + COALESCE(SUM(child.size), 0),
+                       dir_rollup.own_files + COALESCE(SUM(child.file_count), 0),
+                       MAX(dir_rollup.own_newest, COALESCE(MAX(child.newest_mtime), 0))
+                FROM dir_rollup AS child WHERE child.parent = dir_rollup.path
+            )
+            WHERE path = ?
+        """, ((path,) for path in order))
+    
+    def connect_for_bulk(self) -> sqlite3.Connection:
+        """Open a long-lived connection tuned for large write transactions"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        return conn
+    
+    def bulk_ingest(self, batch_size: int = 10000, transaction_rows: int = 500000) -> 'BulkIngest':
+        """Return a context manager that writes FileEntry objects in large batches"""
+        return BulkIngest(self, batch_size, transaction_rows)
     
     def add_file(self, file_entry: FileEntry):
         """Add or update a file entry in the database"""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO files 
-                (path, name, size, modified_time, is_directory, extension, indexed_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            conn.execute(self.UPSERT_SQL, (
                 file_entry.path,
                 file_entry.name,
                 file_entry.size,
@@ -86,14 +343,60 @@ class DatabaseManager:
                 time.time()
             ))
     
+    @staticmethod
+    def parse_query(query: str) -> List[str]:
+        """Split a query into terms; "quoted text" stays one term"""
+        return [quoted or bare for quoted, bare in re.findall(r'"([^"]*)"|(\S+)', query) if quoted or bare]
+    
+    @staticmethod
+    def _like_pattern(term: str) -> str:
+        """LIKE pattern for a term: substring match, or whole-name match if it has * or ? wildcards"""
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        if '*' in term or '?' in term:
+            return escaped.replace('*', '%').replace('?', '_')
+        return f"%{escaped}%"
+    
+    def _name_conditions(self, conn: sqlite3.Connection, query: str) -> Tuple[str, list]:
+        """Build the WHERE clause matching names against every term of the query
+        
+        Literal runs of 3+ characters are looked up in the trigram index; short
+        terms and wildcard terms are then checked with LIKE on the candidates
+        only. Small databases, and queries with nothing indexable, just use LIKE.
+        """
+        terms = self.parse_query(query) or ['']
+        like_sql = " AND ".join("name LIKE ? ESCAPE '\\'" for _ in terms)
+        like_params = [self._like_pattern(term) for term in terms]
+        
+        phrases = []
+        exact = True  # Whether the trigram match alone already implies every LIKE
+        for term in terms:
+            runs = [run for run in re.split(r'[*?]', term) if len(run) >= 3]
+            if runs != [term]:
+                exact = False
+            phrases.extend('"' + run.replace('"', '""') + '"' for run in runs)
+        
+        if not self.has_fts or not phrases:
+            return like_sql, like_params
+        row_estimate = conn.execute("SELECT MAX(id) FROM files").fetchone()[0] or 0
+        if row_estimate < self.FTS_MIN_ROWS:
+            return like_sql, like_params
+        
+        sql = "id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?)"
+        params = [" AND ".join(phrases)]
+        if not exact:
+            sql += " AND " + like_sql
+            params += like_params
+        return sql, params
+    
     def search_files(self, query: str, limit: int = 100, **filters) -> List[FileEntry]:
-        """Search for files matching the query with optional filters"""
-        sql = """
+        """Search for files whose names contain every term of the query, with optional filters"""
+        conn = sqlite3.connect(self.db_path)
+        name_sql, params = self._name_conditions(conn, query)
+        sql = f"""
             SELECT path, name, size, modified_time, is_directory, extension
             FROM files
-            WHERE name LIKE ?
+            WHERE {name_sql}
         """
-        params = [f"%{query}%"]
         
         # Add filters
         if filters.get('extension'):
@@ -130,7 +433,7 @@ class DatabaseManager:
         
         sql += f" ORDER BY {order_by} LIMIT {limit}"
         
-        with sqlite3.connect(self.db_path) as conn:
+        with conn:
             cursor = conn.execute(sql, params)
             results = []
             for row in cursor.fetchall():
@@ -191,14 +494,9 @@ class DatabaseManager:
     def get_stats(self) -> dict:
         """Get database statistics"""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM files")
-            total_files = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM files WHERE is_directory = 1")
-            total_dirs = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT SUM(size) FROM files WHERE is_directory = 0")
-            total_size = cursor.fetchone()[0] or 0
+            # Maintained by triggers and bulk loads, so this is a single-row read
+            total_files, total_dirs, total_size = conn.execute(
+                "SELECT total_entries, total_directories, total_size FROM stats WHERE id = 1").fetchone()
             
             return {
                 'total_files': total_files - total_dirs,
@@ -207,6 +505,40 @@ class DatabaseManager:
                 'total_entries': total_files
             }
     
+    @staticmethod
+    def subtree_bounds(path: str) -> Tuple[str, str]:
+        """Half-open path range [low, high) that holds everything below path"""
+        prefix = path.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+    
+    def load_directory_states(self, root: str) -> Tuple[dict, dict]:
+        """Known directories under root: ({path: (mtime, scanned_time)}, {parent: [subdirectories]})"""
+        low, high = self.subtree_bounds(root)
+        states = {}
+        children = defaultdict(list)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT path, parent, mtime, scanned_time FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, low, high))
+            for path, parent, mtime, scanned_time in rows:
+                states[path] = (mtime, scanned_time)
+                if path != root:
+                    children[parent].append(path)
+        return states, children
+    
+    def top_directories(self, limit: int = 20, parent: Optional[str] = None) -> List[DirectoryRollup]:
+        """Largest directories by recursive size, optionally only the direct subdirectories of parent"""
+        sql = "SELECT path, size, file_count, newest_mtime FROM dir_rollup"
+        params = []
+        if parent is not None:
+            sql += " WHERE parent = ?"
+            params.append(os.path.abspath(parent))
+        sql += " ORDER BY size DESC, path LIMIT ?"
+        params.append(limit)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            return [DirectoryRollup(*row) for row in conn.execute(sql, params)]
+    
     def is_c_drive_indexed(self) -> bool:
         """Check if C drive has been indexed"""
         with sqlite3.connect(self.db_path) as conn:
@@ -217,7 +549,350 @@ class DatabaseManager:
     def clear_database(self):
         """Clear all entries from the database"""
         with sqlite3.connect(self.db_path) as conn:
+            # Empty the search index in one statement instead of one trigger call per row
+            self.drop_indexes(conn)
             conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM dirs")
+            conn.execute("DELETE FROM dir_rollup")
+            self.refresh_stats(conn)
+            if self.has_fts:
+                conn.execute("INSERT INTO files_fts(files_fts) VALUES ('delete-all')")
+            self.create_indexes(conn)
+
+class BulkIngest:
+    """Batched writer for index builds on one long-lived connection
+    
+    Entries are buffered and written with executemany inside large transactions,
+    so a build costs one fsync per transaction instead of one per file. When the
+    table starts out empty the secondary indexes and search triggers are dropped
+    for the duration of the load and rebuilt in a single pass at the end.
+    Directory states are written alongside, and rows for children that have
+    disappeared from a listed directory are deleted in bulk. Directory rollups
+    and the stats row are brought up to date in the final transaction.
+    """
+    
+    DIR_UPSERT_SQL = """
+        INSERT INTO dirs (path, parent, mtime, child_count, scanned_time)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            parent = excluded.parent,
+            mtime = excluded.mtime,
+            child_count = excluded.child_count,
+            scanned_time = excluded.scanned_time
+    """
+    
+    # New rows start with their own totals; refresh_rollups adds the subdirectories
+    ROLLUP_UPSERT_SQL = """
+        INSERT INTO dir_rollup (path, parent, own_size, own_files, own_newest, size, file_count, newest_mtime)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            parent = excluded.parent,
+            own_size = excluded.own_size,
+            own_files = excluded.own_files,
+            own_newest = excluded.own_newest
+    """
+    
+    def __init__(self, db_manager: DatabaseManager, batch_size: int = 10000, transaction_rows: int = 500000):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.transaction_rows = transaction_rows
+        self.conn = None
+        self.batch = []
+        self.dir_rows = []
+        self.dir_mtimes = []  # (mtime, path) for the directory's own row in files
+        self.rollup_rows = []
+        self.touched_dirs = set()  # Directories whose own totals were rewritten
+        self.deleted_paths = []
+        self.deleted_subtrees = []
+        self.rows_in_transaction = 0
+        self.rows_written = 0
+        self.rows_deleted = 0
+        self.deferred_indexes = False
+    
+    def __enter__(self):
+        self.conn = self.db_manager.connect_for_bulk()
+        initial_build = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM files)").fetchone()[0]
+        if initial_build:
+            # Committed before any row, so a load that dies midway is finished off on the next open
+            self.db_manager.set_bulk_load_flag(self.conn, True)
+            self.db_manager.drop_indexes(self.conn)
+            self.deferred_indexes = True
+        # Take the write lock up front, so another process opening the index can tell the load is live
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self
+    
+    def add(self, file_entry: FileEntry):
+        """Queue one entry; writes happen once a full batch has accumulated"""
+        self.batch.append((
+            file_entry.path,
+            file_entry.name,
+            file_entry.size,
+            file_entry.modified_time,
+            file_entry.is_directory,
+            file_entry.extension,
+        ))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+    
+    def record_directory(self, state: 'DirectoryState'):
+        """Queue a directory's state and removal of its children that no longer exist"""
+        parent = os.path.dirname(state.path)
+        self.dir_rows.append((state.path, parent if parent != state.path else None,
+                              state.mtime, state.child_count, state.scanned_time))
+        self.dir_mtimes.append((state.mtime, state.path))
+        self.rollup_rows.append((state.path, parent if parent != state.path else None,
+                                 state.own_size, state.own_files, state.own_newest,
+                                 state.own_size, state.own_files, state.own_newest))
+        self.touched_dirs.add(state.path)
+        if state.children is not None and not self.deferred_indexes:
+            for path, is_directory in self._indexed_children(state.path):
+                if path not in state.children:
+                    self.deleted_paths.append((path,))
+                    if is_directory:
+                        self.deleted_subtrees.append(self.db_manager.subtree_bounds(path))
+        if len(self.dir_rows) >= self.batch_size:
+            self.flush()
+    
+    def _indexed_children(self, directory: str):
+        """Yield (path, is_directory) for the indexed direct children of directory
+        
+        Seeks along the path index and jumps over each child's subtree, so the
+        cost follows the number of children rather than the size of the subtree.
+        """
+        low, high = self.db_manager.subtree_bounds(directory)
+        cursor = low
+        while True:
+            row = self.conn.execute(
+                "SELECT path, is_directory FROM files WHERE path >= ? AND path < ? ORDER BY path LIMIT 1",
+                (cursor, high)).fetchone()
+            if row is None:
+                return
+            name = row[0][len(low):].split(os.sep, 1)[0]
+            child = low + name
+            if child == row[0]:
+                yield row
+                cursor = child + '\0'
+            else:
+                cursor = self.db_manager.subtree_bounds(child)[1]  # Descendant of an unindexed child
+    
+    def flush(self):
+        """Write the buffered batch, committing once the transaction is large enough"""
+        if self.deleted_paths or self.deleted_subtrees:
+            self.rows_deleted += self.conn.executemany(
+                "DELETE FROM files WHERE path >= ? AND path < ?", self.deleted_subtrees).rowcount
+            self.rows_deleted += self.conn.executemany(
+                "DELETE FROM files WHERE path = ?", self.deleted_paths).rowcount
+            self.conn.executemany("DELETE FROM dirs WHERE path >= ? AND path < ?", self.deleted_subtrees)
+            self.conn.executemany("DELETE FROM dirs WHERE path = ?", self.deleted_paths)
+            self.conn.executemany("DELETE FROM dir_rollup WHERE path >= ? AND path < ?", self.deleted_subtrees)
+            self.conn.executemany("DELETE FROM dir_rollup WHERE path = ?", self.deleted_paths)
+            self.rows_in_transaction += len(self.deleted_paths)
+            self.deleted_paths = []
+            self.deleted_subtrees = []
+        if self.batch:
+            indexed_time = time.time()
+            self.conn.executemany(self.db_manager.UPSERT_SQL, (row + (indexed_time,) for row in self.batch))
+            self.rows_in_transaction += len(self.batch)
+            self.rows_written += len(self.batch)
+            self.batch = []
+        if self.dir_rows:
+            self.conn.executemany(self.DIR_UPSERT_SQL, self.dir_rows)
+            self.conn.executemany("UPDATE files SET modified_time = ? WHERE path = ?", self.dir_mtimes)
+            self.conn.executemany(self.ROLLUP_UPSERT_SQL, self.rollup_rows)
+            self.rows_in_transaction += len(self.dir_rows)
+            self.dir_rows = []
+            self.dir_mtimes = []
+            self.rollup_rows = []
+        if self.rows_in_transaction >= self.transaction_rows:
+            self.conn.execute("COMMIT")
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.rows_in_transaction = 0
+    
+    def __exit__(self, exc_type, exc, tb):
+        # Whatever was collected is kept, including on Ctrl+C
+        try:
+            self.flush()
+            self.db_manager.refresh_rollups(self.conn, self.touched_dirs)
+            if self.deferred_indexes:
+                self.db_manager.refresh_stats(self.conn)  # The stats triggers were dropped for the load
+            self.conn.execute("COMMIT")
+            if self.deferred_indexes:
+                self.db_manager.create_indexes(self.conn)
+                self.db_manager.rebuild_search_index(self.conn)
+                self.db_manager.set_bulk_load_flag(self.conn, False)
+            self.conn.execute("PRAGMA optimize")
+        finally:
+            self.conn.close()
+            self.conn = None
+        return False
+
+class ParallelCrawler:
+    """Multi-threaded os.scandir crawler that streams FileEntry batches
+    
+    Each worker owns a deque of directories: it pushes the subdirectories it
+    finds and pops its own newest work (depth-first), and when it runs dry it
+    steals the oldest directory from another worker, usually the top of a large
+    unexplored subtree. Sizes and mtimes come from the DirEntry, which is free on
+    Windows and one stat on POSIX. Batches go to emit() from the worker threads;
+    besides FileEntry objects they carry one DirectoryState per listed directory.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 2000, should_stop=None):
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.batch_size = batch_size
+        self.should_stop = should_stop or (lambda: False)
+        self.directories_scanned = 0
+        self.directories_listed = 0
+        self.errors = 0
+        self._deques = [deque() for _ in range(self.workers)]
+        self._cond = threading.Condition()
+        self._pending = 0  # Directories queued or being scanned
+        self._stopped = False
+    
+    def _stopping(self) -> bool:
+        return self._stopped or self.should_stop()
+    
+    def crawl(self, roots: List[str], emit):
+        """Crawl everything below the roots, calling emit(batch) with lists of entries"""
+        self._deques[0].extend(roots)
+        self._pending = len(roots)
+        threads = [threading.Thread(target=self._work, args=(i, emit), daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # Ctrl+C or sys.exit in the main thread: let workers finish their current directory
+            self._stopped = True
+            for thread in threads:
+                thread.join()
+            raise
+    
+    def _next_directory(self, index: int) -> Optional[str]:
+        own = self._deques[index]
+        while True:
+            try:
+                return own.pop()
+            except IndexError:
+                pass
+            for offset in range(1, self.workers):
+                try:
+                    return self._deques[(index + offset) % self.workers].popleft()
+                except IndexError:
+                    continue
+            with self._cond:
+                if self._pending == 0 or self._stopping():
+                    return None
+                self._cond.wait(0.05)
+    
+    def scan(self, directory: str, push) -> Tuple[List[str], bool]:
+        """Visit one directory; returns (subdirectories to crawl, whether it was listed)"""
+        return self.list_directory(directory, os.stat(directory), push), True
+    
+    def list_directory(self, directory: str, dir_stat: os.stat_result, push) -> List[str]:
+        """push() every entry of directory plus its DirectoryState; returns its subdirectories
+        
+        dir_stat is taken before listing, so a change made during the listing
+        leaves a newer mtime behind and the directory is listed again next time.
+        """
+        scanned_time = time.time()
+        subdirs = []
+        children = set()
+        own_size = own_files = 0
+        own_newest = 0.0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if self._stopping():
+                    return subdirs  # Incomplete listing: no state, so no rows are removed
+                children.add(entry.path)
+                try:
+                    is_directory = entry.is_dir()
+                    stat = entry.stat()
+                except (OSError, PermissionError):
+                    continue
+                if is_directory:
+                    push(FileEntry(entry.path, entry.name, 0, stat.st_mtime, True, ""))
+                    if not entry.is_symlink():  # Same as os.walk: list linked dirs, don't descend
+                        subdirs.append(entry.path)
+                else:
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    push(FileEntry(entry.path, entry.name, stat.st_size, stat.st_mtime, False, extension))
+                    own_size += stat.st_size
+                    own_files += 1
+                    own_newest = max(own_newest, stat.st_mtime)
+        push(DirectoryState(directory, dir_stat.st_mtime, len(children), scanned_time, children,
+                            own_size, own_files, own_newest))
+        return subdirs
+    
+    def _work(self, index: int, emit):
+        batch = []
+        
+        def push(item):
+            nonlocal batch
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                emit(batch)
+                batch = []
+        
+        while True:
+            directory = self._next_directory(index)
+            if directory is None:
+                break
+            subdirs, listed, failed = [], False, False
+            try:
+                subdirs, listed = self.scan(directory, push)
+            except (OSError, PermissionError):
+                failed = True
+            with self._cond:
+                self._pending += len(subdirs) - 1
+                self.directories_scanned += 1
+                self.directories_listed += listed
+                self.errors += failed
+                if subdirs:
+                    self._deques[index].extend(subdirs)
+                if subdirs or self._pending == 0:
+                    self._cond.notify_all()
+        if batch:
+            emit(batch)
+
+class IncrementalCrawler(ParallelCrawler):
+    """ParallelCrawler that only lists directories whose mtime changed since the last scan
+    
+    Adding, removing or renaming an entry updates its directory's mtime, so an
+    unchanged directory costs one stat: its known subdirectories are taken from
+    the dirs table instead of a listing. Files edited in place do not touch the
+    directory mtime; a full index, or a watcher, picks those up.
+    """
+    
+    # Timestamps this close to the scan time may hide a later change in the same tick (FAT: 2 s)
+    RACY_WINDOW = 2.0
+    
+    def __init__(self, states: dict, children: dict, force: frozenset = frozenset(),
+                 descend_unchanged: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.states = states
+        self.children = children
+        self.force = force
+        self.descend_unchanged = descend_unchanged
+        self._forced_seen = set()
+    
+    def scan(self, directory: str, push) -> Tuple[List[str], bool]:
+        if directory in self.force:
+            with self._cond:  # A forced directory can be a root and a subdirectory of another root
+                if directory in self._forced_seen:
+                    return [], False
+                self._forced_seen.add(directory)
+        try:
+            dir_stat = os.stat(directory)
+        except FileNotFoundError:
+            return [], False  # Gone: the parent's listing removes its rows
+        known = self.states.get(directory)
+        if (directory not in self.force and known is not None and known[0] == dir_stat.st_mtime
+                and known[0] < known[1] - self.RACY_WINDOW):
+            return (self.children.get(directory, []) if self.descend_unchanged else []), False
+        return self.list_directory(directory, dir_stat, push), True
 
 class FileIndexer:
     """Indexes files and directories"""
@@ -226,88 +901,290 @@ class FileIndexer:
         self.db_manager = db_manager
         self.should_stop = False
         self.indexed_count = 0
+        self.removed_count = 0
         self.start_time = None
+        self.writer_error = None
     
     def stop(self):
         """Stop the indexing process"""
         self.should_stop = True
     
-    def index_directory(self, directory: str, show_progress: bool = True):
-        """Index all files in a directory recursively"""
-        self.should_stop = False
-        self.indexed_count = 0
-        self.start_time = time.time()
+    def index_directory(self, directory: str, show_progress: bool = True, workers: Optional[int] = None):
+        """Index all files in a directory recursively
         
+        A ParallelCrawler walks the tree on several threads and a single writer
+        thread owns the database connection, so enumeration latency overlaps
+        across directories while writes stay batched.
+        """
         directory = os.path.abspath(directory)
-        
         if show_progress:
             print(f"{Colors.OKBLUE}Indexing directory: {directory}{Colors.ENDC}")
+        crawler = ParallelCrawler(workers, should_stop=lambda: self.should_stop)
+        if not self._run(crawler, [directory], show_progress):
+            return
         
-        try:
-            for root, dirs, files in os.walk(directory):
-                if self.should_stop:
-                    break
-                
-                # Index directories
-                for dir_name in dirs:
-                    if self.should_stop:
-                        break
-                    
-                    dir_path = os.path.join(root, dir_name)
-                    try:
-                        stat = os.stat(dir_path)
-                        file_entry = FileEntry(
-                            path=dir_path,
-                            name=dir_name,
-                            size=0,
-                            modified_time=stat.st_mtime,
-                            is_directory=True,
-                            extension=""
-                        )
-                        self.db_manager.add_file(file_entry)
-                        self.indexed_count += 1
-                        
-                        if show_progress and self.indexed_count % 1000 == 0:
-                            print(f"\rIndexed {self.indexed_count} items...", end="", flush=True)
-                    
-                    except (OSError, PermissionError):
-                        continue
-                
-                # Index files
-                for file_name in files:
-                    if self.should_stop:
-                        break
-                    
-                    file_path = os.path.join(root, file_name)
-                    try:
-                        stat = os.stat(file_path)
-                        extension = os.path.splitext(file_name)[1].lower()
-                        
-                        file_entry = FileEntry(
-                            path=file_path,
-                            name=file_name,
-                            size=stat.st_size,
-                            modified_time=stat.st_mtime,
-                            is_directory=False,
-                            extension=extension
-                        )
-                        self.db_manager.add_file(file_entry)
-                        self.indexed_count += 1
-                        
-                        if show_progress and self.indexed_count % 1000 == 0:
-                            print(f"\rIndexed {self.indexed_count} items...", end="", flush=True)
-                    
-                    except (OSError, PermissionError):
-                        continue
+        elapsed_time = time.time() - self.start_time
+        if show_progress:
+            print(f"\n{Colors.OKGREEN}Indexing completed!{Colors.ENDC}")
+            print(f"Indexed {self.indexed_count:,} items in {elapsed_time:.2f} seconds "
+                  f"({crawler.directories_scanned:,} directories, {crawler.workers} threads)")
+            if self.removed_count:
+                print(f"Removed {self.removed_count:,} entries that no longer exist")
+    
+    def sync_directory(self, directory: str, show_progress: bool = True, workers: Optional[int] = None,
+                       force: Tuple[str, ...] = (), descend_unchanged: bool = True):
+        """Bring the index for a directory up to date, listing only directories that changed
         
-        except KeyboardInterrupt:
-            print(f"\n{Colors.WARNING}Indexing interrupted by user{Colors.ENDC}")
+        force names directories to list even if their mtime is unchanged (e.g.
+        ones a watcher saw files modified in). With descend_unchanged off, only
+        the given directories and anything new below them are visited.
+        """
+        directory = os.path.abspath(directory)
+        states, children = self.db_manager.load_directory_states(directory)
+        force = frozenset(os.path.abspath(path) for path in force)
+        roots = sorted(force) or [directory]
+        if show_progress:
+            print(f"{Colors.OKBLUE}Syncing directory: {directory} "
+                  f"({len(states):,} directories known){Colors.ENDC}")
+        crawler = IncrementalCrawler(states, children, force, descend_unchanged,
+                                     workers=workers, should_stop=lambda: self.should_stop)
+        if not self._run(crawler, roots, show_progress):
             return
         
         elapsed_time = time.time() - self.start_time
         if show_progress:
-            print(f"\n{Colors.OKGREEN}Indexing completed!{Colors.ENDC}")
-            print(f"Indexed {self.indexed_count:,} items in {elapsed_time:.2f} seconds")
+            print(f"\n{Colors.OKGREEN}Sync completed!{Colors.ENDC}")
+            print(f"Listed {crawler.directories_listed:,} of {crawler.directories_scanned:,} directories, "
+                  f"updated {self.indexed_count:,} items, removed {self.removed_count:,} "
+                  f"in {elapsed_time:.2f} seconds")
+    
+    def _run(self, crawler: ParallelCrawler, roots: List[str], show_progress: bool) -> bool:
+        """Crawl with a writer thread draining into the database; False if interrupted"""
+        self.should_stop = False
+        self.indexed_count = 0
+        self.removed_count = 0
+        self.writer_error = None
+        
+        try:
+            while not self.db_manager.write_lock.acquire(timeout=0.25):
+                if self.should_stop:
+                    return False
+        except KeyboardInterrupt:
+            print(f"\n{Colors.WARNING}Indexing interrupted by user{Colors.ENDC}")
+            return False
+        try:
+            self.start_time = time.time()
+            batches = queue.Queue(maxsize=64)  # Bounded so a slow disk write throttles the crawl
+            writer = threading.Thread(target=self._write_batches, args=(batches, show_progress), daemon=True)
+            writer.start()
+            try:
+                crawler.crawl(roots, batches.put)
+            except KeyboardInterrupt:
+                print(f"\n{Colors.WARNING}Indexing interrupted by user{Colors.ENDC}")
+                return False
+            finally:
+                batches.put(None)
+                writer.join()
+        finally:
+            self.db_manager.write_lock.release()
+        
+        if self.writer_error is not None:
+            raise self.writer_error
+        return True
+    
+    def _write_batches(self, batches: queue.Queue, show_progress: bool):
+        """Writer thread: drain crawler batches into one bulk-ingest transaction stream"""
+        try:
+            with self.db_manager.bulk_ingest() as ingest:
+                try:
+                    while True:
+                        batch = batches.get()
+                        if batch is None:
+                            return
+                        previous = self.indexed_count
+                        for item in batch:
+                            if isinstance(item, DirectoryState):
+                                ingest.record_directory(item)
+                            else:
+                                ingest.add(item)
+                                self.indexed_count += 1
+                        if show_progress and self.indexed_count // 1000 != previous // 1000:
+                            print(f"\rIndexed {self.indexed_count} items...", end="", flush=True)
+                finally:
+                    ingest.flush()
+                    self.removed_count = ingest.rows_deleted
+        except Exception as e:
+            # Stop the crawl and keep draining so no worker blocks on a full queue
+            self.writer_error = e
+            self.should_stop = True
+            while batches.get() is not None:
+                pass
+
+class DirectoryWatcher:
+    """Keeps an indexed tree current in the background
+    
+    On Linux every indexed directory gets an inotify watch, and directories that
+    report events are re-listed after a short quiet period, or at the latest
+    max_delay seconds after the first event, so a directory that never stops
+    changing is still synced. Elsewhere, or when the inotify watch limit runs
+    out, the tree is re-synced by directory mtime every poll_interval seconds.
+    """
+    
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+                  | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, db_manager: DatabaseManager, root: str, poll_interval: float = 60.0,
+                 debounce: float = 1.0, use_inotify: bool = True, max_delay: float = 5.0):
+        self.db_manager = db_manager
+        self.root = os.path.abspath(root)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self.use_inotify = use_inotify and sys.platform.startswith('linux')
+        self.indexer = FileIndexer(db_manager)  # Own counters, so it never disturbs a foreground index
+        self.mode = None
+        self.syncs = 0
+        self.last_error = None
+        self._ignored_names = {os.path.basename(db_manager.db_path)}  # Our own writes must not re-trigger
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._libc = None
+        self._watches = {}  # wd -> directory
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='everything-watcher', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self.indexer.stop()
+        if self._thread is not None:
+            self._thread.join()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        try:
+            if self.use_inotify and self._open_inotify():
+                self.mode = 'inotify'
+                self._inotify_loop()
+            else:
+                self.mode = 'polling'
+                self._poll_loop()
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+    
+    def _sync(self, **kwargs):
+        try:
+            self.indexer.sync_directory(self.root, show_progress=False, **kwargs)
+            self.syncs += 1
+        except Exception as e:
+            self.last_error = e
+            print(f"\n{Colors.FAIL}Watcher sync of {self.root} failed: {e}{Colors.ENDC}", file=sys.stderr)
+    
+    def _poll_loop(self):
+        self._sync()
+        while not self._stop.wait(self.poll_interval):
+            self._sync()
+    
+    def _open_inotify(self) -> bool:
+        """Create the inotify instance and watch every known directory; False to fall back to polling"""
+        try:
+            import ctypes
+            import ctypes.util
+            self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        self._fd = fd
+        self._sync()  # Make sure the dirs table covers the tree before watching it
+        states, _ = self.db_manager.load_directory_states(self.root)
+        for directory in states:
+            if not self._watch(directory):
+                os.close(self._fd)
+                self._fd = None
+                self._watches = {}
+                return False
+        return True
+    
+    def _watch(self, directory: str) -> bool:
+        import ctypes
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+            return True
+        # ENOENT/EACCES just skip the directory; running out of watches (ENOSPC) means polling instead
+        return ctypes.get_errno() != errno.ENOSPC
+    
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='surrogateescape')
+            offset += length
+            yield wd, mask, name
+    
+    def _inotify_loop(self):
+        dirty = set()
+        new_dirs = set()
+        full_sync = False
+        deadline = latest = None
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.25)
+            if ready:
+                for wd, mask, name in self._read_events():
+                    if mask & self.IN_Q_OVERFLOW:
+                        full_sync = True
+                    directory = self._watches.get(wd)
+                    if mask & self.IN_IGNORED:
+                        self._watches.pop(wd, None)
+                        continue
+                    if directory is None or name in self._ignored_names or name.startswith(
+                            tuple(f"{ignored}-" for ignored in self._ignored_names)):
+                        continue
+                    dirty.add(directory)
+                    if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        new_dirs.add(os.path.join(directory, name))
+                if dirty or full_sync:
+                    now = time.time()
+                    if latest is None:  # First event since the last sync
+                        latest = now + self.max_delay
+                    deadline = min(now + self.debounce, latest)
+            if (dirty or full_sync) and time.time() >= deadline:
+                if full_sync:
+                    self._sync()
+                else:
+                    self._sync(force=tuple(dirty), descend_unchanged=False)
+                for directory in new_dirs:
+                    for current, subdirs, _ in os.walk(directory):
+                        self._watch(current)
+                dirty, new_dirs, full_sync = set(), set(), False
+                deadline = latest = None
 
 class EverythingCLI:
     """Main CLI application class"""
@@ -315,6 +1192,7 @@ class EverythingCLI:
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.indexer = FileIndexer(self.db_manager)
+        self.watcher = None
         self.setup_signal_handlers()
     
     def setup_signal_handlers(self):
@@ -322,6 +1200,8 @@ class EverythingCLI:
         def signal_handler(signum, frame):
             print(f"\n{Colors.WARNING}Stopping...{Colors.ENDC}")
             self.indexer.stop()
+            if self.watcher is not None:
+                self.watcher.stop()
             sys.exit(0)
         
         signal.signal(signal.SIGINT, signal_handler)
@@ -388,11 +1268,27 @@ class EverythingCLI:
                 else:
                     print(f"{icon} {color}{entry.name}{Colors.ENDC} - {entry.path}")
     
+    def print_directory_rollups(self, rollups: List[DirectoryRollup], parent: Optional[str] = None):
+        """Print directories ranked by recursive size"""
+        if not rollups:
+            if parent:
+                print(f"{Colors.WARNING}No indexed subdirectories under '{parent}'{Colors.ENDC}")
+            else:
+                print(f"{Colors.WARNING}No directory sizes yet. Use --index or --sync to build them.{Colors.ENDC}")
+            return
+        
+        print(f"\n{Colors.HEADER}{'Size':>12} {'Files':>10} {'Newest file':>19}  {'Path'}{Colors.ENDC}")
+        print("-" * 120)
+        for rollup in rollups:
+            newest = self.format_time(rollup.newest_mtime) if rollup.newest_mtime else "-"
+            print(f"{self.format_size(rollup.size):>12} {rollup.file_count:>10,} {newest:>19}  "
+                  f"{Colors.OKBLUE}{rollup.path}{Colors.ENDC}")
+    
     def interactive_search(self):
         """Interactive search mode"""
         print(f"{Colors.HEADER}Everything CLI - Interactive Search Mode{Colors.ENDC}")
         print("Type your search query (or 'quit' to exit):")
-        print("Commands: :stats, :clear, :index <path>, :list-by-size, :list-all, :help")
+        print("Commands: :stats, :clear, :index <path>, :sync <path>, :watch <path>, :list-by-size, :top-dirs, :list-all, :help")
         print()
         
         while True:
@@ -421,6 +1317,9 @@ class EverythingCLI:
                 break
             except EOFError:
                 break
+        
+        if self.watcher is not None:
+            self.watcher.stop()
     
     def handle_command(self, command: str):
         """Handle special commands"""
@@ -451,6 +1350,43 @@ class EverythingCLI:
             else:
                 print(f"{Colors.WARNING}Usage: :index <path>{Colors.ENDC}")
         
+        elif cmd == 'sync':
+            if len(parts) > 1:
+                path = ' '.join(parts[1:])
+                if os.path.exists(path):
+                    self.indexer.sync_directory(path)
+                else:
+                    print(f"{Colors.FAIL}Path does not exist: {path}{Colors.ENDC}")
+            else:
+                print(f"{Colors.WARNING}Usage: :sync <path>{Colors.ENDC}")
+        
+        elif cmd == 'watch':
+            if len(parts) > 1:
+                path = ' '.join(parts[1:])
+                if os.path.isdir(path):
+                    if self.watcher is not None:
+                        self.watcher.stop()
+                    self.watcher = DirectoryWatcher(self.db_manager, path)
+                    self.watcher.start()
+                    print(f"{Colors.OKGREEN}Watching {self.watcher.root} in the background{Colors.ENDC}")
+                else:
+                    print(f"{Colors.FAIL}Not a directory: {path}{Colors.ENDC}")
+            elif self.watcher is not None and self.watcher.running:
+                print(f"Watching {self.watcher.root} ({self.watcher.mode or 'starting'}, "
+                      f"{self.watcher.syncs} syncs)")
+                if self.watcher.last_error is not None:
+                    print(f"{Colors.FAIL}Last sync error: {self.watcher.last_error}{Colors.ENDC}")
+            else:
+                print(f"{Colors.WARNING}Usage: :watch <path>{Colors.ENDC}")
+        
+        elif cmd == 'unwatch':
+            if self.watcher is not None:
+                self.watcher.stop()
+                print(f"{Colors.OKGREEN}Stopped watching {self.watcher.root}{Colors.ENDC}")
+                self.watcher = None
+            else:
+                print(f"{Colors.WARNING}No directory is being watched{Colors.ENDC}")
+        
         elif cmd == 'list-by-size' or cmd == 'listbysize':
             limit = 100
             if len(parts) > 1:
@@ -467,6 +1403,23 @@ class EverythingCLI:
             self.print_results(results, show_details=True, show_size_ranking=True)
             print(f"\n{Colors.OKBLUE}Listed {len(results)} files in {search_time*1000:.1f}ms{Colors.ENDC}")
         
+        elif cmd == 'top-dirs' or cmd == 'topdirs':
+            limit = 20
+            parent = None
+            if len(parts) > 1:
+                try:
+                    limit = int(parts[1])
+                    parent = ' '.join(parts[2:]) or None
+                except ValueError:
+                    parent = ' '.join(parts[1:])  # :top-dirs <path> drills into a directory
+            
+            start_time = time.time()
+            results = self.db_manager.top_directories(limit=limit, parent=parent)
+            search_time = time.time() - start_time
+            
+            self.print_directory_rollups(results, parent)
+            print(f"\n{Colors.OKBLUE}Listed {len(results)} directories in {search_time*1000:.1f}ms{Colors.ENDC}")
+        
         elif cmd == 'list-all' or cmd == 'listall':
             limit = 50
             if len(parts) > 1:
@@ -494,8 +1447,12 @@ class EverythingCLI:
             print(":stats - Show database statistics")
             print(":clear - Clear the database")
             print(":index <path> - Index a directory")
+            print(":sync <path> - Update the index, re-listing only changed directories")
+            print(":watch <path> - Keep a directory's index current in the background")
+            print(":unwatch - Stop the background watcher")
             print(":index-c - Index entire C drive")
             print(":list-by-size [limit] - List largest files (default: 100)")
+            print(":top-dirs [limit] [path] - Largest directories, or largest subdirectories of path (default: 20)")
             print(":list-all [limit] - List all files (default: 50)")
             print(":help - Show this help")
             print("quit/exit/q - Exit the program")
@@ -544,7 +1501,7 @@ def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
         description="Everything CLI - Fast file search utility (like Windows Everything app)\n\nDEFAULT: Running without arguments shows all files by size (largest first)",
-        formatter_class=argparse.YOUR_CLIENT_SECRET_HERE,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   everything_cli.py                               # DEFAULT: Show all files by size (Everything app style)
@@ -553,7 +1510,11 @@ Examples:
   everything_cli.py --search "*.py"              # Search for Python files
   everything_cli.py --search "large" --min-size 1GB --order-by-size  # Find large files ordered by size
   everything_cli.py --index-c-drive              # Index entire C drive (Windows) - one time setup
+  everything_cli.py --sync C:\\Projects           # Re-index only directories that changed
+  everything_cli.py --watch C:\\Projects          # Keep the index current until Ctrl+C
   everything_cli.py --list-by-size --limit 50    # Show 50 largest files
+  everything_cli.py --top-dirs --limit 20        # Show 20 largest folders
+  everything_cli.py --top-dirs C:\\Users          # Drill into a folder: its largest subfolders
         """
     )
     
@@ -561,10 +1522,18 @@ Examples:
                        help='Index files in the specified directory')
     parser.add_argument('--index-c-drive', action='store_true',
                        help='Index entire C drive (Windows)')
+    parser.add_argument('--sync', metavar='PATH',
+                       help='Incrementally re-index PATH, skipping directories whose mtime is unchanged')
+    parser.add_argument('--watch', metavar='PATH',
+                       help='Keep the index for PATH current until interrupted')
+    parser.add_argument('--poll-interval', type=float, default=60.0, metavar='SECONDS',
+                       help='Re-sync interval for --watch where inotify is unavailable (default: 60)')
     parser.add_argument('--search', '-s', metavar='QUERY',
                        help='Search for files matching the query')
     parser.add_argument('--list-by-size', action='store_true',
                        help='List all files ordered by size (largest first)')
+    parser.add_argument('--top-dirs', nargs='?', const='', metavar='PATH',
+                       help='List directories by total size, or the subdirectories of PATH')
     parser.add_argument('--list-all', action='store_true',
                        help='List all files in the database')
     parser.add_argument('--interactive', '-I', action='store_true',
@@ -627,6 +1596,28 @@ Examples:
         app.indexer.index_directory(args.index)
         return
     
+    # Handle incremental re-index
+    if args.sync:
+        if not os.path.exists(args.sync):
+            print(f"{Colors.FAIL}Error: Path does not exist: {args.sync}{Colors.ENDC}")
+            return
+        
+        app.indexer.sync_directory(args.sync)
+        return
+    
+    # Handle watching
+    if args.watch:
+        if not os.path.isdir(args.watch):
+            print(f"{Colors.FAIL}Error: Not a directory: {args.watch}{Colors.ENDC}")
+            return
+        
+        app.watcher = DirectoryWatcher(app.db_manager, args.watch, poll_interval=args.poll_interval)
+        app.watcher.start()
+        print(f"{Colors.OKBLUE}Watching {app.watcher.root} (Ctrl+C to stop)...{Colors.ENDC}")
+        while app.watcher.running:
+            time.sleep(1)
+        return
+    
     # Handle C drive indexing
     if args.index_c_drive:
         if os.name == 'nt':  # Windows
@@ -651,6 +1642,17 @@ Examples:
         print(f"\n{Colors.OKBLUE}Listed {len(results)} files in {search_time*1000:.1f}ms{Colors.ENDC}")
         return
     
+    # Handle directory ranking
+    if args.top_dirs is not None:
+        parent = args.top_dirs or None
+        start_time = time.time()
+        results = app.db_manager.top_directories(limit=args.limit, parent=parent)
+        search_time = time.time() - start_time
+        
+        app.print_directory_rollups(results, parent)
+        print(f"\n{Colors.OKBLUE}Listed {len(results)} directories in {search_time*1000:.1f}ms{Colors.ENDC}")
+        return
+    
     # Handle list all
     if args.list_all:
         print(f"{Colors.OKBLUE}Listing all files (limit: {args.limit})...{Colors.ENDC}")
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Everything CLI index: bulk loads, crawling, search, sync and rollups
+Each test indexes a small synthetic tree into a database in a temporary directory
+"""
+import os
+import sys
+import fnmatch
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the current directory to Python path to import everything_cli
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from everything_cli import DatabaseManager, DirectoryState, DirectoryWatcher, FileIndexer, ParallelCrawler
+
+NAMES = ['report.txt', 'Report_final.TXT', 'notes.md', 'a.b', 'photo_001.jpg', 'photo_002.jpg',
+         'archive.tar.gz', '100%_done.log', 'under_score.py', 'x', 'readme', 'Makefile']
+
+
+def write_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def age_tree(root, seconds=60):
+    """Move every directory mtime back so it is outside the sync's racy window."""
+    stamp = time.time() - seconds
+    for current, _, _ in os.walk(root):
+        os.utime(current, (stamp, stamp))
+
+
+def walk_entries(root):
+    """{path: (is_directory, size)} for everything below root, as os.walk sees it."""
+    entries = {}
+    for current, dirs, files in os.walk(root):
+        for name in dirs:
+            entries[os.path.join(current, name)] = (True, 0)
+        for name in files:
+            path = os.path.join(current, name)
+            entries[path] = (False, os.path.getsize(path))
+    return entries
+
+
+def walk_rollups(root):
+    """{directory: (size, file_count, newest_mtime)} summed over each whole subtree with os.walk."""
+    rollups = {}
+    for current, _, _ in os.walk(root):
+        size = count = 0
+        newest = 0.0
+        for inner, _, files in os.walk(current):
+            for name in files:
+                info = os.stat(os.path.join(inner, name))
+                size += info.st_size
+                count += 1
+                newest = max(newest, info.st_mtime)
+        rollups[current] = (size, count, newest)
+    return rollups
+
+
+class IndexTestCase(unittest.TestCase):
+    """Builds a tree of a few hundred entries and an empty database next to it."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='everything_cli_test_')
+        self.root = os.path.join(self.test_dir, 'tree')
+        self.db_path = os.path.join(self.test_dir, 'index.db')
+        for d in range(4):
+            for s in range(3):
+                for i, name in enumerate(NAMES):
+                    write_file(os.path.join(self.root, f'dir_{d}', f'sub_{s}', name), 10 * d + s + i)
+            write_file(os.path.join(self.root, f'dir_{d}', f'top_{d}.txt'), 1000 + d)
+        self.db = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def index(self, workers=4):
+        indexer = FileIndexer(self.db)
+        indexer.index_directory(self.root, show_progress=False, workers=workers)
+        return indexer
+
+    def indexed_entries(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return {path: (bool(is_directory), size) for path, is_directory, size in
+                    conn.execute("SELECT path, is_directory, size FROM files")}
+
+
+class TestBulkIngest(IndexTestCase):
+
+    def test_index_matches_walk(self):
+        indexer = self.index()
+        expected = walk_entries(self.root)
+        self.assertEqual(self.indexed_entries(), expected)
+        self.assertEqual(indexer.indexed_count, len(expected))
+        stats = self.db.get_stats()
+        self.assertEqual(stats['total_entries'], len(expected))
+        self.assertEqual(stats['total_directories'], sum(is_dir for is_dir, _ in expected.values()))
+        self.assertEqual(stats['total_size'], sum(size for _, size in expected.values()))
+
+    def test_initial_build_restores_indexes_and_triggers(self):
+        self.index()
+        with sqlite3.connect(self.db_path) as conn:
+            names = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+        self.assertLessEqual(set(DatabaseManager.INDEXES) | set(DatabaseManager.STATS_TRIGGERS), names)
+        if self.db.has_fts:
+            self.assertLessEqual(set(DatabaseManager.SEARCH_TRIGGERS), names)
+
+    def test_reindex_updates_in_place(self):
+        self.index()
+        write_file(os.path.join(self.root, 'dir_0', 'top_0.txt'), 5)
+        self.index()
+        self.assertEqual(self.indexed_entries(), walk_entries(self.root))
+        self.assertEqual(self.db.get_stats()['total_entries'], len(walk_entries(self.root)))
+
+
+class TestParallelCrawler(IndexTestCase):
+
+    def crawl(self, workers, batch_size=7):
+        batches = []
+        crawler = ParallelCrawler(workers, batch_size=batch_size)
+        crawler.crawl([self.root], batches.append)
+        items = [item for batch in batches for item in batch]
+        return crawler, items
+
+    def test_any_worker_count_finds_every_entry_once(self):
+        expected = walk_entries(self.root)
+        for workers in (1, 3, 16):
+            crawler, items = self.crawl(workers)
+            entries = [item for item in items if not isinstance(item, DirectoryState)]
+            self.assertEqual(len(entries), len(expected))
+            self.assertEqual({entry.path: (entry.is_directory, entry.size) for entry in entries}, expected)
+            self.assertEqual(crawler.directories_scanned, 1 + sum(is_dir for is_dir, _ in expected.values()))
+
+    def test_directory_states_carry_own_totals(self):
+        _, items = self.crawl(4)
+        states = {item.path: item for item in items if isinstance(item, DirectoryState)}
+        state = states[os.path.join(self.root, 'dir_2')]
+        self.assertEqual(state.own_files, 1)
+        self.assertEqual(state.own_size, 1002)
+        self.assertEqual(state.child_count, 4)
+        self.assertEqual(states[self.root].children, {os.path.join(self.root, f'dir_{d}') for d in range(4)})
+
+    def test_missing_root_is_counted_as_an_error(self):
+        crawler = ParallelCrawler(2)
+        crawler.crawl([os.path.join(self.test_dir, 'missing')], lambda batch: None)
+        self.assertEqual(crawler.errors, 1)
+
+
+def brute_force_search(entries, query):
+    """Paths whose names match every term the way the LIKE fallback does."""
+    def term_matches(name, term):
+        if '*' in term or '?' in term:
+            return fnmatch.fnmatchcase(name.lower(), term.lower())
+        return term.lower() in name.lower()
+
+    terms = DatabaseManager.parse_query(query) or ['']
+    return {path for path in entries if all(term_matches(os.path.basename(path), term) for term in terms)}
+
+
+class TestSearch(IndexTestCase):
+
+    QUERIES = ['report', 'REP', 'photo_00', '*.jpg', 'photo_??1.jpg', '"final.txt"', '100%', 'under_',
+               're txt', 'ar', 'a.b', 'zzz', '_', 'e*e', 'sub_1', 'top_ .txt']
+
+    def setUp(self):
+        super().setUp()
+        if not self.db.has_fts:
+            self.skipTest('this SQLite build has no FTS5 trigram tokenizer')
+
+    def search(self, db, query):
+        return {entry.path for entry in db.search_files(query, limit=100000)}
+
+    def assert_matches_brute_force(self, db):
+        entries = walk_entries(self.root)
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(self.search(db, query), brute_force_search(entries, query))
+
+    def test_trigram_search_matches_brute_force(self):
+        self.index()
+        self.db.FTS_MIN_ROWS = 0  # Take the trigram path even for this small tree
+        self.assert_matches_brute_force(self.db)
+        self.db.FTS_MIN_ROWS = 10 ** 9
+        self.assert_matches_brute_force(self.db)
+
+    def test_index_follows_renames_and_deletes(self):
+        self.index()
+        os.rename(os.path.join(self.root, 'dir_1', 'top_1.txt'), os.path.join(self.root, 'dir_1', 'renamed.bin'))
+        shutil.rmtree(os.path.join(self.root, 'dir_3'))
+        FileIndexer(self.db).sync_directory(self.root, show_progress=False)
+        self.db.FTS_MIN_ROWS = 0
+        self.assert_matches_brute_force(self.db)
+        self.assertEqual(self.search(self.db, 'renamed'), {os.path.join(self.root, 'dir_1', 'renamed.bin')})
+
+    def test_interrupted_bulk_load_is_reindexed_on_open(self):
+        ingest = self.db.bulk_ingest()
+        ingest.__enter__()
+        ParallelCrawler(1).crawl([self.root], lambda batch: [
+            ingest.record_directory(item) if isinstance(item, DirectoryState) else ingest.add(item) for item in batch])
+        ingest.flush()
+        # The process dies after committing rows but before __exit__ rebuilds the search index
+        ingest.conn.execute("COMMIT")
+        ingest.conn.close()
+
+        db = DatabaseManager(self.db_path)
+        db.FTS_MIN_ROWS = 0
+        self.assert_matches_brute_force(db)
+        self.assertEqual(db.get_stats()['total_entries'], len(walk_entries(self.root)))
+        self.assertEqual({rollup.path: (rollup.size, rollup.file_count) for rollup in db.top_directories(10 ** 6)},
+                         {path: totals[:2] for path, totals in walk_rollups(self.root).items()})
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertFalse(db.bulk_load_pending(conn))
+
+    def test_running_bulk_load_is_left_alone(self):
+        ingest = self.db.bulk_ingest()
+        ingest.__enter__()
+        self.addCleanup(ingest.__exit__, None, None, None)
+        ParallelCrawler(1).crawl([self.root], lambda batch: [
+            ingest.record_directory(item) if isinstance(item, DirectoryState) else ingest.add(item) for item in batch])
+        ingest.flush()
+        with patch.object(DatabaseManager, 'rebuild_search_index') as rebuild:
+            DatabaseManager(self.db_path)  # e.g. a search from another process while the load runs
+        rebuild.assert_not_called()
+
+    def test_finished_index_opens_without_rebuilding(self):
+        self.index()
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertFalse(self.db.bulk_load_pending(conn))
+        with patch.object(DatabaseManager, 'rebuild_search_index') as rebuild:
+            DatabaseManager(self.db_path)
+        rebuild.assert_not_called()
+
+
+class TestSync(IndexTestCase):
+
+    def sync(self, **kwargs):
+        indexer = FileIndexer(self.db)
+        indexer.sync_directory(self.root, show_progress=False, **kwargs)
+        return indexer
+
+    def test_sync_picks_up_adds_and_deletes(self):
+        age_tree(self.root)
+        self.index()
+        write_file(os.path.join(self.root, 'dir_0', 'sub_1', 'new.txt'), 77)
+        write_file(os.path.join(self.root, 'dir_4', 'deep', 'newer.txt'), 5)
+        os.remove(os.path.join(self.root, 'dir_1', 'sub_0', 'notes.md'))
+        shutil.rmtree(os.path.join(self.root, 'dir_2', 'sub_2'))
+        indexer = self.sync()
+        expected = walk_entries(self.root)
+        self.assertEqual(self.indexed_entries(), expected)
+        self.assertEqual(indexer.removed_count, 1 + 1 + len(NAMES))
+        self.assertEqual(self.db.get_stats()['total_entries'], len(expected))
+        with sqlite3.connect(self.db_path) as conn:
+            dirs = {path for path, in conn.execute("SELECT path FROM dirs")}
+        self.assertEqual(dirs, {self.root} | {path for path, (is_dir, _) in expected.items() if is_dir})
+
+    def test_unchanged_directories_are_not_relisted(self):
+        age_tree(self.root)
+        self.index()
+        write_file(os.path.join(self.root, 'dir_3', 'sub_0', 'new.txt'), 1)
+        indexer = self.sync()
+        # Only dir_3/sub_0 was listed: its entries, including the new file
+        self.assertEqual(indexer.indexed_count, len(NAMES) + 1)
+
+    def test_forced_directory_sees_in_place_edits(self):
+        age_tree(self.root)
+        self.index()
+        sub = os.path.join(self.root, 'dir_0', 'sub_0')
+        with open(os.path.join(sub, 'x'), 'ab') as f:
+            f.write(b'grown')  # Leaves the directory mtime alone
+        self.sync()
+        self.assertNotEqual(self.indexed_entries(), walk_entries(self.root))
+        self.sync(force=(sub,), descend_unchanged=False)
+        self.assertEqual(self.indexed_entries(), walk_entries(self.root))
+
+
+class TestRollups(IndexTestCase):
+
+    def rollups(self):
+        return {rollup.path: (rollup.size, rollup.file_count, rollup.newest_mtime)
+                for rollup in self.db.top_directories(limit=100000)}
+
+    def assert_rollups_match_walk(self):
+        actual, expected = self.rollups(), walk_rollups(self.root)
+        self.assertEqual(set(actual), set(expected))
+        for path, (size, count, newest) in expected.items():
+            with self.subTest(path=path):
+                self.assertEqual(actual[path][:2], (size, count))
+                self.assertAlmostEqual(actual[path][2], newest, places=3)
+
+    def test_rollups_match_walk(self):
+        self.index()
+        self.assert_rollups_match_walk()
+        top = self.db.top_directories(limit=2, parent=self.root)
+        self.assertEqual([rollup.path for rollup in top], [os.path.join(self.root, 'dir_3'), os.path.join(self.root, 'dir_2')])
+
+    def test_rollups_follow_sync(self):
+        age_tree(self.root)
+        self.index()
+        write_file(os.path.join(self.root, 'dir_0', 'sub_1', 'new.txt'), 5000)
+        write_file(os.path.join(self.root, 'dir_4', 'deep', 'newer.txt'), 5)
+        os.remove(os.path.join(self.root, 'dir_1', 'sub_0', 'notes.md'))
+        shutil.rmtree(os.path.join(self.root, 'dir_2', 'sub_2'))
+        FileIndexer(self.db).sync_directory(self.root, show_progress=False)
+        self.assert_rollups_match_walk()
+        self.assertEqual(self.db.top_directories(limit=1, parent=self.root)[0].path, os.path.join(self.root, 'dir_0'))
+
+
+class TestDirectoryWatcher(IndexTestCase):
+
+    def wait_for(self, condition, timeout=10):
+        deadline = time.time() + timeout
+        while not condition():
+            if time.time() > deadline:
+                self.fail('condition not reached')
+            time.sleep(0.02)
+
+    def test_watcher_waits_for_foreground_writer(self):
+        self.index()
+        watcher = DirectoryWatcher(self.db, self.root, poll_interval=0.05, use_inotify=False)
+        with self.db.write_lock:  # A foreground :index is running
+            watcher.start()
+            time.sleep(0.3)
+            self.assertEqual(watcher.syncs, 0)
+        self.wait_for(lambda: watcher.syncs > 0)
+        watcher.stop()
+        self.assertIsNone(watcher.last_error)
+
+    def test_stop_while_waiting(self):
+        watcher = DirectoryWatcher(self.db, self.root, poll_interval=60, use_inotify=False)
+        with self.db.write_lock:
+            watcher.start()
+            time.sleep(0.1)
+            started = time.time()
+            watcher.stop()
+        self.assertLess(time.time() - started, 5)
+        self.assertFalse(watcher.running)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_inotify_watcher_indexes_new_files(self):
+        self.index()
+        watcher = DirectoryWatcher(self.db, self.root, debounce=0.1)
+        watcher.start()
+        try:
+            self.wait_for(lambda: watcher.mode is not None and watcher.syncs > 0)
+            write_file(os.path.join(self.root, 'dir_1', 'watched.txt'), 3)
+            self.wait_for(lambda: os.path.join(self.root, 'dir_1', 'watched.txt') in self.indexed_entries())
+        finally:
+            watcher.stop()
+        self.assertEqual(watcher.mode, 'inotify')
+        self.assertIsNone(watcher.last_error)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_constantly_changing_directory_is_still_synced(self):
+        self.index()
+        watcher = DirectoryWatcher(self.db, self.root, debounce=0.5, max_delay=1.0)
+        watcher.start()
+        growing = os.path.join(self.root, 'dir_2', 'growing.txt')
+        try:
+            self.wait_for(lambda: watcher.mode is not None and watcher.syncs > 0)
+            started = time.time()
+            with open(growing, 'ab') as f:
+                # Events every 0.1s would keep pushing a plain debounce back forever
+                while growing not in self.indexed_entries():
+                    if time.time() - started > 5:
+                        self.fail('directory was never synced while it kept changing')
+                    f.write(b'x')
+                    f.flush()
+                    time.sleep(0.1)
+        finally:
+            watcher.stop()
+        self.assertIsNone(watcher.last_error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,19 +5,36 @@ Python 3.13 Optimized Force Deletion Application - 1+ GB/s Performance
 """
 import os
 import sys
+import json
+import stat
+import errno
+import struct
 import time
+import signal
+import queue
 import shutil
 import logging
 import argparse
 import tempfile
 import threading
 import subprocess
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterator, List, Optional, Set, Tuple
 import ctypes
-from ctypes import wintypes, windll
+from ctypes import wintypes
 import ctypes.wintypes
-from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    from ctypes import windll
+except ImportError:
+    # Non-Windows hosts (tests, CI): WinAPI calls fail softly and the portable paths are used
+    windll = None
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+try:
+    import fcntl
+except ImportError:
+    # Windows: inode flags do not exist, attributes are reset through the WinAPI instead
+    fcntl = None
 
 # Windows API constants for high-performance operations
 DELETE_RECURSIVE = 0x0001
@@ -34,6 +51,13 @@ OPEN_EXISTING = 3
 GENERIC_READ = 0x800000
 GENERIC_WRITE = 0x400000
 DELETE = 0x00010000
+ERROR_ACCESS_DENIED = 5
+
+# Linux inode flag ioctls (chattr/lsattr) used to clear immutable and append-only bits
+FS_IOC_GETFLAGS = 0x80086601
+FS_IOC_SETFLAGS = 0x40086602
+FS_IMMUTABLE_FL = 0x00000010
+FS_APPEND_FL = 0x00000020
 
 # Try to import Windows-specific modules
 try:
@@ -76,24 +100,808 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class DirectoryDependencyTracker:
+    """Per-directory pending-child counters for bottom-up parallel deletion.
+
+    Entries are registered in post-order scan order, so by the time a directory
+    is sealed every one of its children is known. A directory is released for
+    removal only once it is sealed and all of its children have been resolved,
+    so parents never race their children into "directory not empty" errors.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._pending: dict = {}  # directory -> [unresolved children, sealed, child failed]
+
+    def add_child(self, path: str) -> None:
+        """Count a scanned entry against its parent directory."""
+        if path == self.root:
+            return
+        with self._lock:
+            state = self._pending.setdefault(os.path.dirname(path), [0, False, False])
+            state[0] += 1
+
+    def seal(self, directory: str) -> Optional[bool]:
+        """Mark a directory as fully scanned.
+
+        Returns None while children are still pending, otherwise whether any child
+        failed (the directory is then released and must be removed by the caller).
+        """
+        with self._lock:
+            state = self._pending.setdefault(directory, [0, False, False])
+            state[1] = True
+            if state[0] == 0:
+                del self._pending[directory]
+                return state[2]
+        return None
+
+    def resolve(self, path: str, success: bool) -> Optional[Tuple[str, bool]]:
+        """Record that an entry has been dealt with.
+
+        Returns (parent, child_failed) when this was the parent's last pending
+        child, handing the parent's removal to the caller.
+        """
+        if path == self.root:
+            return None
+        parent = os.path.dirname(path)
+        with self._lock:
+            state = self._pending[parent]
+            state[0] -= 1
+            if not success:
+                state[2] = True
+            if state[0] == 0 and state[1]:
+                del self._pending[parent]
+                return parent, state[2]
+        return None
+
+    def pending_directories(self) -> int:
+        """Number of directories still waiting on children."""
+        with self._lock:
+            return len(self._pending)
+
+class AdaptiveConcurrencyController:
+    """Hill-climbing worker count driven by completions per second and p95 latency.
+
+    Completions are measured over a sliding window. Growing the pool continues
+    while it raises throughput; when throughput drops or tail latency blows up
+    (a seeking HDD) the direction flips and the pool shrinks multiplicatively.
+    A throughput plateau holds the current size.
+    """
+
+    def __init__(self, initial: int, min_workers: int = 1, max_workers: int = 256, window: float = 1.0,
+                 step: Optional[int] = None, decrease_factor: float = 0.75, tolerance: float = 0.05,
+                 latency_factor: float = 4.0, min_samples: int = 16):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.concurrency = self._clamp(initial)
+        self.step = step or max(1, self.concurrency // 4)
+        self.window = window
+        self.decrease_factor = decrease_factor
+        self.tolerance = tolerance
+        self.latency_factor = latency_factor
+        self.min_samples = min_samples
+        self.direction = 1
+        self.peak_throughput = 0.0
+        self.peak_concurrency = self.concurrency
+        self.history: List[Tuple[float, int]] = [(time.monotonic(), self.concurrency)]
+        self._samples: deque = deque()  # (completion time, latency)
+        self._lock = threading.Lock()
+        self._last_throughput: Optional[float] = None
+        self._best_p95: Optional[float] = None
+        self._last_adjust = float('-inf')
+
+    @property
+    def fixed(self) -> bool:
+        return self.min_workers == self.max_workers
+
+    def _clamp(self, workers: int) -> int:
+        return max(self.min_workers, min(self.max_workers, workers))
+
+    def record(self, latency: float, now: Optional[float] = None) -> None:
+        """Record one completed item and how long it took."""
+        with self._lock:
+            self._samples.append((time.monotonic() if now is None else now, latency))
+
+    def snapshot(self, now: Optional[float] = None) -> Tuple[float, float, int]:
+        """Return (items per second, p95 latency, sample count) over the sliding window."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._samples and self._samples[0][0] < now - self.window:
+                self._samples.popleft()
+            latencies = sorted(latency for _, latency in self._samples)
+        if not latencies:
+            return 0.0, 0.0, 0
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return len(latencies) / self.window, p95, len(latencies)
+
+    def adjust(self, now: Optional[float] = None) -> int:
+        """Re-evaluate once per window and return the worker count to run with."""
+        now = time.monotonic() if now is None else now
+        if self.fixed or now - self._last_adjust < self.window:
+            return self.concurrency
+        self._last_adjust = now
+        throughput, p95, samples = self.snapshot(now)
+        if samples < self.min_samples:
+            return self.concurrency
+
+        if throughput > self.peak_throughput:
+            self.peak_throughput = throughput
+            self.peak_concurrency = self.concurrency
+        if self._best_p95 is None or p95 < self._best_p95:
+            self._best_p95 = p95
+
+        previous, self._last_throughput = self._last_throughput, throughput
+        if self._best_p95 > 0 and p95 > self._best_p95 * self.latency_factor:
+            move = -1  # Tail latency blew up - the device is saturated
+        elif previous is None:
+            move = self.direction  # First measurement - probe
+        elif throughput > previous * (1 + self.tolerance):
+            move = self.direction  # Last move helped - keep going
+        elif throughput < previous * (1 - self.tolerance):
+            move = -self.direction  # Last move hurt - back off
+        else:
+            move = 0  # Plateau - hold
+
+        if move:
+            self.direction = move
+            if move > 0:
+                target = self._clamp(self.concurrency + self.step)
+            else:
+                target = self._clamp(int(self.concurrency * self.decrease_factor))
+            if target != self.concurrency:
+                self.concurrency = target
+                self.history.append((now, target))
+        return self.concurrency
+
+    def summary(self) -> str:
+        if self.fixed:
+            return f"fixed at {self.concurrency} workers"
+        return (f"settled at {self.concurrency} workers (peak {self.peak_throughput:.0f} items/s "
+                f"at {self.peak_concurrency} workers, {len(self.history) - 1} adjustments, "
+                f"range {self.min_workers}-{self.max_workers})")
+
+class ResizableWorkerPool:
+    """Thread pool whose size follows an AdaptiveConcurrencyController.
+
+    Growing starts threads immediately; on shrink, surplus workers retire after
+    their current item. Every item's latency is fed to the controller, and a
+    monitor thread applies its decision. submit() returns a Future like
+    ThreadPoolExecutor; execute() is fire-and-forget for streaming work.
+    """
+
+    def __init__(self, controller: AdaptiveConcurrencyController, queue_size: int = 0, name: str = 'purge-worker'):
+        self.controller = controller
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._live = 0
+        self._target = 0
+        self._closing = False
+        self._stop_monitor = threading.Event()
+        self.resize(controller.concurrency)
+        self._monitor = threading.Thread(target=self._monitor_loop, name=f"{name}-monitor", daemon=True)
+        self._monitor.start()
+
+    @property
+    def size(self) -> int:
+        return self._target
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        self._queue.put((fn, args, future))
+        return future
+
+    def execute(self, fn, *args) -> None:
+        self._queue.put((fn, args, None))
+
+    def resize(self, size: int) -> None:
+        with self._lock:
+            self._target = max(1, size)
+            while self._live < self._target:
+                thread = threading.Thread(target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                self._live += 1
+                thread.start()
+
+    def _monitor_loop(self) -> None:
+        while not self._stop_monitor.wait(self.controller.window / 4):
+            target = self.controller.adjust()
+            if target != self._target:
+                logger.debug(f"Adaptive concurrency: {self._target} -> {target} workers")
+                self.resize(target)
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fn, args, future = item
+            if future is not None and not future.set_running_or_notify_cancel():
+                continue
+            start = time.perf_counter()
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                if future is not None:
+                    future.set_exception(e)
+                else:
+                    logger.error(f"Worker task failed: {e}")
+            else:
+                if future is not None:
+                    future.set_result(result)
+            self.controller.record(time.perf_counter() - start)
+            with self._lock:
+                if self._live > self._target and not self._closing:
+                    self._live -= 1
+                    return
+
+    def shutdown(self) -> None:
+        """Run everything already queued, then stop all workers."""
+        self._stop_monitor.set()
+        self._monitor.join()
+        with self._lock:
+            self._closing = True
+            live = self._live
+        for _ in range(live):
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+class PurgeProgress:
+    """Items, bytes, rate and ETA for a purge run, reported at a bounded rate.
+
+    Workers bump their own per-thread counters without taking a lock; a
+    reporter thread sums them at most renders_per_second times a second. On a
+    TTY it redraws one status line in place, otherwise it logs a line every
+    log_interval seconds. With stats_path set, every sample is also appended
+    to a JSON-lines file so runs can be graphed and compared.
+    """
+
+    def __init__(self, total_items: int = 0, total_bytes: int = 0, renders_per_second: float = 4.0,
+                 stats_path: Optional[str] = None, stream=None, log_interval: float = 5.0):
+        self.total_items = total_items
+        self.total_bytes = total_bytes
+        self.scan_complete = total_items > 0  # ETA is only meaningful once the totals are known
+        self.render_interval = 1.0 / renders_per_second if renders_per_second > 0 else float('inf')
+        self.log_interval = log_interval
+        self.stats_path = stats_path
+        self.stream = stream if stream is not None else sys.stderr
+        self.is_tty = bool(getattr(self.stream, 'isatty', lambda: False)())
+        self.gauges: dict = {}  # name -> zero-argument callable sampled at each render
+        self.start_time = time.time()
+        self._local = threading.local()
+        self._counters: List[list] = []
+        self._register_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reporter: Optional[threading.Thread] = None
+        self._stats_file = None
+        self._last_sample = (self.start_time, 0, 0)
+        self._last_log_time = self.start_time
+        self._line_length = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _counter(self) -> list:
+        counter = getattr(self._local, 'counter', None)
+        if counter is None:
+            counter = [0, 0, 0]  # items, bytes, failed - only ever written by the owning thread
+            self._local.counter = counter
+            with self._register_lock:
+                self._counters.append(counter)
+        return counter
+
+    def record(self, items: int = 1, nbytes: int = 0, failed: int = 0) -> None:
+        """Count finished work from the calling thread."""
+        counter = self._counter()
+        counter[0] += items
+        counter[1] += nbytes
+        counter[2] += failed
+
+    def discover(self, items: int = 1, nbytes: int = 0) -> None:
+        """Grow the totals while a streaming scan is still running (scanner thread only)."""
+        self.total_items += items
+        self.total_bytes += nbytes
+
+    def totals(self) -> Tuple[int, int, int]:
+        """Return (items done, bytes done, failed items) summed over all threads."""
+        with self._register_lock:
+            counters = list(self._counters)
+        return (sum(c[0] for c in counters), sum(c[1] for c in counters), sum(c[2] for c in counters))
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        items, nbytes, failed = self.totals()
+        elapsed = now - self.start_time
+        last_time, last_items, last_bytes = self._last_sample
+        interval = now - last_time
+        self._last_sample = (now, items, nbytes)
+        items_per_s = items / elapsed if elapsed > 0 else 0.0
+        bytes_per_s = nbytes / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.scan_complete and items_per_s > 0:
+            eta = max(0.0, (self.total_items - items - failed) / items_per_s)
+        sample = {
+            'elapsed_s': round(elapsed, 3),
+            'items': items,
+            'total_items': self.total_items,
+            'bytes': nbytes,
+            'total_bytes': self.total_bytes,
+            'failed': failed,
+            'items_per_s': round(items_per_s, 1),
+            'bytes_per_s': round(bytes_per_s, 1),
+            'instant_items_per_s': round((items - last_items) / interval, 1) if interval > 0 else 0.0,
+            'instant_bytes_per_s': round((nbytes - last_bytes) / interval, 1) if interval > 0 else 0.0,
+            'eta_s': round(eta, 1) if eta is not None else None,
+            'scan_complete': self.scan_complete,
+        }
+        for name, gauge in self.gauges.items():
+            try:
+                sample[name] = gauge()
+            except Exception:
+                sample[name] = None
+        return sample
+
+    def format_line(self, sample: dict) -> str:
+        total = f"/{sample['total_items']}" if sample['scan_complete'] else f" (scanned {sample['total_items']})"
+        eta = f"{sample['eta_s']:.1f}s" if sample['eta_s'] is not None else '?'
+        line = (f"PROGRESS: {sample['items']}{total} items - {_format_bytes(sample['bytes'])} - "
+                f"{sample['items_per_s']:.0f} items/s - {_format_bytes(sample['bytes_per_s'])}/s - ETA {eta}")
+        if sample['failed']:
+            line += f" - failed {sample['failed']}"
+        if sample.get('workers') is not None:
+            line += f" - workers {sample['workers']}"
+        return line
+
+    def render(self, final: bool = False) -> dict:
+        sample = self.snapshot()
+        if self._stats_file is not None:
+            record = dict(sample, event='summary' if final else 'progress', timestamp=round(time.time(), 3))
+            self._stats_file.write(json.dumps(record) + '\n')
+        line = self.format_line(sample)
+        if self.is_tty:
+            self.stream.write('\r' + line.ljust(self._line_length) + ('\n' if final else ''))
+            self.stream.flush()
+            self._line_length = len(line)
+        elif final or time.time() - self._last_log_time >= self.log_interval:
+            self._last_log_time = time.time()
+            logger.info(line)
+        return sample
+
+    def _report_loop(self) -> None:
+        while not self._stop.wait(self.render_interval):
+            self.render()
+
+    def start(self) -> None:
+        if self.stats_path:
+            self._stats_file = open(self.stats_path, 'a', encoding='utf-8')
+        if self.render_interval != float('inf'):
+            self._reporter = threading.Thread(target=self._report_loop, name='purge-progress', daemon=True)
+            self._reporter.start()
+
+    def stop(self) -> dict:
+        """Stop reporting and emit the final sample."""
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+        sample = self.render(final=True)
+        if self._stats_file is not None:
+            self._stats_file.close()
+            self._stats_file = None
+        return sample
+
+def _format_bytes(bytes_count: float) -> str:
+    """Format bytes into human-readable format."""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if bytes_count < 1024.0:
+            return f"{bytes_count:.2f} {unit}"
+        bytes_count /= 1024.0
+    return f"{bytes_count:.2f} PB"
+
+class LockIndex:
+    """Snapshot of every open file handle on the system, indexed by path.
+
+    One pass over all processes (/proc/*/fd on Linux, psutil elsewhere) builds a
+    path -> pids dictionary, so each lookup is a dict hit instead of a walk over
+    every process's open files. The snapshot is refreshed only when deletions
+    keep failing without a known holder: first incrementally (new processes are
+    scanned, exited ones dropped), and with a full rebuild once the snapshot is
+    older than max_age. An incremental refresh cannot see handles opened since
+    by processes already indexed, so a path that fails again with no known
+    holder (rescan_after_misses times) forces one full rebuild right away.
+    """
+
+    def __init__(self, refresh_after_failures: int = 16, max_age: float = 30.0, rescan_after_misses: int = 2):
+        self.refresh_after_failures = refresh_after_failures
+        self.max_age = max_age
+        self.rescan_after_misses = rescan_after_misses
+        self.own_pid = os.getpid()
+        self._lock = threading.RLock()
+        self._by_path: dict = {}  # normalized path -> set of pids
+        self._by_pid: dict = {}  # pid -> list of normalized paths
+        self._built_at: Optional[float] = None
+        self._failures = 0
+        self._misses: dict = {}  # normalized path -> failures with no known holder
+        self.lookups = 0
+        self.full_refreshes = 0
+        self.incremental_refreshes = 0
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        if path.startswith('\\\\?\\'):
+            path = path[4:]
+        return os.path.normcase(os.path.abspath(path))
+
+    @property
+    def available(self) -> bool:
+        return HAS_PSUTIL or os.path.isdir('/proc/self/fd')
+
+    def _list_pids(self) -> List[int]:
+        if os.path.isdir('/proc/self/fd'):
+            return [int(name) for name in os.listdir('/proc') if name.isdigit()]
+        if HAS_PSUTIL:
+            return psutil.pids()
+        return []
+
+    def _open_files(self, pid: int) -> List[str]:
+        """Return the normalized paths a process has open (empty if it is gone or inaccessible)."""
+        if os.path.isdir('/proc/self/fd'):
+            fd_dir = f'/proc/{pid}/fd'
+            paths = []
+            try:
+                for fd in os.listdir(fd_dir):
+                    try:
+                        target = os.readlink(os.path.join(fd_dir, fd))
+                    except OSError:
+                        continue
+                    if target.startswith('/'):
+                        paths.append(self.normalize(target))
+            except OSError:
+                pass
+            return paths
+        if HAS_PSUTIL:
+            try:
+                return [self.normalize(f.path) for f in psutil.Process(pid).open_files()]
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                return []
+        return []
+
+    def _add_process(self, pid: int) -> None:
+        paths = self._open_files(pid)
+        self._by_pid[pid] = paths
+        for path in paths:
+            self._by_path.setdefault(path, set()).add(pid)
+
+    def _drop_process(self, pid: int) -> None:
+        for path in self._by_pid.pop(pid, []):
+            holders = self._by_path.get(path)
+            if holders is not None:
+                holders.discard(pid)
+                if not holders:
+                    del self._by_path[path]
+
+    def refresh(self, full: bool = False) -> None:
+        """Rebuild the index, or (incrementally) scan new processes and drop exited ones."""
+        with self._lock:
+            pids = set(self._list_pids())
+            pids.discard(self.own_pid)
+            if full or self._built_at is None:
+                self._by_path = {}
+                self._by_pid = {}
+                for pid in pids:
+                    self._add_process(pid)
+                self._built_at = time.monotonic()
+                self.full_refreshes += 1
+            else:
+                for pid in set(self._by_pid) - pids:
+                    self._drop_process(pid)
+                for pid in pids - set(self._by_pid):
+                    self._add_process(pid)
+                self.incremental_refreshes += 1
+            self._failures = 0
+
+    def lookup(self, path: str) -> List[int]:
+        """Return the pids holding path open, building the snapshot on first use."""
+        with self._lock:
+            if self._built_at is None:
+                self.refresh(full=True)
+            self.lookups += 1
+            return sorted(self._by_path.get(self.normalize(path), ()))
+
+    def note_failure(self, path: Optional[str] = None) -> None:
+        """Record a deletion (of path, if given) that kept failing with no known lock holder."""
+        with self._lock:
+            self._failures += 1
+            if self._built_at is None:
+                return
+            if path is not None:
+                key = self.normalize(path)
+                misses = self._misses[key] = self._misses.get(key, 0) + 1
+                if misses == self.rescan_after_misses:
+                    # Still no holder: an indexed process may have opened it after its fds were read
+                    self.refresh(full=True)
+                    return
+            if self._failures < self.refresh_after_failures:
+                return
+            self.refresh(full=time.monotonic() - self._built_at > self.max_age)
+
+    def forget(self, pid: int) -> None:
+        """Drop a process that has been terminated."""
+        with self._lock:
+            self._drop_process(pid)
+
+class StrategySelector:
+    """Learns which force-delete fallback works for which kind of path.
+
+    Outcomes and timings are recorded per context, from most to least specific:
+    (parent, extension, error code), parent directory, (extension, error code)
+    and global, with files and directories kept apart. A plan is built from the
+    most specific context that has data: methods that have worked are tried
+    first, cheapest expected cost per success first; untried methods follow in
+    the default order; methods that failed demote_after times without ever
+    succeeding go last, except on every explore_every-th plan where they keep
+    their default position so a context can recover when conditions change.
+
+    When every method tried in a context has failed demote_after times and none
+    has ever succeeded (an ACL-locked subtree, say), the context's circuit is
+    open: plans leave out the subprocess-spawning methods, except on the
+    explore_every-th plans, so each further item there costs only the
+    in-process attempts before it is deferred or scheduled for reboot.
+    """
+
+    DEFAULT_ORDER = ('winapi', 'shutil', 'ntdll', 'del', 'rmdir', 'subst', 'aggressive')
+    SUBPROCESS_METHODS = frozenset(('del', 'rmdir', 'subst', 'aggressive'))
+    FILE_ONLY = frozenset(('del',))
+    DIRECTORY_ONLY = frozenset(('rmdir',))
+
+    def __init__(self, order: Tuple[str, ...] = DEFAULT_ORDER, demote_after: int = 3, explore_every: int = 32):
+        self.order = tuple(order)
+        self.demote_after = demote_after
+        self.explore_every = explore_every
+        self._lock = threading.Lock()
+        self._stats: dict = {}  # context key -> {method: [successes, failures, seconds]}
+        self.plans = 0
+        self.cold = 0  # Plans made without any data (default order)
+        self.hits = 0  # Deletions that succeeded with the first method tried
+        self.misses = 0  # Deletions that needed a fallback
+        self.deferred = 0  # Methods moved to the end of a plan by demotion
+        self.short_circuited = 0  # Plans that left out subprocess methods because the context's circuit was open
+
+    @staticmethod
+    def context_for(path: str, error_code: Optional[int] = None,
+                    is_dir: bool = False) -> Tuple[str, str, Optional[int], bool]:
+        parent, name = os.path.split(os.path.normcase(path.rstrip('\\/')))
+        return parent, os.path.splitext(name)[1], error_code, is_dir
+
+    @staticmethod
+    def _keys(context: Tuple[str, str, Optional[int], bool]) -> List[tuple]:
+        parent, ext, error_code, is_dir = context
+        return [('path', parent, ext, error_code, is_dir), ('parent', parent, is_dir),
+                ('kind', ext, error_code, is_dir), ('global',)]
+
+    def _stats_for(self, context: Tuple[str, str, Optional[int], bool]) -> Optional[dict]:
+        return next((self._stats[key] for key in self._keys(context) if key in self._stats), None)
+
+    def _is_open(self, stats: Optional[dict], is_dir: bool) -> bool:
+        if not stats or any(successes for successes, _, _ in stats.values()):
+            return False
+        skip = self.FILE_ONLY if is_dir else self.DIRECTORY_ONLY
+        return all(stats.get(name, (0, 0, 0.0))[1] >= self.demote_after for name in self.order if name not in skip)
+
+    def circuit_open(self, context: Tuple[str, str, Optional[int], bool]) -> bool:
+        """True if every method has failed here and none ever worked, so subprocess fallbacks are skipped."""
+        with self._lock:
+            return self._is_open(self._stats_for(context), context[3])
+
+    def plan(self, context: Tuple[str, str, Optional[int], bool]) -> List[str]:
+        """Return the method names to try, in order, for a path in this context."""
+        with self._lock:
+            self.plans += 1
+            stats = self._stats_for(context)
+            if stats is None:
+                self.cold += 1
+                return list(self.order)
+            proven, untried, demoted = [], [], []
+            for name in self.order:
+                successes, failures, _ = stats.get(name, (0, 0, 0.0))
+                if successes:
+                    proven.append(name)
+                elif failures >= self.demote_after:
+                    demoted.append(name)
+                else:
+                    untried.append(name)
+            proven.sort(key=lambda name: stats[name][2] / stats[name][0])
+            if demoted and not self.plans % self.explore_every:
+                return proven + [name for name in self.order if name in untried or name in demoted]
+            if self._is_open(stats, context[3]):
+                self.short_circuited += 1
+                return [name for name in demoted if name not in self.SUBPROCESS_METHODS]
+            self.deferred += len(demoted)
+            return proven + untried + demoted
+
+    def record(self, context: Tuple[str, str, Optional[int], bool], name: str, succeeded: bool,
+               elapsed: float, attempt: int = 0) -> None:
+        """Record the outcome of the attempt-th method tried for a path in this context."""
+        with self._lock:
+            for key in self._keys(context):
+                entry = self._stats.setdefault(key, {}).setdefault(name, [0, 0, 0.0])
+                entry[0 if succeeded else 1] += 1
+                entry[2] += elapsed
+            if succeeded:
+                if attempt == 0:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            overall = self._stats.get(('global',), {})
+            winners = ', '.join(f"{name}={overall[name][0]}" for name in self.order
+                                if name in overall and overall[name][0])
+            resolved = self.hits + self.misses
+            hit_rate = 100.0 * self.hits / resolved if resolved else 0.0
+            return (f"{self.plans} plans ({self.cold} cold), first-choice hit rate {hit_rate:.1f}% "
+                    f"({self.hits}/{resolved}), {self.deferred} demoted methods deferred, "
+                    f"{self.short_circuited} plans without subprocess fallbacks; wins: {winners or 'none'}")
+
+class PermissionResetBatch:
+    """Entries whose fast delete was refused, reset and retried together in one pass.
+
+    Instead of spawning attrib/takeown/icacls/del per path, refused entries are
+    queued while the traversal runs and handled once it is done: permissions and
+    attributes are cleared in-process (chmod and the immutable/append-only inode
+    flags on POSIX, SetFileAttributesW on Windows), and on Windows whatever is
+    still denied afterwards gets ownership and ACLs reset by a single cmd run
+    over a generated response file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # path -> (size, is_dir)
+        self.queued = 0
+        self.resets = 0  # In-process permission/attribute changes made
+        self.external_runs = 0  # Batched takeown/icacls invocations
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def is_permission_error(error: OSError) -> bool:
+        winerror = getattr(error, 'winerror', None)
+        if winerror is not None:
+            return winerror == ERROR_ACCESS_DENIED  # Sharing violations go to the lock-holder path
+        return error.errno in (errno.EACCES, errno.EPERM)
+
+    def add(self, path: str, size: int, is_dir: bool) -> None:
+        with self._lock:
+            if path not in self._entries:
+                self._entries[path] = (size, is_dir)
+                self.queued += 1
+
+    def drain(self) -> List[Tuple[str, int, bool]]:
+        """Take every queued entry, deepest first so children go before their parents."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        return sorted(((path, size, is_dir) for path, (size, is_dir) in entries.items()),
+                      key=lambda entry: entry[0].count(os.sep), reverse=True)
+
+    def _clear_inode_flags(self, path: str) -> bool:
+        if fcntl is None or not sys.platform.startswith('linux'):
+            if hasattr(os, 'chflags'):  # BSD/macOS: uchg/schg/uappnd/sappnd
+                os.chflags(path, 0, follow_symlinks=False)
+                return True
+            return False
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | getattr(os, 'O_NOFOLLOW', 0))
+        try:
+            flags = struct.unpack('i', fcntl.ioctl(fd, FS_IOC_GETFLAGS, struct.pack('i', 0)))[0]
+            if not flags & (FS_IMMUTABLE_FL | FS_APPEND_FL):
+                return False
+            fcntl.ioctl(fd, FS_IOC_SETFLAGS, struct.pack('i', flags & ~(FS_IMMUTABLE_FL | FS_APPEND_FL)))
+            return True
+        finally:
+            os.close(fd)
+
+    def _reset_one(self, path: str, is_dir: bool) -> None:
+        if os.name == 'nt':
+            if windll is not None and windll.kernel32.SetFileAttributesW(path, FILE_ATTRIBUTE_NORMAL):
+                self.resets += 1
+            return
+        try:
+            # Immutable inodes refuse chmod too, so the flags go first
+            if self._clear_inode_flags(path):
+                self.resets += 1
+            if not os.path.islink(path):
+                mode = stat.S_IRWXU if is_dir else stat.S_IRUSR | stat.S_IWUSR
+                os.chmod(path, stat.S_IMODE(os.lstat(path).st_mode) | mode)
+                self.resets += 1
+        except OSError as e:
+            logger.debug(f"Permission reset failed for {path}: {e}")
+
+    def reset(self, entries: List[Tuple[str, int, bool]], root: str) -> None:
+        """Clear permissions and attributes on the entries and their parent directories in-process.
+
+        Only root and paths below it are touched; the directory containing root is left alone.
+        """
+        root = os.path.normpath(root)
+        prefix = os.path.join(root, '')
+        parents = {os.path.dirname(path) for path, _, _ in entries} - {path for path, _, _ in entries}
+        for parent in sorted(parent for parent in parents if parent == root or parent.startswith(prefix)):
+            self._reset_one(parent, True)
+        for path, _, is_dir in entries:
+            self._reset_one(path, is_dir)
+
+    @staticmethod
+    def ownership_script(paths: List[str]) -> str:
+        """The cmd script that runs takeown and icacls on every path."""
+        # Delayed expansion off so '!' stays literal; '^' and '&' are literal inside the quotes
+        lines = ['@echo off', 'setlocal DisableDelayedExpansion', 'chcp 65001 >nul']
+        for path in paths:
+            path = path[4:] if path.startswith('\\\\?\\') else path
+            path = path.replace('%', '%%')  # Expanded even inside quotes in a batch file
+            lines.append(f'takeown /f "{path}" /a >nul 2>&1')
+            lines.append(f'icacls "{path}" /grant administrators:F /c /q >nul 2>&1')
+        return '\n'.join(lines) + '\n'
+
+    def reset_ownership(self, paths: List[str]) -> None:
+        """Take ownership and grant full control on all paths with one external command (Windows)."""
+        if os.name != 'nt' or not paths:
+            return
+        fd, script = tempfile.mkstemp(prefix='forcepurge_acl_', suffix='.cmd')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.ownership_script(paths))
+            subprocess.run(['cmd', '/c', script], check=False, timeout=30 + 0.1 * len(paths))
+            self.external_runs += 1
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Batched ownership reset failed: {e}")
+        finally:
+            try:
+                os.unlink(script)
+            except OSError:
+                pass
+
 class HighSpeedForcePurge:
     """Ultra-high-speed Windows file/folder force deletion class - 1+ GB/s optimized."""
     
-    def __init__(self, verbose: bool = False, dry_run: bool = False, force_reboot: bool = False, max_workers: int = 32):
+    def __init__(self, verbose: bool = False, dry_run: bool = False, force_reboot: bool = False, max_workers: int = 32,
+                 streaming: bool = False, stream_queue_size: int = 4096, adaptive_workers: bool = True,
+                 progress_rate: float = 4.0, stats_path: Optional[str] = None, batch_fallbacks: bool = False):
         self.verbose = verbose
         self.dry_run = dry_run
         self.force_reboot = force_reboot
+        self.streaming = streaming  # Single-pass scan that deletes while walking
+        self.stream_queue_size = stream_queue_size  # Bound on queued-but-not-deleted entries
+        self.adaptive_workers = adaptive_workers  # Tune worker count from measured throughput/latency
+        self.chosen_concurrency = 0  # Worker count the last traversal settled on
+        self.progress_rate = progress_rate  # Max progress renders per second
+        self.stats_path = stats_path  # Optional JSON-lines metrics stream
         self.locked_files: Set[str] = set()
         self.processed_items: Set[str] = set()
         self.bytes_deleted = 0
         self.total_size = 0
         self.start_time = None
         self.max_workers = max_workers  # Increased for maximum throughput
-        self.progress_update_interval = 0.001  # Ultra-fast updates (1ms)
-        self.last_progress_time = 0
         self.items_deleted = 0
         self.total_items = 0
         self.lock = threading.Lock()  # Thread-safe operations
+        self.lock_index = LockIndex()  # Shared open-handle snapshot for lock-holder lookups
+        self.strategy_selector = StrategySelector()  # Learned ordering of force-delete fallbacks
+        # Defer permission-refused entries to one in-process reset pass instead of per-path shell fallbacks
+        self.permission_batch = PermissionResetBatch() if batch_fallbacks else None
         
         # Check admin privileges
         if not self.is_admin():
@@ -122,11 +930,7 @@ class HighSpeedForcePurge:
     
     def format_bytes(self, bytes_count: int) -> str:
         """Format bytes into human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_count < 1024.0:
-                return f"{bytes_count:.2f} {unit}"
-            bytes_count /= 1024.0
-        return f"{bytes_count:.2f} PB"
+        return _format_bytes(bytes_count)
     
     def is_admin(self) -> bool:
         """Check if running as administrator."""
@@ -370,42 +1174,37 @@ class HighSpeedForcePurge:
             return False
     
     def find_locking_processes(self, path: str) -> List[int]:
-        """Find processes that have the file open."""
-        if not HAS_PSUTIL:
+        """Find processes that have the file open (O(1) lookup in the shared lock index)."""
+        if not self.lock_index.available:
             return []
-        
-        locking_pids = []
-        for proc in psutil.process_iter(['pid', 'open_files']):
-            try:
-                if proc.info['open_files']:
-                    for open_file in proc.info['open_files']:
-                        if open_file.path.lower() == path.lower():
-                            locking_pids.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        return locking_pids
+        return self.lock_index.lookup(path)
     
     def kill_locking_processes(self, path: str) -> bool:
         """Kill processes that are locking the file."""
         pids = self.find_locking_processes(path)
         if not pids:
+            # Still failing but no known holder - the snapshot may be stale
+            self.lock_index.note_failure(path)
             return True
         
         success = True
         for pid in pids:
             try:
-                proc = psutil.Process(pid)
                 logger.info(f"Terminating process {pid} that is locking {path}")
-                proc.terminate()
-                try:
-                    proc.wait(timeout=5)  # Wait up to 5 seconds for graceful termination
-                except psutil.TimeoutExpired:
-                    proc.kill()  # Force kill if graceful termination fails
+                if HAS_PSUTIL:
+                    proc = psutil.Process(pid)
+                    proc.terminate()
+                    try:
+                        proc.wait(timeout=5)  # Wait up to 5 seconds for graceful termination
+                    except psutil.TimeoutExpired:
+                        proc.kill()  # Force kill if graceful termination fails
+                else:
+                    os.kill(pid, signal.SIGTERM)
                 logger.info(f"Process {pid} terminated")
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            except Exception as e:
                 logger.warning(f"Could not terminate process {pid}: {e}")
                 success = False
+            self.lock_index.forget(pid)
         
         return success
     
@@ -652,6 +1451,8 @@ class HighSpeedForcePurge:
             elif os.path.isdir(original_path):
                 dir_size = self.get_directory_size(original_path)
                 shutil.rmtree(original_path, ignore_errors=True)
+                if os.path.exists(original_path):
+                    return False
                 self.bytes_deleted += dir_size
                 if self.verbose:
                     current_time = time.time()
@@ -679,6 +1480,8 @@ class HighSpeedForcePurge:
                 dir_size = self.get_directory_size(original_path)
                 # Use shutil.rmtree with ignore_errors for faster directory deletion
                 shutil.rmtree(original_path, ignore_errors=True)
+                if os.path.exists(original_path):
+                    return False
                 self.bytes_deleted += dir_size
                 if self.verbose:
                     current_time = time.time()
@@ -710,6 +1513,8 @@ class HighSpeedForcePurge:
                 dir_size = self.get_directory_size(original_path)
                 # Use shutil.rmtree with ignore_errors for faster directory deletion
                 shutil.rmtree(original_path, ignore_errors=True)
+                if os.path.exists(original_path):
+                    return False
                 self.bytes_deleted += dir_size
                 if self.verbose:
                     current_time = time.time()
@@ -721,8 +1526,15 @@ class HighSpeedForcePurge:
             logger.debug(f"Fast NTDLL deletion failed: {e}")
             return False
 
-    def force_delete_item(self, path: str) -> bool:
-        """Force delete a single file or directory with maximum speed."""
+    def force_delete_item(self, path: str, error_code: Optional[int] = None) -> bool:
+        """Force delete a single file or directory with maximum speed.
+
+        Fallback methods are tried in the order the strategy selector has
+        learned works for similar paths (same parent, extension and error
+        code), so a tree full of identical stubborn files stops paying for
+        methods that never succeed there. Once nothing works in a context, the
+        subprocess methods are skipped and the item goes to reboot scheduling.
+        """
         if path in self.processed_items:
             return True
         
@@ -737,24 +1549,46 @@ class HighSpeedForcePurge:
         logger.debug(f"Attempting to delete: {path}")
         
         # Try fastest methods first without extensive error handling for speed
-        methods = [
-            lambda: self._try_winapi_delete_fast(path, original_path),
-            lambda: self._try_shutil_delete_fast(path, original_path),
-            lambda: self._try_ntdll_delete_fast(path, original_path),
-            lambda: self.force_delete_with_del(original_path) if os.path.isfile(original_path) else False,
-            lambda: self.force_delete_with_rmdir(original_path) if os.path.isdir(original_path) else False,
-            lambda: self.force_delete_with_subst(original_path),
-        ]
+        methods = {
+            'winapi': lambda: self._try_winapi_delete_fast(path, original_path),
+            'shutil': lambda: self._try_shutil_delete_fast(path, original_path),
+            'ntdll': lambda: self._try_ntdll_delete_fast(path, original_path),
+            # None: the method does not apply to this entry type, which says nothing about the context
+            'del': lambda: self.force_delete_with_del(original_path) if os.path.isfile(original_path) else None,
+            'rmdir': lambda: self.force_delete_with_rmdir(original_path) if os.path.isdir(original_path) else None,
+            'subst': lambda: self.force_delete_with_subst(original_path),
+            'aggressive': lambda: self._force_delete_aggressive(path, original_path),
+        }
         
-        for method in methods:
+        selector = self.strategy_selector
+        context = selector.context_for(original_path, error_code, os.path.isdir(original_path))
+        attempt = 0
+        for name in selector.plan(context):
+            start = time.perf_counter()
             try:
-                if method():
-                    logger.debug(f"Successfully deleted: {path}")
-                    return True
+                result = methods[name]()
             except Exception as e:
-                logger.debug(f"Method failed for {path}: {e}")
+                logger.debug(f"Method {name} failed for {path}: {e}")
+                result = False
+            if result is None:
                 continue
+            succeeded = bool(result)
+            selector.record(context, name, succeeded, time.perf_counter() - start, attempt)
+            attempt += 1
+            if succeeded:
+                logger.debug(f"Successfully deleted with {name}: {path}")
+                return True
         
+        # If all methods fail, schedule for reboot deletion
+        if self.force_reboot:
+            logger.warning(f"Scheduling {original_path} for reboot deletion")
+            return self.move_to_reboot_delete(original_path)
+        
+        logger.error(f"Failed to delete: {path}")
+        return False
+    
+    def _force_delete_aggressive(self, path: str, original_path: str) -> bool:
+        """Retry loop with system tuning, ownership and handle-killing tricks."""
         # If comtypes is not available, skip COM-based methods and go directly to aggressive methods
         if not HAS_COMTYPES:
             # Go straight to enhanced comprehensive approach with more aggressive methods
@@ -963,12 +1797,6 @@ class HighSpeedForcePurge:
                 # Adaptive delay between attempts - shorter delays for faster iterations
                 time.sleep(0.05 * min(attempt + 1, 3))  # Maximum 0.15 second delay
             
-            # If all methods fail, schedule for reboot deletion
-            if self.force_reboot:
-                logger.warning(f"Scheduling {original_path} for reboot deletion")
-                return self.move_to_reboot_delete(original_path)
-            
-            logger.error(f"Failed to delete: {path}")
             return False
         
         # Enhanced comprehensive approach with more aggressive methods
@@ -1197,12 +2025,6 @@ class HighSpeedForcePurge:
             # Adaptive delay between attempts - shorter delays for faster iterations
             time.sleep(0.05 * min(attempt + 1, 3))  # Maximum 0.15 second delay
         
-        # If all methods fail, schedule for reboot deletion
-        if self.force_reboot:
-            logger.warning(f"Scheduling {original_path} for reboot deletion")
-            return self.move_to_reboot_delete(original_path)
-        
-        logger.error(f"Failed to delete: {path}")
         return False
     
     def _try_shutil_delete(self, path: str, original_path: str) -> bool:
@@ -1374,7 +2196,231 @@ class HighSpeedForcePurge:
             logger.debug(f"NTDLL deletion failed: {e}")
             return False
     
-    def traverse_and_delete(self, path: str, max_workers: int = 256) -> bool:  # Increased to 256 for maximum performance
+    def scan_tree_streaming(self, path: str) -> Iterator[Tuple[str, int, bool]]:
+        """Walk a tree once with os.scandir, yielding (path, size, is_dir) entries.
+
+        Files are yielded as soon as their directory has been listed, reusing the
+        DirEntry stat data instead of a second getsize() call. Directories are
+        yielded after all of their contents (post-order). Only the list of
+        not-yet-visited directories is held in memory.
+        """
+        stack = [(path, False)]
+        while stack:
+            current, listed = stack.pop()
+            if listed:
+                yield current, 0, True
+                continue
+            stack.append((current, True))
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_symlink() or getattr(entry, 'is_junction', lambda: False)():
+                                # Remove the link itself, never its target
+                                yield entry.path, 0, os.name == 'nt' and entry.is_dir()
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, False))
+                                continue
+                            size = entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            size = 0
+                        yield entry.path, size, False
+            except OSError as e:
+                logger.debug(f"Error scanning directory {current}: {e}")
+
+    def _delete_streamed_entry(self, path: str, size: int, is_dir: bool, child_failed: bool = False) -> Optional[bool]:
+        """Remove one scanned entry with a single syscall, falling back to the force chain.
+
+        A directory whose children could not all be deleted is not empty, so the
+        fast rmdir is skipped and it goes straight to the fallback chain. With
+        batched fallbacks, permission-refused entries (and their parents), and
+        entries in a context where no fallback has ever worked, are queued for
+        the permission reset pass instead, and None is returned.
+        """
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would delete: {path}")
+            return True
+        batch = self.permission_batch
+        if child_failed:
+            if batch is not None:
+                batch.add(path, size, is_dir)
+                return None
+            return self.force_delete_item(path)
+        try:
+            if is_dir:
+                os.rmdir(path)
+            else:
+                os.unlink(path)
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            if batch is not None and batch.is_permission_error(e):
+                batch.add(path, size, is_dir)
+                return None
+            error_code = getattr(e, 'winerror', None) or e.errno
+            if batch is not None and self.strategy_selector.circuit_open(
+                    StrategySelector.context_for(path, error_code, is_dir)):
+                batch.add(path, size, is_dir)  # Nothing works here per path; skip straight to the reset pass
+                return None
+            logger.debug(f"Fast delete failed for {path}: {e} - using fallback chain")
+            return self.force_delete_item(path, error_code)
+        with self.lock:
+            self.bytes_deleted += size
+        return True
+
+    def _process_streamed_entry(self, entry_path: str, size: int, is_dir: bool, progress: PurgeProgress,
+                                child_failed: bool = False) -> bool:
+        """Delete one entry and record the outcome in the progress counters.
+
+        Entries deferred to the permission reset pass are counted when that pass
+        handles them, but report False so their parent is deferred too.
+        """
+        try:
+            result = self._delete_streamed_entry(entry_path, size, is_dir, child_failed)
+        except Exception as e:
+            logger.error(f"Exception deleting {entry_path}: {e}")
+            result = False
+        if result is None:
+            return False
+        if result:
+            progress.record(1, size)
+        else:
+            progress.record(0, 0, 1)
+            logger.error(f"Failed to delete: {entry_path}")
+        return result
+
+    def _flush_permission_batch(self, progress: PurgeProgress, root: str) -> None:
+        """Reset permissions on every deferred entry at once, then delete them deepest first.
+
+        Entries that are still refused get one batched ownership reset (Windows)
+        before the remaining failures go through the per-path fallback chain.
+        """
+        batch = self.permission_batch
+        if batch is None or not len(batch):
+            return
+        entries = batch.drain()
+        logger.info(f"Resetting permissions on {len(entries)} refused items in one batch...")
+        batch.reset(entries, root)
+        refused = []
+        for path, size, is_dir in entries:
+            try:
+                if is_dir:
+                    os.rmdir(path)
+                else:
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                refused.append((path, size, is_dir, getattr(e, 'winerror', None) or e.errno))
+                continue
+            with self.lock:
+                self.bytes_deleted += size
+            progress.record(1, size)
+        if refused:
+            batch.reset_ownership([path for path, _, _, _ in refused])
+        for path, size, is_dir, error_code in refused:
+            if self.force_delete_item(path, error_code):
+                progress.record(1, size)
+            else:
+                progress.record(0, 0, 1)
+                logger.error(f"Failed to delete: {path}")
+        logger.info(f"Permission reset pass: {len(entries) - len(refused)}/{len(entries)} deleted directly, "
+                    f"{batch.resets} in-process resets, {batch.external_runs} external commands")
+
+    def _delete_and_release(self, entry_path: str, size: int, is_dir: bool, child_failed: bool,
+                            tracker: DirectoryDependencyTracker, progress: PurgeProgress) -> None:
+        """Delete an entry, then remove every parent directory that its deletion released.
+
+        Released parents are removed inline by the worker that deleted their last
+        child, so no work item is ever scheduled before its directory is empty.
+        """
+        while True:
+            result = self._process_streamed_entry(entry_path, size, is_dir, progress, child_failed)
+            released = tracker.resolve(entry_path, result)
+            if released is None:
+                return
+            entry_path, child_failed = released
+            size, is_dir = 0, True
+
+    def _schedule_scanned_entry(self, entry: Tuple[str, int, bool], tracker: DirectoryDependencyTracker):
+        """Register a scanned entry and return the work item to run now, if any.
+
+        Files are runnable immediately; a directory is only runnable if all of its
+        children were already deleted by the time the scanner sealed it.
+        """
+        entry_path, size, is_dir = entry
+        tracker.add_child(entry_path)
+        if not is_dir:
+            return entry_path, size, False, False
+        child_failed = tracker.seal(entry_path)
+        if child_failed is None:
+            return None
+        return entry_path, 0, True, child_failed
+
+    def _create_worker_pool(self, max_workers: Optional[int] = None, queue_size: int = 0) -> ResizableWorkerPool:
+        """Build the deletion pool, never larger than the configured max_workers.
+
+        Adaptive pools start at half the ceiling and tune between 1 and it;
+        with adaptive tuning off the pool stays at the ceiling.
+        """
+        ceiling = min(self.max_workers, max_workers or self.max_workers)
+        if self.adaptive_workers:
+            controller = AdaptiveConcurrencyController(max(1, ceiling // 2), min_workers=1, max_workers=ceiling)
+        else:
+            controller = AdaptiveConcurrencyController(ceiling, min_workers=ceiling, max_workers=ceiling)
+        return ResizableWorkerPool(controller, queue_size=queue_size)
+
+    def _create_progress(self, pool: ResizableWorkerPool, total_items: int = 0, total_bytes: int = 0) -> PurgeProgress:
+        """Build the rate-limited progress reporter for one traversal."""
+        progress = PurgeProgress(total_items, total_bytes, renders_per_second=self.progress_rate,
+                                 stats_path=self.stats_path)
+        progress.gauges['workers'] = lambda: pool.size
+        return progress
+
+    def _log_concurrency_summary(self, pool: ResizableWorkerPool) -> None:
+        self.chosen_concurrency = pool.controller.concurrency
+        logger.info(f"Worker concurrency: {pool.controller.summary()}")
+
+    def traverse_and_delete_streaming(self, path: str, max_workers: Optional[int] = None) -> bool:
+        """Scan and delete in a single pass with flat memory use.
+
+        The scanner feeds files into a bounded queue, so workers start unlinking
+        as soon as the first directory is listed and the scanner blocks instead of
+        buffering when deletion falls behind. Directories are removed by the
+        worker that deletes their last child.
+        """
+        tracker = DirectoryDependencyTracker(path)
+        scanned = 0
+
+        pool = self._create_worker_pool(max_workers, queue_size=self.stream_queue_size)
+        progress = self._create_progress(pool)
+        logger.info(f"Starting streaming deletion with {pool.size} workers (max {pool.controller.max_workers}, "
+                    f"queue bound: {self.stream_queue_size})...")
+
+        with progress:
+            with pool:
+                for entry in self.scan_tree_streaming(path):
+                    scanned += 1
+                    self.total_size += entry[1]
+                    progress.discover(1, entry[1])
+                    work_item = self._schedule_scanned_entry(entry, tracker)
+                    if work_item is not None:
+                        pool.execute(self._delete_and_release, *work_item, tracker, progress)
+                progress.scan_complete = True
+            self._flush_permission_batch(progress, path)
+
+        deleted, _, failed = progress.totals()
+        self.items_deleted += deleted
+        elapsed = time.time() - (self.start_time or time.time())
+        logger.info(f"Streaming deletion completed: {deleted}/{scanned} items deleted, {failed} failed")
+        logger.info(f"Final bytes deleted: {self.format_bytes(self.bytes_deleted)}")
+        if elapsed > 0:
+            logger.info(f"Average speed: {self.format_bytes(self.bytes_deleted / elapsed)}/s")
+        self._log_concurrency_summary(pool)
+        return deleted + failed == scanned
+
+    def traverse_and_delete(self, path: str, max_workers: Optional[int] = None) -> bool:
         """Traverse directory tree and delete items in parallel with maximum speed."""
         if not os.path.exists(path):
             logger.info(f"Path does not exist: {path}")
@@ -1383,117 +2429,56 @@ class HighSpeedForcePurge:
         if os.path.isfile(path):
             return self.force_delete_item(path)
         
-        # Use optimized directory traversal for maximum speed
-        items_to_delete = []
-        total_size = 0
+        path = os.path.normpath(path)
+        if self.streaming:
+            return self.traverse_and_delete_streaming(path, max_workers)
         
-        # First pass: collect all items and calculate total size efficiently
-        for root, dirs, files in os.walk(path, topdown=False):
-            # Add files first (more efficient - files are smaller operations)
-            for file in files:
-                file_path = os.path.join(root, file)
-                items_to_delete.append(file_path)
-                try:
-                    total_size += os.path.getsize(file_path)
-                except:
-                    pass
-            # Add directories
-            for dir in dirs:
-                dir_path = os.path.join(root, dir)
-                items_to_delete.append(dir_path)
-                try:
-                    total_size += self.get_directory_size(dir_path)
-                except:
-                    pass
-        # Add the root directory itself
-        items_to_delete.append(path)
+        # First pass: collect all items in post-order with a single scandir walk
+        items_to_delete = list(self.scan_tree_streaming(path))
         total_count = len(items_to_delete)
+        total_size = sum(size for _, size, _ in items_to_delete)
+        tracker = DirectoryDependencyTracker(path)
         
         # Update total size for progress tracking
         self.total_size = total_size
         
-        # Use maximum parallelism for speed
-        success_count = 0
-        failed_count = 0
-        last_progress_time = time.time()
-        last_bytes_update = 0
-        initial_bytes = self.bytes_deleted
-        progress_update_interval = 0.0001  # Ultra-fast updates (0.1ms) for real-time tracking
-        emergency_workers_increase = 0 # Track emergency worker increases
-        dynamic_workers = max_workers  # Dynamic worker count for performance
+        last_tuning_check = time.time()
+        system_tuning_applied = False
+        
+        # Worker count is tuned from measured throughput and latency instead of a fixed thread count
+        pool = self._create_worker_pool(max_workers)
+        # Progress is counted per thread and rendered a few times a second, never per item
+        progress = self._create_progress(pool, total_count, total_size)
         
-        logger.info(f"Starting ultra-high-speed deletion of {total_count} items with {dynamic_workers} workers...")
+        logger.info(f"Starting ultra-high-speed deletion of {total_count} items with {pool.size} workers "
+                    f"(max {pool.controller.max_workers})...")
         logger.info(f"Initial bytes to delete: {self.format_bytes(self.total_size)}")
         logger.info(f"Target: 1+ GB/s performance optimization active")
-        logger.info(f"Real-time progress tracking enabled - 0.1ms updates")
-        logger.info(f"Maximum parallelism optimization - 256+ workers active")
-        logger.info(f"Emergency performance optimization system activated")
         
-        # Use maximum parallelism with dynamic worker adjustment
-        with ThreadPoolExecutor(max_workers=dynamic_workers) as executor:
-            # Submit all deletion tasks immediately for maximum parallelism
-            future_to_path = {
-                executor.submit(self.force_delete_item, item_path): item_path 
-                for item_path in items_to_delete
-            }
+        with progress, pool as executor:
+            # Submit files immediately; directories are removed by the worker that deletes their last child
+            future_to_path = {}
+            for entry in items_to_delete:
+                work_item = self._schedule_scanned_entry(entry, tracker)
+                if work_item is not None:
+                    future_to_path[executor.submit(self._delete_and_release, *work_item, tracker, progress)] = work_item[0]
             
             # Collect results with minimal blocking for maximum speed
             for future in as_completed(future_to_path, timeout=None):
                 item_path = future_to_path[future]
                 try:
-                    result = future.result(timeout=30)  # Increased timeout for large files
-                    if result:
-                        success_count += 1
-                    else:
-                        failed_count += 1
-                        logger.error(f"Failed to delete: {item_path}")
+                    future.result(timeout=30)  # Increased timeout for large files
                 except Exception as e:
-                    failed_count += 1
                     logger.error(f"Exception deleting {item_path}: {e}")
                 
-                # Ultra-fast progress updates for real-time feedback
+                # System-level optimizations for critical performance (checked once a second, applied once per run)
                 current_time = time.time()
-                current_bytes = self.bytes_deleted
-                bytes_since_last = current_bytes - last_bytes_update
-                elapsed = current_time - (self.start_time or current_time)
-                progress_percent = (success_count / total_count) * 10 if total_count > 0 else 0
-                total_bytes_per_second = current_bytes / elapsed if elapsed > 0 else 0  # Overall rate
-                instant_rate = bytes_since_last / (current_time - last_progress_time + 0.0001) if current_time - last_progress_time > 0 else 0  # Instant rate
-                
-                # Dynamic worker adjustment for 1+ GB/s target
-                if total_bytes_per_second < 1073741824:  # Below 1 GB/s
-                    if total_bytes_per_second < 536870912: # Below 512 MB/s
-                        dynamic_workers = min(512, dynamic_workers + 128)  # Aggressive increase
-                        emergency_workers_increase += 128
-                        logger.critical(f"CRITICAL: Performance {self.format_bytes(total_bytes_per_second)}/s - Emergency worker boost to {dynamic_workers}")
-                    elif total_bytes_per_second < 1073741824:  # Below 1 GB/s
-                        dynamic_workers = min(384, dynamic_workers + 64)  # Moderate increase
-                        emergency_workers_increase += 64
-                        logger.warning(f"PERFORMANCE: {self.format_bytes(total_bytes_per_second)}/s - Boosting workers to {dynamic_workers}")
-                
-                # Ultra-frequent updates for real-time feedback (every 0.1ms)
-                if current_time - last_progress_time >= progress_update_interval:
-                    time_remaining = (self.total_size - current_bytes) / total_bytes_per_second if total_bytes_per_second > 0 else float('inf')
-                    logger.info(f"PROGRESS: {success_count}/{total_count} items ({progress_percent:.3f}%) - "
-                              f"Bytes: {self.format_bytes(current_bytes)}/{self.format_bytes(self.total_size)} - "
-                              f"Rate: {self.format_bytes(total_bytes_per_second)}/s - "
-                              f"Instant: {self.format_bytes(instant_rate)}/s - "
-                              f"Time: {elapsed:.2f}s/{time_remaining:.2f}s - "
-                              f"Delta: {self.format_bytes(bytes_since_last)} - "
-                              f"Workers: {dynamic_workers} - Emergency: +{emergency_workers_increase}")
-                    last_progress_time = current_time
-                    last_bytes_update = current_bytes
-                    
-                    # Performance verification and optimization
-                    if total_bytes_per_second >= 1073741824:  # 1+ GB/s achieved
-                        logger.info(f"PERFORMANCE: Maintaining {self.format_bytes(total_bytes_per_second)}/s - 1+ GB/s target achieved!")
-                    elif total_bytes_per_second >= 536870912:  # 512 MB/s to 1 GB/s
-                        logger.info(f"PERFORMANCE: Maintaining {self.format_bytes(total_bytes_per_second)}/s - Good performance (512MB/s+)")
-                    else:
-                        logger.warning(f"PERFORMANCE: {self.format_bytes(total_bytes_per_second)}/s - Below 1+ GB/s target")
-                    
-                    # System-level optimizations for critical performance
+                if not system_tuning_applied and current_time - last_tuning_check >= 1.0:
+                    last_tuning_check = current_time
+                    elapsed = current_time - (self.start_time or current_time)
+                    total_bytes_per_second = self.bytes_deleted / elapsed if elapsed > 0 else 0
                     if total_bytes_per_second < 104857600:  # Below 100 MB/s
+                        system_tuning_applied = True
                         try:
                             # Disable system file access tracking for performance
                             subprocess.run(['fsutil', 'behavior', 'set', 'DisableLastAccess', '1'], shell=True, check=False, timeout=1)
@@ -1502,16 +2487,21 @@ class HighSpeedForcePurge:
                             kernel32 = ctypes.windll.kernel32
                             handle = kernel32.GetCurrentProcess()
                             kernel32.SetPriorityClass(handle, 0x000080)  # HIGH_PRIORITY_CLASS
-                            logger.critical(f"CRITICAL: Applied system optimizations for {self.format_bytes(total_bytes_per_second)}/s")
+                            logger.warning(f"Applied system optimizations for {self.format_bytes(total_bytes_per_second)}/s")
                         except:
                             pass
+            
+            # Every future has finished, so the deferred entries now include all their parents
+            self._flush_permission_batch(progress, path)
         
+        success_count, _, failed_count = progress.totals()
+        self.items_deleted += success_count
         logger.info(f"Ultra-high-speed deletion completed: {success_count}/{total_count} items deleted, {failed_count} failed")
         logger.info(f"Final bytes deleted: {self.format_bytes(self.bytes_deleted)}")
-        logger.info(f"Average speed: {self.format_bytes(self.bytes_deleted / (time.time() - (self.start_time or time.time())))}/s")
-        logger.info(f"Peak performance: 1+ GB/s optimization successful")
-        logger.info(f"Maximum parallelism: All workers completed successfully")
-        logger.info(f"Emergency optimizations: {emergency_workers_increase} total worker increases applied")
+        elapsed = time.time() - (self.start_time or time.time())
+        if elapsed > 0:
+            logger.info(f"Average speed: {self.format_bytes(self.bytes_deleted / elapsed)}/s")
+        self._log_concurrency_summary(pool)
         return success_count + failed_count == total_count
     
     def verify_deletion(self, path: str) -> bool:
@@ -1609,7 +2599,10 @@ class HighSpeedForcePurge:
         self.bytes_deleted = 0
         
         # Calculate total size for progress tracking
-        if os.path.isdir(path):
+        if os.path.isdir(path) and self.streaming:
+            # The streaming scanner accumulates sizes as it walks - no separate sizing pass
+            self.total_size = 0
+        elif os.path.isdir(path):
             self.total_size = self.get_directory_size(path)
             logger.info(f"Total size to delete: {self.format_bytes(self.total_size)}")
         else:
@@ -1627,8 +2620,14 @@ class HighSpeedForcePurge:
         
         end_time = time.time()
         logger.info(f"Deletion completed in {end_time - self.start_time:.2f} seconds")
+        if self.lock_index.lookups:
+            logger.info(f"Lock index: {self.lock_index.lookups} lookups, {self.lock_index.full_refreshes} full / "
+                        f"{self.lock_index.incremental_refreshes} incremental snapshots")
+        if self.strategy_selector.plans:
+            logger.info(f"Fallback strategies: {self.strategy_selector.summary()}")
         logger.info(f"Total bytes deleted: {self.format_bytes(self.bytes_deleted)}")
-        logger.info(f"Deletion success rate: {self.bytes_deleted}/{self.total_size} bytes ({(self.bytes_deleted/self.total_size*100):.2f}%)")
+        if self.total_size > 0:
+            logger.info(f"Deletion success rate: {self.bytes_deleted}/{self.total_size} bytes ({(self.bytes_deleted/self.total_size*100):.2f}%)")
         
         # Final comprehensive verification pass
         logger.info("Starting comprehensive verification pass...")
@@ -1681,6 +2680,8 @@ Examples:
   python app.py "C:\\path\\to\\delete" --dry-run
   python app.py "C:\\path\\to\\delete" --force-reboot
   python app.py "C:\\path1" "C:\\path2" "C:\\path3" --max-workers 64
+  python app.py "C:\\huge\\build-cache" --streaming
+  python app.py "C:\\locked\\read-only-tree" --batch-fallbacks
         """
     )
     parser.add_argument(
@@ -1712,12 +2713,37 @@ Examples:
         '--max-workers',
         type=int,
         default=32,
-        help='Maximum number of worker threads (default: 32)'
+        help='Maximum number of worker threads; adaptive tuning starts at half of it (default: 32)'
+    )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Single-pass streaming traversal: start deleting while scanning, with flat memory use'
+    )
+    parser.add_argument(
+        '--batch-fallbacks',
+        action='store_true',
+        help='Queue permission-denied items and reset them in one in-process pass instead of per-item shell fallbacks'
+    )
+    parser.add_argument(
+        '--fixed-workers',
+        action='store_true',
+        help='Disable adaptive worker tuning and run with a fixed worker count'
     )
     parser.add_argument(
         '--real-time-progress',
         action='store_true',
-        help='Enable real-time progress tracking with 1ms updates'
+        help='Enable real-time progress tracking (redraws the status line 20 times per second)'
+    )
+    parser.add_argument(
+        '--progress-rate',
+        type=float,
+        default=4.0,
+        help='Maximum progress updates per second (default: 4, 0 disables live progress)'
+    )
+    parser.add_argument(
+        '--stats-file',
+        help='Append machine-readable progress samples to this JSON-lines file'
     )
     
     args = parser.parse_args()
@@ -1746,7 +2772,12 @@ Examples:
         verbose=args.verbose,
         dry_run=args.dry_run,
         force_reboot=args.force_reboot,
-        max_workers=args.max_workers
+        max_workers=args.max_workers,
+        streaming=args.streaming,
+        adaptive_workers=not args.fixed_workers,
+        progress_rate=20.0 if args.real_time_progress else args.progress_rate,
+        stats_path=args.stats_file,
+        batch_fallbacks=args.batch_fallbacks
     )
     
     # Perform deletion on all specified paths
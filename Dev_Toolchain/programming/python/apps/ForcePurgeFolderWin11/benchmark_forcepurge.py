@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+ForcePurge benchmark - measures HighSpeedForcePurge.delete() on reproducible synthetic trees
+
+Every (shape, strategy, workers) case builds a fresh tree from a fixed seed, then
+purges it in a child process so peak RSS and call counters belong to that run
+alone. Results are written as JSON for tracking throughput regressions.
+
+Examples:
+  python benchmark_forcepurge.py
+  python benchmark_forcepurge.py --shapes wide,tiny --workers 4,16,64 --strategies eager,streaming
+  python benchmark_forcepurge.py --scale 0.1 --output bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: peak memory comes from psutil instead
+
+# Add the current directory to Python path to import app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BLOCK = random.Random(0).randbytes(1024 * 1024)  # Shared payload so tree building is not RNG-bound
+LONG_NAME = 'long_directory_name_' * 5  # 100 characters per level
+
+# Filesystem calls counted in the child; each maps to one system call
+COUNTED_CALLS = ('scandir', 'listdir', 'stat', 'lstat', 'unlink', 'remove', 'rmdir', 'chmod', 'open', 'rename')
+
+STRATEGIES = {
+    'eager': {},
+    'streaming': {'streaming': True},
+    'batched': {'batch_fallbacks': True},
+    'fixed': {'adaptive_workers': False},
+}
+
+
+def write_file(path: str, size: int) -> None:
+    with open(path, 'wb') as f:
+        while size > 0:
+            chunk = BLOCK[:min(size, len(BLOCK))]
+            f.write(chunk)
+            size -= len(chunk)
+
+
+def build_files(directory: str, count: int, rng: random.Random, max_size: int) -> Tuple[int, int]:
+    total = 0
+    for i in range(count):
+        size = rng.randint(0, max_size)
+        write_file(os.path.join(directory, f'f{i:06d}.dat'), size)
+        total += size
+    return count, total
+
+
+def build_wide(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """One flat directory holding many small files."""
+    return build_files(root, max(1, int(20000 * scale)), rng, 4096)
+
+
+def build_deep(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """A single narrow chain of nested directories with a few files per level."""
+    items = total = 0
+    current = root
+    for _ in range(max(1, min(int(400 * scale), 1500))):
+        count, nbytes = build_files(current, 4, rng, 1024)
+        current = os.path.join(current, 'd')
+        os.mkdir(current)
+        items += count + 1
+        total += nbytes
+    return items, total
+
+
+def build_tiny(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """A bushy three-level tree of empty and one-byte files."""
+    items = total = 0
+    fanout = max(1, round(10 * scale ** (1 / 3)))
+    for a in range(fanout):
+        for b in range(fanout):
+            for c in range(fanout):
+                directory = os.path.join(root, f'a{a}', f'b{b}', f'c{c}')
+                os.makedirs(directory)
+                count, nbytes = build_files(directory, 20, rng, 1)
+                items += count
+                total += nbytes
+        items += fanout * fanout + fanout + 1
+    return items, total
+
+
+def build_huge(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """A handful of very large files, where bytes/s rather than items/s matters."""
+    size = max(1, int(32 * 1024 * 1024 * scale))
+    for i in range(8):
+        write_file(os.path.join(root, f'huge{i}.bin'), size)
+    return 8, 8 * size
+
+
+def build_readonly(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """A tree where every file and directory is read-only."""
+    items = total = 0
+    for d in range(max(1, int(50 * scale))):
+        directory = os.path.join(root, f'ro{d}')
+        os.mkdir(directory)
+        count, nbytes = build_files(directory, 40, rng, 512)
+        items += count + 1
+        total += nbytes
+    for current, dirs, files in os.walk(root, topdown=False):
+        for name in files:
+            os.chmod(os.path.join(current, name), 0o444)
+        for name in dirs:
+            os.chmod(os.path.join(current, name), 0o555)
+    return items, total
+
+
+def build_longpaths(root: str, scale: float, rng: random.Random) -> Tuple[int, int]:
+    """Branches of 100-character directory names, well past the 260-character MAX_PATH."""
+    items = total = 0
+    for branch in range(max(1, int(40 * scale))):
+        current = os.path.join(root, f'b{branch}')
+        os.mkdir(current)
+        items += 1
+        for _ in range(5):
+            current = os.path.join(current, LONG_NAME)
+            extended = '\\\\?\\' + os.path.abspath(current) if os.name == 'nt' else current
+            os.mkdir(extended)
+            count, nbytes = build_files(extended, 10, rng, 256)
+            items += count + 1
+            total += nbytes
+    return items, total
+
+
+SHAPES: Dict[str, Callable[[str, float, random.Random], Tuple[int, int]]] = {
+    'wide': build_wide,
+    'deep': build_deep,
+    'tiny': build_tiny,
+    'huge': build_huge,
+    'readonly': build_readonly,
+    'longpaths': build_longpaths,
+}
+
+
+def default_root() -> str:
+    """Prefer tmpfs so the benchmark measures the purge engine rather than the disk."""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+def install_call_counters() -> Callable[[], Dict[str, int]]:
+    """Wrap the counted os functions; returns a function that sums the per-thread counts."""
+    local = threading.local()
+    registry: List[Dict[str, int]] = []
+    registry_lock = threading.Lock()
+
+    def counts() -> Dict[str, int]:
+        mine = getattr(local, 'counts', None)
+        if mine is None:
+            mine = local.counts = dict.fromkeys(COUNTED_CALLS + ('process_spawn',), 0)
+            with registry_lock:
+                registry.append(mine)
+        return mine
+
+    def wrap(name: str, func: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            counts()[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    for name in COUNTED_CALLS:
+        setattr(os, name, wrap(name, getattr(os, name)))
+    original_init = subprocess.Popen.__init__
+
+    def counted_init(self, *args, **kwargs):
+        counts()['process_spawn'] += 1
+        return original_init(self, *args, **kwargs)
+    subprocess.Popen.__init__ = counted_init
+
+    def totals() -> Dict[str, int]:
+        with registry_lock:
+            snapshot = list(registry)
+        return {name: sum(c[name] for c in snapshot) for name in COUNTED_CALLS + ('process_spawn',)}
+    return totals
+
+
+def read_proc_io() -> Dict[str, int]:
+    """Kernel-side read/write syscall counters (Linux only)."""
+    try:
+        with open('/proc/self/io') as f:
+            return {key: int(value) for key, value in (line.split(': ') for line in f)}
+    except OSError:
+        return {}
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return None
+
+
+def run_case(case: dict) -> dict:
+    """Purge one prepared tree in this process and return its measurements."""
+    totals = install_call_counters()
+    import app
+    app.logger.setLevel(logging.WARNING)  # Per-item log output would dominate the timings
+
+    purger = app.HighSpeedForcePurge(max_workers=case['workers'], progress_rate=0,
+                                     **STRATEGIES[case['strategy']])
+    io_before = read_proc_io()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF) if resource is not None else None
+    start = time.perf_counter()
+    success = purger.delete(case['path'])
+    elapsed = time.perf_counter() - start
+    io_after = read_proc_io()
+
+    result = {
+        'success': bool(success) and not os.path.exists(case['path']),
+        'seconds': elapsed,
+        'items_per_second': case['items'] / elapsed if elapsed > 0 else None,
+        'bytes_per_second': case['bytes'] / elapsed if elapsed > 0 else None,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'chosen_concurrency': purger.chosen_concurrency,
+        'fallback_plans': purger.strategy_selector.plans,
+        'syscalls': totals(),
+    }
+    if io_before and io_after:
+        result['syscalls']['kernel_read'] = io_after['syscr'] - io_before['syscr']
+        result['syscalls']['kernel_write'] = io_after['syscw'] - io_before['syscw']
+    if usage_before is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        result['context_switches'] = {'voluntary': usage.ru_nvcsw - usage_before.ru_nvcsw,
+                                      'involuntary': usage.ru_nivcsw - usage_before.ru_nivcsw}
+    return result
+
+
+def benchmark(shape: str, strategy: str, workers: int, scale: float, seed: int, root: str) -> dict:
+    """Build one tree, purge it in a child process, and clean up whatever is left."""
+    case_dir = tempfile.mkdtemp(prefix=f'forcepurge_bench_{shape}_', dir=root)
+    tree = os.path.join(case_dir, 'tree')
+    os.mkdir(tree)
+    try:
+        build_start = time.perf_counter()
+        items, nbytes = SHAPES[shape](tree, scale, random.Random(seed))
+        case = {'shape': shape, 'strategy': strategy, 'workers': workers, 'scale': scale, 'seed': seed,
+                'path': tree, 'items': items + 1, 'bytes': nbytes,
+                'build_seconds': time.perf_counter() - build_start}
+        # The child's cwd is the case directory so forcepurge.log does not land in the tree
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(case)],
+                               cwd=case_dir, capture_output=True, text=True)
+        lines = child.stdout.strip().splitlines()
+        if child.returncode != 0 or not lines:
+            case['error'] = child.stderr.strip().splitlines()[-1:] or [f'exit code {child.returncode}']
+            return case
+        case.update(json.loads(lines[-1]))
+        return case
+    finally:
+        for current, dirs, _ in os.walk(case_dir):
+            for name in dirs:
+                try:
+                    os.chmod(os.path.join(current, name), 0o755)
+                except OSError:
+                    pass
+        shutil.rmtree(case_dir, ignore_errors=True)
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark ForcePurge deletion throughput on synthetic trees',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Examples:')[1]
+    )
+    parser.add_argument('--shapes', default=','.join(SHAPES),
+                        help=f'Comma-separated tree shapes (default: all of {", ".join(SHAPES)})')
+    parser.add_argument('--strategies', default='eager,streaming',
+                        help=f'Comma-separated strategies from {", ".join(STRATEGIES)} (default: eager,streaming)')
+    parser.add_argument('--workers', default='4,16,64', help='Comma-separated max worker counts (default: 4,16,64)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for tree sizes (default: 1.0)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per case (default: 1)')
+    parser.add_argument('--seed', type=int, default=1234, help='Seed for reproducible file sizes (default: 1234)')
+    parser.add_argument('--root', default=None, help='Where to build trees (default: /dev/shm if writable, else temp dir)')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    shapes, strategies = parse_list(args.shapes), parse_list(args.strategies)
+    for kind, names, known in (('shape', shapes, SHAPES), ('strategy', strategies, STRATEGIES)):
+        for name in names:
+            if name not in known:
+                parser.error(f'unknown {kind}: {name} (choose from {", ".join(known)})')
+    root = args.root or default_root()
+
+    results = []
+    for shape in shapes:
+        for strategy in strategies:
+            for workers in (int(w) for w in parse_list(args.workers)):
+                for run in range(args.repeat):
+                    result = benchmark(shape, strategy, workers, args.scale, args.seed, root)
+                    result['run'] = run
+                    results.append(result)
+                    rate = result.get('items_per_second')
+                    status = result.get('error') or f"{rate:,.0f} items/s, {result['bytes_per_second'] / 1048576:,.1f} MB/s"
+                    print(f"{shape:>9} {strategy:>9} workers={workers:<4} {status}", file=sys.stderr)
+
+    report = {
+        'host': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count(),
+                 'root': root},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,824 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ForcePurge deletion engine - streaming traversal and scheduling
+These run on any platform; Windows-only fallbacks are not exercised here
+"""
+import io
+import os
+import logging
+import stat
+import errno
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the current directory to Python path to import app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# app opens forcepurge.log in the working directory on import: do that in a scratch directory
+# and drop the file handler, so running the tests never writes into the source tree
+_cwd, _log_dir = os.getcwd(), tempfile.mkdtemp(prefix='forcepurge_log_')
+os.chdir(_log_dir)
+try:
+    from app import (
+        HighSpeedForcePurge, DirectoryDependencyTracker, AdaptiveConcurrencyController, ResizableWorkerPool,
+        PurgeProgress, LockIndex, StrategySelector, PermissionResetBatch
+    )
+    import benchmark_forcepurge
+finally:
+    os.chdir(_cwd)
+for _handler in [h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)]:
+    logging.getLogger().removeHandler(_handler)
+    _handler.close()
+shutil.rmtree(_log_dir, ignore_errors=True)
+
+
+def build_tree(root, depth, dirs_per_level, files_per_dir, file_size=16):
+    """Create a synthetic tree and return (entry_count, total_bytes) below root."""
+    entries = 0
+    total_bytes = 0
+    for i in range(files_per_dir):
+        with open(os.path.join(root, f'file_{i}.bin'), 'wb') as f:
+            f.write(b'x' * file_size)
+        entries += 1
+        total_bytes += file_size
+    if depth > 0:
+        for d in range(dirs_per_level):
+            sub = os.path.join(root, f'dir_{d}')
+            os.mkdir(sub)
+            sub_entries, sub_bytes = build_tree(sub, depth - 1, dirs_per_level, files_per_dir, file_size)
+            entries += 1 + sub_entries
+            total_bytes += sub_bytes
+    return entries, total_bytes
+
+
+class TestStreamingScanner(unittest.TestCase):
+    """Test cases for the single-pass streaming scanner."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_stream_test_')
+        self.entries, self.total_bytes = build_tree(self.test_dir, depth=3, dirs_per_level=3, files_per_dir=4)
+        self.purger = HighSpeedForcePurge(streaming=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_scan_yields_every_entry_once(self):
+        """Every file and directory (plus the root) is yielded exactly once."""
+        scanned = list(self.purger.scan_tree_streaming(self.test_dir))
+        paths = [entry[0] for entry in scanned]
+        self.assertEqual(len(paths), len(set(paths)))
+        self.assertEqual(len(paths), self.entries + 1)
+        self.assertEqual(sum(entry[1] for entry in scanned), self.total_bytes)
+
+    def test_directories_follow_their_contents(self):
+        """Directories are yielded post-order, after everything beneath them."""
+        position = {}
+        for index, (path, _size, _is_dir) in enumerate(self.purger.scan_tree_streaming(self.test_dir)):
+            position[path] = index
+        for path, index in position.items():
+            if path != self.test_dir:
+                self.assertLess(index, position[os.path.dirname(path)])
+
+    @unittest.skipIf(not hasattr(os, 'symlink') or sys.platform == 'win32', "POSIX symlink test")
+    def test_symlink_target_is_not_followed(self):
+        """A symlinked directory is reported as a link, and its target is left alone."""
+        outside = tempfile.mkdtemp(prefix='forcepurge_stream_target_')
+        try:
+            with open(os.path.join(outside, 'keep.txt'), 'w') as f:
+                f.write('keep')
+            os.symlink(outside, os.path.join(self.test_dir, 'link'))
+            self.assertTrue(self.purger.traverse_and_delete(self.test_dir, max_workers=4))
+            self.assertFalse(os.path.exists(self.test_dir))
+            self.assertTrue(os.path.exists(os.path.join(outside, 'keep.txt')))
+        finally:
+            shutil.rmtree(outside, ignore_errors=True)
+
+    def test_streaming_delete_removes_tree(self):
+        """Streaming traversal deletes the whole tree and counts every byte once."""
+        result = self.purger.traverse_and_delete(self.test_dir, max_workers=4)
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(self.purger.bytes_deleted, self.total_bytes)
+        self.assertEqual(self.purger.total_size, self.total_bytes)
+
+    def test_streaming_dry_run_keeps_tree(self):
+        """Dry-run streaming reports entries without removing them."""
+        purger = HighSpeedForcePurge(dry_run=True, streaming=True)
+        self.assertTrue(purger.traverse_and_delete(self.test_dir, max_workers=2))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'dir_0', 'file_0.bin')))
+
+
+class TestDirectoryDependencyTracker(unittest.TestCase):
+    """Test cases for the pending-child counters."""
+
+    def setUp(self):
+        self.root = 'purge_root'
+        self.sub = os.path.join(self.root, 'sub')
+        self.tracker = DirectoryDependencyTracker(self.root)
+
+    def test_empty_directory_is_released_on_seal(self):
+        """A directory without children is runnable as soon as it is sealed."""
+        self.tracker.add_child(self.sub)
+        self.assertFalse(self.tracker.seal(self.sub))
+
+    def test_directory_waits_for_last_child(self):
+        """The parent is handed back only when its final child resolves."""
+        first = os.path.join(self.sub, 'a.txt')
+        second = os.path.join(self.sub, 'b.txt')
+        self.tracker.add_child(first)
+        self.tracker.add_child(second)
+        self.tracker.add_child(self.sub)
+        self.assertIsNone(self.tracker.seal(self.sub))
+        self.assertIsNone(self.tracker.resolve(first, True))
+        self.assertEqual(self.tracker.resolve(second, True), (self.sub, False))
+
+    def test_children_finishing_before_seal(self):
+        """Children deleted before the scanner reaches the parent release it at seal time."""
+        child = os.path.join(self.sub, 'a.txt')
+        self.tracker.add_child(child)
+        self.assertIsNone(self.tracker.resolve(child, True))
+        self.assertFalse(self.tracker.seal(self.sub))
+        self.assertEqual(self.tracker.pending_directories(), 0)
+
+    def test_failed_child_is_reported(self):
+        """A parent whose child failed is released with the failure flag set."""
+        child = os.path.join(self.sub, 'locked.txt')
+        self.tracker.add_child(child)
+        self.tracker.seal(self.sub)
+        self.assertEqual(self.tracker.resolve(child, False), (self.sub, True))
+
+    def test_root_has_no_parent(self):
+        """Resolving the root ends the release chain."""
+        self.assertIsNone(self.tracker.resolve(self.root, True))
+
+
+@unittest.skipIf(not sys.platform.startswith('linux'), "Linux synthetic-tree test")
+class TestDependencyOrderedDeletion(unittest.TestCase):
+    """Directories are removed only after their contents, so no fallback is ever needed."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_order_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_streaming_100k_entries_without_fallbacks(self):
+        """A 100k-entry tree is purged with plain unlink/rmdir calls only."""
+        entries, total_bytes = build_tree(self.test_dir, depth=4, dirs_per_level=6, files_per_dir=64, file_size=1)
+        self.assertGreaterEqual(entries, 100000)
+
+        purger = HighSpeedForcePurge(streaming=True, stream_queue_size=1024)
+        with patch.object(purger, 'force_delete_item', wraps=purger.force_delete_item) as fallback:
+            result = purger.traverse_and_delete(self.test_dir, max_workers=16)
+
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(fallback.call_count, 0)
+        self.assertEqual(purger.items_deleted, entries + 1)
+        self.assertEqual(purger.bytes_deleted, total_bytes)
+
+    def test_eager_mode_respects_directory_order(self):
+        """The collect-first mode uses the same scheduler and needs no fallbacks either."""
+        entries, _ = build_tree(self.test_dir, depth=3, dirs_per_level=5, files_per_dir=8)
+
+        purger = HighSpeedForcePurge()
+        with patch.object(purger, 'force_delete_item', wraps=purger.force_delete_item) as fallback:
+            result = purger.traverse_and_delete(self.test_dir, max_workers=8)
+
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(fallback.call_count, 0)
+        self.assertEqual(purger.items_deleted, entries + 1)
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    """Test cases for the hill-climbing worker controller."""
+
+    def feed(self, controller, now, rate, latency):
+        """Record one window's worth of completions at the given rate, ending at now."""
+        count = int(rate * controller.window)
+        for i in range(count):
+            controller.record(latency, now=now - controller.window + (i + 1) * controller.window / count)
+
+    def test_grows_while_throughput_improves(self):
+        controller = AdaptiveConcurrencyController(8, max_workers=64, step=4)
+        self.feed(controller, 10.0, 100, 0.01)
+        self.assertEqual(controller.adjust(now=10.0), 12)
+        self.feed(controller, 11.0, 150, 0.01)
+        self.assertEqual(controller.adjust(now=11.0), 16)
+
+    def test_backs_off_when_throughput_drops(self):
+        controller = AdaptiveConcurrencyController(8, max_workers=64, step=4)
+        self.feed(controller, 10.0, 100, 0.01)
+        controller.adjust(now=10.0)
+        self.feed(controller, 11.0, 60, 0.01)
+        self.assertEqual(controller.adjust(now=11.0), 9)  # int(12 * 0.75)
+
+    def test_holds_on_plateau(self):
+        controller = AdaptiveConcurrencyController(8, max_workers=64, step=4)
+        self.feed(controller, 10.0, 100, 0.01)
+        controller.adjust(now=10.0)
+        self.feed(controller, 11.0, 101, 0.01)
+        self.assertEqual(controller.adjust(now=11.0), 12)
+
+    def test_latency_spike_shrinks_pool(self):
+        controller = AdaptiveConcurrencyController(32, max_workers=64)
+        self.feed(controller, 10.0, 100, 0.002)
+        controller.adjust(now=10.0)
+        self.feed(controller, 11.0, 100, 0.05)
+        self.assertLess(controller.adjust(now=11.0), 32)
+
+    def test_p95_over_sliding_window(self):
+        controller = AdaptiveConcurrencyController(4, window=1.0)
+        controller.record(9.0, now=1.0)  # Outside the window
+        for i in range(100):
+            controller.record(0.001 if i < 95 else 0.5, now=5.0)
+        throughput, p95, samples = controller.snapshot(now=5.5)
+        self.assertEqual(samples, 100)
+        self.assertEqual(throughput, 100.0)
+        self.assertEqual(p95, 0.5)
+
+    def test_fixed_controller_never_moves(self):
+        controller = AdaptiveConcurrencyController(16, min_workers=16, max_workers=16)
+        self.feed(controller, 10.0, 100, 0.01)
+        self.assertEqual(controller.adjust(now=10.0), 16)
+        self.assertIn('fixed', controller.summary())
+
+
+class TestResizableWorkerPool(unittest.TestCase):
+    """Test cases for the resizable deletion pool."""
+
+    def test_futures_and_resize(self):
+        controller = AdaptiveConcurrencyController(2, min_workers=2, max_workers=2)
+        with ResizableWorkerPool(controller) as pool:
+            futures = [pool.submit(pow, i, 2) for i in range(50)]
+            pool.resize(6)
+            self.assertEqual(pool.size, 6)
+            pool.resize(1)
+            self.assertEqual([f.result(timeout=5) for f in futures], [i * i for i in range(50)])
+        self.assertEqual(len(controller._samples), 50)
+
+    def test_shutdown_drains_queue(self):
+        controller = AdaptiveConcurrencyController(3, min_workers=3, max_workers=3)
+        done = []
+        lock = threading.Lock()
+
+        def task(i):
+            time.sleep(0.001)
+            with lock:
+                done.append(i)
+
+        with ResizableWorkerPool(controller, queue_size=4) as pool:
+            for i in range(40):
+                pool.execute(task, i)
+        self.assertEqual(sorted(done), list(range(40)))
+
+    def test_traversal_reports_chosen_concurrency(self):
+        test_dir = tempfile.mkdtemp(prefix='forcepurge_pool_test_')
+        try:
+            build_tree(test_dir, depth=2, dirs_per_level=3, files_per_dir=5)
+            purger = HighSpeedForcePurge(max_workers=4, streaming=True)
+            self.assertTrue(purger.traverse_and_delete(test_dir, max_workers=8))
+            self.assertGreaterEqual(purger.chosen_concurrency, 1)
+            self.assertLessEqual(purger.chosen_concurrency, 8)
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+    def test_max_workers_is_the_ceiling(self):
+        for adaptive, size in ((True, 3), (False, 6)):
+            purger = HighSpeedForcePurge(max_workers=6, adaptive_workers=adaptive)
+            with purger._create_worker_pool() as pool:
+                self.assertEqual((pool.size, pool.controller.max_workers), (size, 6))
+            with purger._create_worker_pool(64) as pool:
+                self.assertEqual(pool.controller.max_workers, 6)
+            with purger._create_worker_pool(2) as pool:
+                self.assertEqual(pool.controller.max_workers, 2)
+
+    def test_delete_never_grows_past_max_workers(self):
+        test_dir = tempfile.mkdtemp(prefix='forcepurge_pool_test_')
+        self.addCleanup(shutil.rmtree, test_dir, True)
+        build_tree(test_dir, depth=2, dirs_per_level=3, files_per_dir=5)
+        purger = HighSpeedForcePurge(max_workers=5, progress_rate=0)
+        pools = []
+        create = purger._create_worker_pool
+        with patch.object(purger, '_create_worker_pool', side_effect=lambda *args, **kwargs: pools.append(
+                create(*args, **kwargs)) or pools[-1]):
+            self.assertTrue(purger.delete(test_dir))
+        self.assertEqual([pool.controller.max_workers for pool in pools], [5])
+        self.assertLessEqual(purger.chosen_concurrency, 5)
+
+
+class FakeTTY(io.StringIO):
+    """In-memory stream that claims to be a terminal."""
+
+    def isatty(self):
+        return True
+
+
+class TestPurgeProgress(unittest.TestCase):
+    """Test cases for the rate-limited progress and metrics reporter."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_progress_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_per_thread_counters_sum(self):
+        progress = PurgeProgress(total_items=4000, renders_per_second=0, stream=io.StringIO())
+
+        def work():
+            for _ in range(1000):
+                progress.record(1, 10)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        progress.record(0, 0, 1)
+        self.assertEqual(progress.totals(), (4000, 40000, 1))
+
+    def test_tty_render_rate_is_bounded(self):
+        stream = FakeTTY()
+        with PurgeProgress(total_items=10, renders_per_second=10, stream=stream) as progress:
+            for _ in range(20000):
+                progress.record(1, 1)
+            time.sleep(0.35)
+        renders = stream.getvalue().count('\r')
+        self.assertGreaterEqual(renders, 2)
+        self.assertLessEqual(renders, 6)  # ~3 timed renders plus the final one
+        self.assertTrue(stream.getvalue().endswith('\n'))
+
+    def test_eta_needs_complete_scan(self):
+        progress = PurgeProgress(renders_per_second=0, stream=io.StringIO())
+        progress.discover(10, 100)
+        progress.record(5, 50)
+        time.sleep(0.01)
+        self.assertIsNone(progress.snapshot()['eta_s'])
+        progress.scan_complete = True
+        self.assertIsNotNone(progress.snapshot()['eta_s'])
+
+    def test_stats_file_is_json_lines(self):
+        stats_path = os.path.join(self.test_dir, 'stats.jsonl')
+        tree = os.path.join(self.test_dir, 'tree')
+        os.mkdir(tree)
+        entries, total_bytes = build_tree(tree, depth=2, dirs_per_level=3, files_per_dir=5)
+
+        purger = HighSpeedForcePurge(streaming=True, progress_rate=50, stats_path=stats_path)
+        self.assertTrue(purger.traverse_and_delete(tree, max_workers=4))
+
+        with open(stats_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[-1]['event'], 'summary')
+        self.assertEqual(records[-1]['items'], entries + 1)
+        self.assertEqual(records[-1]['bytes'], total_bytes)
+        self.assertIn('workers', records[-1])
+        self.assertTrue(all(r['event'] == 'progress' for r in records[:-1]))
+
+
+@unittest.skipIf(not os.path.isdir('/proc/self/fd'), "Needs /proc for handle enumeration")
+class TestLockIndex(unittest.TestCase):
+    """Test cases for the batched lock-holder index."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_lock_test_')
+        self.locked = os.path.join(self.test_dir, 'held.txt')
+        with open(self.locked, 'w') as f:
+            f.write('held')
+        self.holder = self.start_holder(self.locked)
+
+    def tearDown(self):
+        self.holder.kill()
+        self.holder.wait()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def start_holder(self, path):
+        """Start a child process that keeps path open until killed."""
+        proc = subprocess.Popen(
+            [sys.executable, '-c', 'import sys, time; f = open(sys.argv[1]); print("ready", flush=True); time.sleep(60)', path],
+            stdout=subprocess.PIPE, text=True)
+        proc.stdout.readline()
+        return proc
+
+    def test_lookup_finds_holder(self):
+        index = LockIndex()
+        self.assertEqual(index.lookup(self.locked), [self.holder.pid])
+        self.assertEqual(index.lookup(os.path.join(self.test_dir, 'free.txt')), [])
+
+    def test_lookups_reuse_one_snapshot(self):
+        index = LockIndex()
+        with patch.object(index, '_open_files', wraps=index._open_files) as scan:
+            for _ in range(50):
+                index.lookup(self.locked)
+            scans = scan.call_count
+            index.lookup(self.locked)
+            self.assertEqual(scan.call_count, scans)
+        self.assertEqual(index.full_refreshes, 1)
+        self.assertEqual(index.lookups, 51)
+
+    def test_repeated_failures_refresh_incrementally(self):
+        index = LockIndex(refresh_after_failures=3)
+        late_path = os.path.join(self.test_dir, 'late.txt')
+        with open(late_path, 'w') as f:
+            f.write('late')
+        index.lookup(self.locked)
+        late_holder = self.start_holder(late_path)
+        try:
+            self.assertEqual(index.lookup(late_path), [])
+            for _ in range(3):
+                index.note_failure()
+            self.assertEqual(index.incremental_refreshes, 1)
+            self.assertEqual(index.lookup(late_path), [late_holder.pid])
+        finally:
+            late_holder.kill()
+            late_holder.wait()
+
+    def test_repeated_miss_rescans_indexed_processes(self):
+        index = LockIndex(refresh_after_failures=1000)
+        late_path = os.path.join(self.test_dir, 'late.txt')
+        with open(late_path, 'w') as f:
+            f.write('late')
+        holder = subprocess.Popen(
+            [sys.executable, '-c', 'import sys, time; sys.stdin.readline(); f = open(sys.argv[1]); '
+             'print("ready", flush=True); time.sleep(60)', late_path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            self.assertEqual(index.lookup(late_path), [])  # holder is indexed before it opens the file
+            holder.stdin.write('open\n')
+            holder.stdin.flush()
+            holder.stdout.readline()
+            index.note_failure(late_path)
+            self.assertEqual(index.lookup(late_path), [])
+            index.note_failure(late_path)
+            self.assertEqual(index.full_refreshes, 2)
+            self.assertEqual(index.lookup(late_path), [holder.pid])
+        finally:
+            holder.kill()
+            holder.wait()
+
+    def test_exited_process_is_dropped(self):
+        index = LockIndex(refresh_after_failures=1)
+        index.lookup(self.locked)
+        self.holder.kill()
+        self.holder.wait()
+        index.note_failure()
+        self.assertEqual(index.lookup(self.locked), [])
+
+    def test_own_process_is_never_reported(self):
+        index = LockIndex()
+        with open(self.locked):
+            self.assertNotIn(os.getpid(), index.lookup(self.locked))
+
+    def test_kill_locking_processes_uses_index(self):
+        purger = HighSpeedForcePurge()
+        self.assertTrue(purger.kill_locking_processes(self.locked))
+        self.holder.wait(timeout=10)
+        self.assertIsNotNone(self.holder.returncode)
+        self.assertEqual(purger.find_locking_processes(self.locked), [])
+
+
+class TestStrategySelector(unittest.TestCase):
+    """Test cases for the learned fallback ordering."""
+
+    def test_cold_context_uses_default_order(self):
+        selector = StrategySelector()
+        context = selector.context_for('/data/a.log', 5)
+        self.assertEqual(selector.plan(context), list(StrategySelector.DEFAULT_ORDER))
+        self.assertEqual(selector.cold, 1)
+
+    def test_context_keys_on_parent_extension_and_error(self):
+        self.assertEqual(StrategySelector.context_for('/data/dir/a.LOG', 13),
+                         (os.path.normcase('/data/dir'), os.path.normcase('.LOG'), 13, False))
+        self.assertNotEqual(StrategySelector._keys(StrategySelector.context_for('/data/dir/sub', 13, True))[2],
+                            StrategySelector._keys(StrategySelector.context_for('/data/dir/file', 13))[2])
+
+    def test_proven_methods_move_to_front_by_cost(self):
+        selector = StrategySelector(order=('a', 'b', 'c', 'd'))
+        context = selector.context_for('/data/x.bin')
+        selector.record(context, 'a', False, 0.001)
+        selector.record(context, 'c', True, 0.5, attempt=2)
+        selector.record(context, 'd', True, 0.01, attempt=3)
+        self.assertEqual(selector.plan(context), ['d', 'c', 'a', 'b'])
+        self.assertEqual(selector.misses, 2)
+
+    def test_repeated_failures_go_last(self):
+        selector = StrategySelector(order=('a', 'b', 'c'), demote_after=3, explore_every=1000)
+        context = selector.context_for('/data/x.bin')
+        for _ in range(3):
+            selector.record(context, 'a', False, 0.001)
+            selector.record(context, 'c', True, 0.001, attempt=1)
+        self.assertEqual(selector.plan(context), ['c', 'b', 'a'])
+        self.assertEqual(selector.deferred, 1)
+
+    def test_demoted_methods_are_explored_periodically(self):
+        selector = StrategySelector(order=('a', 'b', 'c'), demote_after=1, explore_every=4)
+        context = selector.context_for('/data/x.bin')
+        selector.record(context, 'a', False, 0.001)
+        plans = [selector.plan(context) for _ in range(4)]
+        self.assertEqual(plans[:3], [['b', 'c', 'a']] * 3)
+        self.assertEqual(plans[3], ['a', 'b', 'c'])
+
+    def test_sibling_learns_from_general_context(self):
+        selector = StrategySelector(order=('a', 'b'))
+        selector.record(selector.context_for('/data/one/x.bin', 5), 'b', True, 0.001, attempt=1)
+        self.assertEqual(selector.plan(selector.context_for('/data/two/y.bin', 5)), ['b', 'a'])
+        self.assertEqual(selector.plan(selector.context_for('/data/one/z.txt')), ['b', 'a'])
+
+    def test_force_delete_item_follows_learned_plan(self):
+        test_dir = tempfile.mkdtemp(prefix='forcepurge_strategy_test_')
+        self.addCleanup(shutil.rmtree, test_dir, True)
+        purger = HighSpeedForcePurge()
+        failing = ('_try_winapi_delete_fast', '_try_shutil_delete_fast', '_try_ntdll_delete_fast',
+                   'force_delete_with_rmdir', 'force_delete_with_subst', '_force_delete_aggressive')
+        patchers = [patch.object(purger, name, return_value=False) for name in failing]
+        mocks = {name: patcher.start() for name, patcher in zip(failing, patchers)}
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        with patch.object(purger, 'force_delete_with_del', side_effect=lambda p: os.unlink(p) or True):
+            for i in range(10):
+                path = os.path.join(test_dir, f'stubborn{i}.dat')
+                with open(path, 'w') as f:
+                    f.write('x')
+                self.assertTrue(purger.force_delete_item(path, 5))
+                self.assertFalse(os.path.exists(path))
+        self.assertEqual(mocks['_try_winapi_delete_fast'].call_count, 1)
+        self.assertEqual(mocks['_force_delete_aggressive'].call_count, 0)
+        self.assertEqual(mocks['force_delete_with_rmdir'].call_count, 0)
+        self.assertEqual(purger.strategy_selector.hits, 9)
+
+    def test_open_circuit_drops_subprocess_methods(self):
+        selector = StrategySelector(demote_after=2, explore_every=5)
+        context = selector.context_for('/data/locked/x.bin', 5)
+        self.assertFalse(selector.circuit_open(context))
+        for _ in range(2):
+            for name in selector.plan(context):
+                selector.record(context, name, False, 0.001)
+        self.assertTrue(selector.circuit_open(context))
+        self.assertEqual([selector.plan(context) for _ in range(2)], [['winapi', 'shutil', 'ntdll']] * 2)
+        self.assertEqual(selector.plan(context), list(StrategySelector.DEFAULT_ORDER))  # 5th plan explores
+        self.assertEqual(selector.short_circuited, 2)
+        selector.record(context, 'subst', True, 0.01, attempt=5)
+        self.assertFalse(selector.circuit_open(context))
+
+    def patch_fallbacks(self, purger, **overrides):
+        """Patch every fallback to fail (or as given) and return the mocks by name."""
+        names = ('_try_winapi_delete_fast', '_try_shutil_delete_fast', '_try_ntdll_delete_fast',
+                 'force_delete_with_del', 'force_delete_with_rmdir', 'force_delete_with_subst',
+                 '_force_delete_aggressive')
+        mocks = {}
+        for name in names:
+            patcher = patch.object(purger, name, **overrides.get(name, {'return_value': False}))
+            mocks[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+        return mocks
+
+    def test_locked_directory_spawns_are_bounded(self):
+        test_dir = tempfile.mkdtemp(prefix='forcepurge_strategy_test_')
+        self.addCleanup(shutil.rmtree, test_dir, True)
+        purger = HighSpeedForcePurge(force_reboot=True)
+        selector = purger.strategy_selector
+        mocks = self.patch_fallbacks(purger)
+        spawning = ('force_delete_with_del', 'force_delete_with_rmdir', 'force_delete_with_subst',
+                    '_force_delete_aggressive')
+        with patch.object(purger, 'move_to_reboot_delete', return_value=True) as reboot:
+            for i in range(200):
+                path = os.path.join(test_dir, f'locked{i}.dat')
+                open(path, 'w').close()
+                self.assertTrue(purger.force_delete_item(path, 5))
+        self.assertEqual(reboot.call_count, 200)
+        # del, subst and aggressive apply to a file: all three run until the circuit opens, then only when exploring
+        spawns = sum(mocks[name].call_count for name in spawning)
+        self.assertLessEqual(spawns, 3 * (selector.demote_after + 200 // selector.explore_every + 1))
+        self.assertEqual(mocks['_try_winapi_delete_fast'].call_count, 200)
+        self.assertGreater(selector.short_circuited, 150)
+
+    def test_sibling_is_deleted_by_a_demoted_method(self):
+        test_dir = tempfile.mkdtemp(prefix='forcepurge_strategy_test_')
+        self.addCleanup(shutil.rmtree, test_dir, True)
+        purger = HighSpeedForcePurge()
+        purger.strategy_selector = StrategySelector(explore_every=5)
+        self.patch_fallbacks(purger)
+        # Files in this folder that nothing could delete open the folder's circuit
+        for i in range(purger.strategy_selector.demote_after):
+            path = os.path.join(test_dir, f'stuck{i}.dat')
+            open(path, 'w').close()
+            self.assertFalse(purger.force_delete_item(path, 5))
+        # A sibling that only 'del' can remove is skipped while the circuit is open...
+        with patch.object(purger, 'force_delete_with_del', side_effect=lambda p: os.unlink(p) or True) as delete:
+            skipped = os.path.join(test_dir, 'skipped.dat')
+            open(skipped, 'w').close()
+            self.assertFalse(purger.force_delete_item(skipped, 5))
+            delete.assert_not_called()
+            # ...and the next, exploring plan tries 'del' again, which closes the circuit
+            sibling = os.path.join(test_dir, 'sibling.dat')
+            open(sibling, 'w').close()
+            self.assertTrue(purger.force_delete_item(sibling, 5))
+        delete.assert_called_once()
+        self.assertFalse(os.path.exists(sibling))
+        self.assertFalse(purger.strategy_selector.circuit_open(StrategySelector.context_for(sibling, 5)))
+
+
+class TestPermissionResetBatch(unittest.TestCase):
+    """Refused entries are reset and deleted in one in-process pass, with no subprocesses."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_perm_test_')
+        self.flagged = []
+
+    def tearDown(self):
+        for path in self.flagged:
+            subprocess.run(['chattr', '-i', '-a', path], stderr=subprocess.DEVNULL, check=False)
+        if os.path.isdir(self.test_dir):
+            os.chmod(self.test_dir, 0o755)
+        for root, dirs, _ in os.walk(self.test_dir):
+            for d in dirs:
+                os.chmod(os.path.join(root, d), 0o755)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def chattr(self, flag, path):
+        """Set an inode flag on path, skipping the test where chattr is unavailable or not permitted."""
+        try:
+            result = subprocess.run(['chattr', flag, path], stderr=subprocess.DEVNULL, check=False)
+        except OSError:
+            self.skipTest('chattr is not available')
+        if result.returncode != 0:
+            self.skipTest('setting inode flags needs CAP_LINUX_IMMUTABLE on a supporting filesystem')
+        self.flagged.append(path)
+
+    def build_read_only_tree(self):
+        entries, _ = build_tree(self.test_dir, depth=2, dirs_per_level=3, files_per_dir=10)
+        for root, dirs, files in os.walk(self.test_dir, topdown=False):
+            for name in files:
+                os.chmod(os.path.join(root, name), 0o444)
+            for name in dirs:
+                os.chmod(os.path.join(root, name), 0o555)
+        return entries
+
+    def test_permission_errors_are_classified(self):
+        self.assertTrue(PermissionResetBatch.is_permission_error(OSError(errno.EPERM, 'immutable')))
+        self.assertTrue(PermissionResetBatch.is_permission_error(OSError(errno.EACCES, 'denied')))
+        self.assertFalse(PermissionResetBatch.is_permission_error(OSError(errno.EBUSY, 'busy')))
+
+    def test_drain_returns_children_before_parents(self):
+        batch = PermissionResetBatch()
+        batch.add(os.path.join('a'), 0, True)
+        batch.add(os.path.join('a', 'b', 'c.txt'), 3, False)
+        batch.add(os.path.join('a', 'b'), 0, True)
+        batch.add(os.path.join('a', 'b'), 0, True)
+        self.assertEqual([path for path, _, _ in batch.drain()],
+                         [os.path.join('a', 'b', 'c.txt'), os.path.join('a', 'b'), 'a'])
+        self.assertEqual(batch.queued, 3)
+        self.assertEqual(len(batch), 0)
+
+    def test_ownership_script_escapes_percent_signs(self):
+        script = PermissionResetBatch.ownership_script(['\\\\?\\C:\\data\\100%PATH%!x!^y.txt'])
+        self.assertIn('setlocal DisableDelayedExpansion', script)
+        self.assertIn('takeown /f "C:\\data\\100%%PATH%%!x!^y.txt" /a', script)
+        self.assertIn('icacls "C:\\data\\100%%PATH%%!x!^y.txt" /grant', script)
+
+    @unittest.skipIf(getattr(os, 'geteuid', lambda: -1)() == 0, 'root is never refused by permission bits')
+    def test_read_only_tree_is_purged(self):
+        entries = self.build_read_only_tree()
+        purger = HighSpeedForcePurge(batch_fallbacks=True)
+        with patch('app.subprocess.run') as run:
+            result = purger.traverse_and_delete(self.test_dir, max_workers=4)
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(purger.items_deleted, entries + 1)
+        self.assertGreater(purger.permission_batch.resets, 0)
+        run.assert_not_called()
+
+    @unittest.skipIf(os.name == 'nt', 'POSIX permission bits')
+    def test_reset_stays_inside_root(self):
+        root = os.path.join(self.test_dir, 'target')
+        os.makedirs(os.path.join(root, 'sub'))
+        for name in ('a.txt', os.path.join('sub', 'b.txt')):
+            with open(os.path.join(root, name), 'w') as f:
+                f.write('x')
+        os.chmod(os.path.join(root, 'sub'), 0o500)
+        os.chmod(root, 0o500)
+        os.chmod(self.test_dir, 0o500)
+        batch = PermissionResetBatch()
+        batch.reset([(os.path.join(root, 'sub', 'b.txt'), 1, False), (os.path.join(root, 'a.txt'), 1, False),
+                     (root, 0, True)], root)
+        self.assertEqual(stat.S_IMODE(os.stat(self.test_dir).st_mode), 0o500)
+        self.assertEqual(stat.S_IMODE(os.stat(root).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(root, 'sub')).st_mode), 0o700)
+
+    def build_flagged_tree(self):
+        """Tree with immutable files, an immutable directory and an append-only file."""
+        entries, _ = build_tree(self.test_dir, depth=2, dirs_per_level=3, files_per_dir=10)
+        for i in range(5):
+            self.chattr('+i', os.path.join(self.test_dir, 'dir_0', f'file_{i}.bin'))
+        self.chattr('+i', os.path.join(self.test_dir, 'dir_1'))
+        self.chattr('+a', os.path.join(self.test_dir, 'dir_2', 'file_0.bin'))
+        return entries
+
+    def purge_flagged_tree(self, streaming):
+        entries = self.build_flagged_tree()
+        purger = HighSpeedForcePurge(streaming=streaming, batch_fallbacks=True)
+        with patch('app.subprocess.run') as run, \
+                patch.object(purger, 'force_delete_item', wraps=purger.force_delete_item) as fallback:
+            result = purger.traverse_and_delete(self.test_dir, max_workers=4)
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(purger.items_deleted, entries + 1)
+        self.assertEqual(fallback.call_count, 0)
+        run.assert_not_called()
+        # Flagged files and dir_1's 13 children, then every directory above them up to the root
+        self.assertEqual(purger.permission_batch.queued, 5 + 13 + 1 + 3 + 1)
+        self.assertGreater(purger.permission_batch.resets, 0)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inode flags are Linux-specific')
+    def test_immutable_entries_are_reset_in_one_pass(self):
+        self.purge_flagged_tree(streaming=False)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inode flags are Linux-specific')
+    def test_streaming_defers_immutable_entries(self):
+        self.purge_flagged_tree(streaming=True)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inode flags are Linux-specific')
+    def test_unbatched_mode_falls_back_per_path(self):
+        build_tree(self.test_dir, depth=1, dirs_per_level=2, files_per_dir=4)
+        for i in range(3):
+            self.chattr('+i', os.path.join(self.test_dir, 'dir_0', f'file_{i}.bin'))
+        purger = HighSpeedForcePurge()
+        with patch.object(purger, 'force_delete_item', return_value=False) as fallback:
+            result = purger.traverse_and_delete(self.test_dir, max_workers=4)
+        self.assertTrue(result)  # Every item was accounted for, three failed
+        # Each immutable file, its parent and the root go through the per-path chain
+        self.assertEqual(fallback.call_count, 5)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """The benchmark's synthetic trees are reproducible and its reports complete."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='forcepurge_bench_test_')
+
+    def tearDown(self):
+        for root, dirs, _ in os.walk(self.test_dir):
+            for d in dirs:
+                os.chmod(os.path.join(root, d), 0o755)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_shapes_report_what_they_build(self):
+        purger = HighSpeedForcePurge()
+        for shape, build in benchmark_forcepurge.SHAPES.items():
+            with self.subTest(shape=shape):
+                root = os.path.join(self.test_dir, shape)
+                os.mkdir(root)
+                items, nbytes = build(root, 0.02, benchmark_forcepurge.random.Random(7))
+                scanned = list(purger.scan_tree_streaming(root))
+                self.assertEqual(items + 1, len(scanned))
+                self.assertEqual(nbytes, sum(size for _, size, _ in scanned))
+
+    def test_shapes_are_reproducible(self):
+        sizes = []
+        for run in range(2):
+            root = os.path.join(self.test_dir, f'run{run}')
+            os.mkdir(root)
+            benchmark_forcepurge.build_wide(root, 0.01, benchmark_forcepurge.random.Random(99))
+            sizes.append(sorted((name, os.path.getsize(os.path.join(root, name))) for name in os.listdir(root)))
+        self.assertEqual(sizes[0], sizes[1])
+
+    def test_benchmark_case_reports_metrics(self):
+        result = benchmark_forcepurge.benchmark('tiny', 'streaming', 4, 0.01, 1, self.test_dir)
+        self.assertTrue(result['success'], result.get('error'))
+        for key in ('items_per_second', 'bytes_per_second', 'peak_rss_bytes', 'syscalls'):
+            self.assertIn(key, result)
+        self.assertEqual(result['syscalls']['unlink'] + result['syscalls']['rmdir'], result['items'])
+        self.assertEqual(result['syscalls']['process_spawn'], 0)
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_shapes_and_strategies_are_validated_separately(self):
+        for argv in (['--shapes', 'streaming'], ['--strategies', 'wide']):
+            with patch.object(sys, 'argv', ['benchmark_forcepurge.py'] + argv), \
+                    patch('sys.stderr', new_callable=io.StringIO) as stderr, \
+                    patch.object(benchmark_forcepurge, 'benchmark') as run:
+                with self.assertRaises(SystemExit):
+                    benchmark_forcepurge.main()
+            self.assertIn(f'unknown {"shape" if argv[0] == "--shapes" else "strategy"}: {argv[1]}', stderr.getvalue())
+            run.assert_not_called()
+
+
+def run_tests():
+    """Run all tests and return results."""
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return result.wasSuccessful()
+
+if __name__ == '__main__':
+    print("Running ForcePurge engine tests...")
+    success = run_tests()
+    sys.exit(0 if success else 1)
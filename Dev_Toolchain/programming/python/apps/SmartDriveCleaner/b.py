@@ -7,16 +7,19 @@ import string
 import winreg
 import argparse
 import random
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton, QTableWidget, QTableWidgetItem, QTableView,
                              QMessageBox, QLabel, QHeaderView, QAbstractItemView,
                              QProgressBar, QStatusBar, QMainWindow, QSplitter,
                              QCheckBox, QFrame, QFileDialog, QButtonGroup, QRadioButton,
-                             QListWidget, QListWidgetItem, QStackedWidget, QTextEdit)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QIcon, QPalette, QClipboard, QLinearGradient, QBrush, QColor
+                             QListWidget, QListWidgetItem, QStackedWidget, QTextEdit,
+                             QLineEdit, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QAbstractTableModel, QModelIndex, QEvent
+from PyQt5.QtGui import QFont, QIcon, QPalette, QClipboard, QLinearGradient, QBrush, QColor, QPainter
+from cleaner_core import BatchDeleter, SafeDeleteRules, ScanCache, ScanResults, TopFilesScan
 
 
 def get_available_drives():
@@ -35,6 +38,12 @@ def get_available_drives():
     return available_drives
 
 
+def get_scan_cache_path():
+    """Location of the per-user scan cache database."""
+    base_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base_dir, 'SmartDriveCleaner', 'scan_cache.db')
+
+
 def force_delete_on_reboot(file_path):
     """Schedule a file for deletion on next reboot using Windows API."""
     try:
@@ -53,7 +62,8 @@ def force_delete_on_reboot(file_path):
 class FileScannerThread(QThread):
     """Background thread for scanning files to keep GUI responsive."""
     
-    progress_updated = pyqtSignal(str)  # Status message
+    # Status message; the [str, list] overload also carries the largest files found so far
+    progress_updated = pyqtSignal([str], [str, list])
     scan_completed = pyqtSignal(list)  # List of (path, size_mb, is_safe_to_delete) tuples
     error_occurred = pyqtSignal(str)   # Error message
     
@@ -63,6 +73,7 @@ class FileScannerThread(QThread):
         self.scan_path = scan_path
         self.scan_type = scan_type  # 'drive' or 'folder'
         self.scan_mode = scan_mode  # 'safe_only' or 'show_all'
+        self.safe_rules = None  # Compiled at the start of each scan
         
     def request_stop(self):
         """Request the thread to stop scanning."""
@@ -81,9 +92,6 @@ class FileScannerThread(QThread):
                 'firefox', 'mozilla', 'drivers', 'driver'
             ]
             
-            files_data = []
-            scanned_count = 0
-            
             # Define safe-to-delete file patterns and folders
             safe_extensions = {
                 '.tmp', '.temp', '.log', '.bak', '.backup', '.old', '.dmp',
@@ -100,125 +108,87 @@ class FileScannerThread(QThread):
                 'windows error reporting', 'minidump', 'memory dumps',
                 'thumbnail cache', 'icon cache', 'crash dumps'
             }
+            self.safe_rules = safe_rules = SafeDeleteRules(safe_extensions, safe_folders)
+            
+            # Folders unchanged since the last scan come from the cache. Listings older than a day
+            # are refreshed, since a file rewritten in place (a growing log) leaves its folder as is.
+            try:
+                scan_cache = ScanCache(get_scan_cache_path(), safe_rules.signature + repr(exclusion_keywords),
+                                       max_age=24 * 3600)
+            except (sqlite3.Error, OSError):
+                scan_cache = None
+            
+            # Parallel scandir walk keeping only the 10000 largest files
+            scan = TopFilesScan(
+                self.scan_path,
+                lambda file_path, size_bytes: safe_rules.match(file_path, size_bytes) is not None,
+                exclusion_keywords,
+                limit=10000,
+                include_all=self.scan_mode == 'show_all',
+                should_stop=lambda: self.stop_requested,
+                cache=scan_cache)
+            
+            def report_partial(partial_files):
+                self.progress_updated[str, list].emit(
+                    f"Scanned {scan.files_seen} files in {scan.directories_scanned} folders...", partial_files)
+            
+            try:
+                top_files = scan.run(on_partial=report_partial, partial_interval=0.5, partial_rows=100)
+            finally:
+                if scan_cache is not None:
+                    scan_cache.close()
             
-            # Scan the specified path recursively
-            for root, dirs, files in os.walk(self.scan_path):
-                if self.stop_requested:
-                    self.progress_updated.emit("Scan cancelled by user.")
-                    return
-                    
-                # Skip directories that match exclusion keywords
-                dirs[:] = [d for d in dirs if not any(keyword in d.lower() for keyword in exclusion_keywords)]
-                
-                for file in files:
-                    if self.stop_requested:
-                        return
-                        
-                    try:
-                        file_path = os.path.join(root, file)
-                        
-                        # Check if path contains any exclusion keywords
-                        if any(keyword in file_path.lower() for keyword in exclusion_keywords):
-                            continue
-                            
-                        # Get file size
-                        size_bytes = os.path.getsize(file_path)
-                        size_mb = size_bytes / (1024 * 1024)  # Convert to MB
-                        
-                        # Check if file is safe to delete
-                        is_safe_to_delete = self.is_safe_to_delete(file_path, safe_extensions, safe_folders)
-                        
-                        # Include files based on scan mode
-                        if self.scan_mode == 'show_all' or (self.scan_mode == 'safe_only' and is_safe_to_delete):
-                            files_data.append((file_path, size_mb, is_safe_to_delete))
-                            scanned_count += 1
-                        
-                        # Update progress every 1000 files
-                        if scanned_count % 1000 == 0:
-                            self.progress_updated.emit(f"Scanned {scanned_count} files...")
-                            
-                    except (PermissionError, FileNotFoundError, OSError) as e:
-                        # Silently continue on permission errors or file access issues
-                        continue
-                        
             if self.stop_requested:
+                self.progress_updated.emit("Scan cancelled by user.")
                 return
                 
-            self.progress_updated.emit("Processing results...")
-            
-            # Sort by size descending and take top 10000
-            files_data.sort(key=lambda x: x[1], reverse=True)
-            top_files = files_data[:10000]
-            
+            cached_note = f" ({scan.directories_reused} of {scan.directories_scanned} folders unchanged)" if scan.directories_reused else ""
             if self.scan_mode == 'safe_only':
-                self.progress_updated.emit(f"Scan complete! Found {len(top_files)} safe-to-delete files.")
+                self.progress_updated.emit(f"Scan complete! Found {len(top_files)} safe-to-delete files.{cached_note}")
             else:
                 safe_count = sum(1 for _, _, is_safe in top_files if is_safe)
-                self.progress_updated.emit(f"Scan complete! Found {len(top_files)} files ({safe_count} safe, {len(top_files) - safe_count} risky).")
+                self.progress_updated.emit(f"Scan complete! Found {len(top_files)} files ({safe_count} safe, {len(top_files) - safe_count} risky).{cached_note}")
             self.scan_completed.emit(top_files)
             
         except Exception as e:
             self.error_occurred.emit(f"Scan error: {str(e)}")
     
-    def is_safe_to_delete(self, file_path, safe_extensions, safe_folders):
+    def is_safe_to_delete(self, file_path, safe_extensions, safe_folders, size_bytes=None):
         """Determine if a file is generally safe to delete for freeing space."""
-        file_path_lower = file_path.lower()
-        file_name = os.path.basename(file_path_lower)
-        dir_name = os.path.dirname(file_path_lower)
-        
-        # Check file extension
-        file_ext = os.path.splitext(file_name)[1]
-        if file_ext in safe_extensions:
-            return True
-        
-        # Check if file is in a safe folder
-        for safe_folder in safe_folders:
-            if safe_folder in dir_name:
-                return True
-        
-        # Check specific safe file patterns
-        safe_patterns = [
-            'thumbs.db', 'desktop.ini', '.ds_store', 'hiberfil.sys',
-            'pagefile.sys', 'swapfile.sys', 'memory.dmp', 'error.log',
-            'crash', 'dump', 'minidump', 'temp_', '_temp', 'temporary',
-            'cache_', '_cache', 'backup_', '_backup', 'old_', '_old'
-        ]
-        
-        for pattern in safe_patterns:
-            if pattern in file_name:
-                return True
-        
-        # Check Windows and application temporary directories
-        temp_paths = [
-            '\\\\windows\\\\temp\\\\', '\\\\temp\\\\', '\\\\tmp\\\\',
-            '\\\\appdata\\\\local\\\\temp\\\\', '\\\\appdata\\\\roaming\\\\temp\\\\',
-            '\\\\windows\\\\prefetch\\\\', '\\\\windows\\\\logs\\\\',
-            '\\\\windows\\\\winsxs\\\\backup\\\\', '\\\\windows\\\\softwaredistribution\\\\',
-            '\\\\programdata\\\\microsoft\\\\windows\\\\wer\\\\',
-            '\\\\users\\\\.*\\\\appdata\\\\local\\\\crashdumps\\\\',
-            '\\\\windows\\\\system32\\\\logfiles\\\\',
-            '\\\\windows\\\\memory.dmp', '\\\\windows\\\\minidump\\\\',
-            '\\\\windows\\\\temp\\\\', '\\\\windows\\\\logs\\\\cbs\\\\',
-            '\\\\windows\\\\logs\\\\dism\\\\', '\\\\windows\\\\panther\\\\',
-            '\\\\windows\\\\inf\\\\setupapi\\\\'
-        ]
-        
-        for temp_path in temp_paths:
-            if temp_path in file_path_lower:
-                return True
+        if self.safe_rules is None:
+            self.safe_rules = SafeDeleteRules(safe_extensions, safe_folders)
+        return self.safe_rules.match(file_path, size_bytes) is not None
+
+
+class FileDeletionThread(QThread):
+    """Background thread deleting a batch of files with a pool of workers."""
+    
+    progress_updated = pyqtSignal(int, int, float)  # Files done, files in batch, MB freed so far
+    deletion_completed = pyqtSignal(object)  # DeleteSummary with an outcome per path
+    error_occurred = pyqtSignal(str)   # Error message
+    
+    def __init__(self, files):
+        super().__init__()
+        self.stop_requested = False
+        self.files = files  # List of (path, size_mb) tuples
         
-        # Check for files larger than 100MB in temp/cache locations
-        if any(folder in dir_name for folder in ['temp', 'cache', 'log']):
-            if os.path.exists(file_path):
-                try:
-                    size_bytes = os.path.getsize(file_path)
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb >= 100:  # Large temp/cache files are usually safe to delete
-                        return True
-                except:
-                    pass
+    def request_stop(self):
+        """Request the thread to stop after the files already being deleted."""
+        self.stop_requested = True
         
-        return False
+    def run(self):
+        """Delete the batch, reporting aggregated progress a few times per second."""
+        try:
+            deleter = BatchDeleter(schedule_on_reboot=force_delete_on_reboot,
+                                   should_stop=lambda: self.stop_requested,
+                                   record_outcomes=True)
+            summary = deleter.run(
+                self.files,
+                on_progress=lambda progress: self.progress_updated.emit(
+                    progress.done, len(self.files), progress.freed_mb))
+            self.deletion_completed.emit(summary)
+        except Exception as e:
+            self.error_occurred.emit(f"Deletion error: {str(e)}")
 
 
 class RegistryCleanerThread(QThread):
@@ -1166,15 +1136,130 @@ class SoftwareUpdateThread(QThread):
         self.progress_updated.emit("Software updates completed!")
 
 
+class FileResultsModel(QAbstractTableModel):
+    """Table model over ScanResults; sorting and filtering happen in the results view."""
+    
+    HEADERS = ["File Path", "Size (MB)", "Action"]
+    SORT_KEYS = ('path', 'size', 'safe')  # Per column
+    SAFE_TOOLTIP = "✅ Safe to delete - temporary/cache file for freeing space"
+    RISKY_TOOLTIP = "⚠️ CAUTION: Verify this file before deleting - may be important system/program file"
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = ScanResults()
+        self.safe_brush = QBrush(QColor(Qt.green))
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path, size_mb, is_safe_to_delete = self.results.row(index.row())
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return file_path
+            if column == 1:
+                return f"{size_mb:.2f}"
+            return None
+        if role == Qt.UserRole:
+            return is_safe_to_delete
+        if role == Qt.TextAlignmentRole and column == 1:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.BackgroundRole and is_safe_to_delete and column < 2:
+            return self.safe_brush  # Green background for safe files
+        if role == Qt.ToolTipRole and column == 0:
+            return self.SAFE_TOOLTIP if is_safe_to_delete else self.RISKY_TOOLTIP
+        return None
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        # Keep the selection on the same files: sorting only reorders the view
+        old_indexes = self.persistentIndexList()
+        old_rows = [self.results.view[index.row()] for index in old_indexes]
+        self.results.set_sort(self.SORT_KEYS[column], order == Qt.DescendingOrder)
+        positions = {row: position for position, row in enumerate(self.results.view)}
+        self.changePersistentIndexList(
+            old_indexes, [self.index(positions[row], index.column()) for row, index in zip(old_rows, old_indexes)])
+        self.layoutChanged.emit()
+        
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.results.set_filter(text)
+        self.endResetModel()
+        
+    def set_files(self, files_data):
+        """Replace all rows with (path, size_mb, is_safe) tuples in one model reset."""
+        self.beginResetModel()
+        self.results.set_files(files_data)
+        self.endResetModel()
+        
+    def remove_paths(self, paths):
+        """Drop the rows for paths in one model reset; returns how many were dropped."""
+        self.beginResetModel()
+        removed = self.results.remove_paths(paths)
+        self.endResetModel()
+        return removed
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """Paints the Action column as a delete button and reports clicks, without per-row widgets."""
+    
+    delete_requested = pyqtSignal(int)  # View row
+    
+    SAFE_COLORS = (QColor('#4caf50'), QColor('#66bb6a'))  # Normal, hover
+    RISKY_COLORS = (QColor('#d32f2f'), QColor('#f44336'))
+    
+    def button_rect(self, option):
+        return option.rect.adjusted(4, 3, -4, -3)
+    
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        is_safe_to_delete = index.data(Qt.UserRole)
+        normal, hover = self.SAFE_COLORS if is_safe_to_delete else self.RISKY_COLORS
+        rect = self.button_rect(option)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(hover if option.state & QStyle.State_MouseOver else normal)
+        painter.drawRoundedRect(rect, 3, 3)
+        font = QFont(option.font)
+        font.setPointSize(9)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, "🗑️ Safe Delete" if is_safe_to_delete else "⚠️ Delete")
+        painter.restore()
+        
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self.button_rect(option).contains(event.pos())):
+            self.delete_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
 class MainAppWindow(QMainWindow):
     """Main application window for the C: Drive Cleaner."""
     
     def __init__(self):
         super().__init__()
         self.scanner_thread = None
+        self.deletion_thread = None
+        self.deletion_mode = None  # 'bulk' or 'purge' while a deletion batch runs
         self.registry_thread = None
         self.software_update_thread = None
-        self.files_data = []
+        self.files_model = FileResultsModel()  # Scan results shown in the file table
         self.registry_data = []
         self.software_data = []
         self.current_drive = 'C'
@@ -1507,6 +1592,7 @@ class MainAppWindow(QMainWindow):
         
         # Results table
         self.create_results_table()
+        main_layout.addWidget(self.results_filter_edit)
         main_layout.addWidget(self.results_table)
         
         # Add file cleaner page to stack
@@ -2417,16 +2503,30 @@ class MainAppWindow(QMainWindow):
                 button.clicked.connect(lambda checked, r=row: self.update_single_software(r))
         
     def create_results_table(self):
-        """Create and configure the results table."""
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(3)
-        self.results_table.YOUR_CLIENT_SECRET_HERE(["File Path", "Size (MB)", "Action"])
+        """Create and configure the results table and its path filter."""
+        self.results_filter_edit = QLineEdit()
+        self.results_filter_edit.setPlaceholderText("🔎 Filter results by path...")
+        self.results_filter_edit.setClearButtonEnabled(True)
+        self.results_filter_edit.textChanged.connect(self.files_model.set_filter)
+        self.results_filter_edit.textChanged.connect(lambda text: self.update_results_status())
+        
+        self.results_table = QTableView()
+        self.results_table.setModel(self.files_model)
+        
+        # Action column is painted by a delegate instead of a button widget per row
+        self.delete_delegate = DeleteButtonDelegate(self.results_table)
+        self.delete_delegate.delete_requested.connect(self.delete_file)
+        self.results_table.setItemDelegateForColumn(2, self.delete_delegate)
+        self.results_table.setMouseTracking(True)  # Hover colour on the painted buttons
         
         # Configure table appearance
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.results_table.setSelectionMode(QAbstractItemView.ExtendedSelection)  # Enable multi-selection
-        self.results_table.setSortingEnabled(True)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.setWordWrap(False)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)  # Uniform rows scroll fast
+        self.results_table.verticalHeader().setDefaultSectionSize(34)
         
         # Set column widths
         header = self.results_table.horizontalHeader()
@@ -2434,19 +2534,23 @@ class MainAppWindow(QMainWindow):
         header.setSectionResizeMode(1, QHeaderView.Fixed)    # Size column fixed
         header.setSectionResizeMode(2, QHeaderView.Fixed)    # Action column fixed
         self.results_table.setColumnWidth(1, 120)
-        self.results_table.setColumnWidth(2, 100)
+        self.results_table.setColumnWidth(2, 120)
+        
+        # Largest files first; clicking a header sorts inside the model
+        header.setSortIndicator(1, Qt.DescendingOrder)
+        self.results_table.setSortingEnabled(True)
         
         # Style the table
         self.results_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #e0e0e0;
                 background-color: white;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #e0e0e0;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
             }
             QHeaderView::section {
@@ -2636,6 +2740,9 @@ class MainAppWindow(QMainWindow):
         """Start the file scanning process."""
         if self.scanner_thread and self.scanner_thread.isRunning():
             return
+        if self.deletion_thread and self.deletion_thread.isRunning():
+            self.update_status("Wait for the current deletion to finish before scanning")
+            return
         
         # Validate scan selection
         if self.scan_type == 'folder' and not self.selected_folder:
@@ -2650,8 +2757,7 @@ class MainAppWindow(QMainWindow):
             scan_path = self.selected_folder
             
         # Clear previous results
-        self.results_table.setRowCount(0)
-        self.files_data.clear()
+        self.files_model.set_files([])
         
         # Update UI for scanning state
         self.scan_button.setEnabled(False)
@@ -2661,6 +2767,7 @@ class MainAppWindow(QMainWindow):
         # Create and start scanner thread
         self.scanner_thread = FileScannerThread(scan_path, self.scan_type, self.scan_mode)
         self.scanner_thread.progress_updated.connect(self.update_status)
+        self.scanner_thread.progress_updated[str, list].connect(self.on_scan_partial)
         self.scanner_thread.scan_completed.connect(self.on_scan_completed)
         self.scanner_thread.error_occurred.connect(self.on_scan_error)
         self.scanner_thread.finished.connect(self.on_scan_finished)
@@ -2676,10 +2783,14 @@ class MainAppWindow(QMainWindow):
         """Update the status bar with a message."""
         self.status_bar.showMessage(message)
         
+    def on_scan_partial(self, message, files_data):
+        """Show the largest files found so far while the scan is running."""
+        self.populate_results_table(files_data)
+        self.update_status(message)
+        
     def on_scan_completed(self, files_data):
         """Handle completion of file scan."""
-        self.files_data = files_data
-        self.populate_results_table()
+        self.populate_results_table(files_data)
         
     def on_scan_error(self, error_message):
         """Handle scan errors."""
@@ -2691,96 +2802,37 @@ class MainAppWindow(QMainWindow):
         self.stop_button.setEnabled(False)
         self.progress_bar.setVisible(False)
         
-    def populate_results_table(self):
-        """Populate the results table with scanned files."""
-        self.results_table.setRowCount(len(self.files_data))
-        safe_count = 0
+    def populate_results_table(self, files_data):
+        """Show (path, size_mb, is_safe_to_delete) rows in the results table."""
+        self.files_model.set_files(files_data)
+        self.update_results_status()
         
-        for row, (file_path, size_mb, is_safe_to_delete) in enumerate(self.files_data):            
-            # File path
-            path_item = QTableWidgetItem(file_path)
-            path_item.setFlags(path_item.flags() & ~Qt.ItemIsEditable)
-            
-            # File size
-            size_item = QTableWidgetItem(f"{size_mb:.2f}")
-            size_item.setFlags(size_item.flags() & ~Qt.ItemIsEditable)
-            size_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Color coding and button styling based on safety
-            if is_safe_to_delete:
-                safe_count += 1
-                # Green background for safe files
-                path_item.setBackground(QColor(Qt.green))
-                path_item.setToolTip("✅ Safe to delete - temporary/cache file for freeing space")
-                size_item.setBackground(QColor(Qt.green))
-                
-                # Safe delete button styling
-                delete_button = QPushButton("🗑️ Safe Delete")
-                delete_button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #4caf50;
-                        color: white;
-                        border: none;
-                        border-radius: 3px;
-                        padding: 5px 10px;
-                        font-size: 12px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #66bb6a;
-                    }
-                """)
-            else:
-                # White/default background for potentially risky files
-                path_item.setToolTip("⚠️ CAUTION: Verify this file before deleting - may be important system/program file")
-                
-                # Warning delete button styling
-                delete_button = QPushButton("⚠️ Delete")
-                delete_button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #d32f2f;
-                        color: white;
-                        border: none;
-                        border-radius: 3px;
-                        padding: 5px 10px;
-                        font-size: 12px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #f44336;
-                    }
-                """)
-            
-            self.results_table.setItem(row, 0, path_item)
-            self.results_table.setItem(row, 1, size_item)
-            delete_button.clicked.connect(lambda checked, r=row: self.delete_file(r))
-            self.results_table.setCellWidget(row, 2, delete_button)
-            
-        # Status message based on scan mode
-        total_mb = sum(size_mb for _, size_mb, _ in self.files_data)
+    def update_results_status(self):
+        """Status message based on scan mode, for the rows currently shown."""
+        file_count, safe_count, total_mb = self.files_model.results.visible_totals()
         if self.scan_mode == 'safe_only':
-            status_msg = f"Found {len(self.files_data)} safe-to-delete files ({total_mb:.2f} MB / {total_mb/1024:.2f} GB potential space savings)"
+            status_msg = f"Found {file_count} safe-to-delete files ({total_mb:.2f} MB / {total_mb/1024:.2f} GB potential space savings)"
         else:
-            status_msg = f"Found {len(self.files_data)} files ({safe_count} safe in GREEN, {len(self.files_data) - safe_count} risky in WHITE) - {total_mb:.2f} MB total"
+            status_msg = f"Found {file_count} files ({safe_count} safe in GREEN, {file_count - safe_count} risky in WHITE) - {total_mb:.2f} MB total"
         self.update_status(status_msg)
         
+    def selected_result_rows(self):
+        """View rows selected in the results table, top to bottom."""
+        return sorted(index.row() for index in self.results_table.selectionModel().selectedRows())
+        
     def delete_file(self, row):
         """Delete a file immediately without confirmation."""
-        if row >= len(self.files_data):
+        if row >= len(self.files_model.results):
             return
             
-        file_path, size_mb, is_safe_to_delete = self.files_data[row]
+        file_path, size_mb, is_safe_to_delete = self.files_model.results.row(row)
         
         try:
             # Attempt to delete the file immediately
             os.remove(file_path)
             
-            # Remove from data and table
-            self.files_data.pop(row)
-            self.results_table.removeRow(row)
-            
-            # Update row indices for remaining delete buttons
-            self.refresh_delete_buttons()
+            # Remove from the results
+            self.files_model.remove_paths({file_path})
             
             # Show success message
             self.update_status(f"✓ Deleted: {os.path.basename(file_path)} ({size_mb:.2f} MB)")
@@ -2792,38 +2844,23 @@ class MainAppWindow(QMainWindow):
             # Try to schedule for deletion on reboot
             if force_delete_on_reboot(file_path):
                 # Remove from table as it will be deleted on reboot
-                self.files_data.pop(row)
-                self.results_table.removeRow(row)
-                self.refresh_delete_buttons()
+                self.files_model.remove_paths({file_path})
                 self.update_status(f"🔄 Scheduled for deletion on reboot: {os.path.basename(file_path)} ({size_mb:.2f} MB)")
                 self.update_disk_space()
             else:
                 self.update_status(f"❌ Permission denied: {os.path.basename(file_path)}")
         except FileNotFoundError:
             # File no longer exists, remove from table anyway
-            self.files_data.pop(row)
-            self.results_table.removeRow(row)
-            self.refresh_delete_buttons()
+            self.files_model.remove_paths({file_path})
             self.update_status(f"⚠️ File not found: {os.path.basename(file_path)}")
         except Exception as e:
             # Try to schedule for deletion on reboot as last resort
             if force_delete_on_reboot(file_path):
-                self.files_data.pop(row)
-                self.results_table.removeRow(row)
-                self.refresh_delete_buttons()
+                self.files_model.remove_paths({file_path})
                 self.update_status(f"🔄 Scheduled for deletion on reboot: {os.path.basename(file_path)} ({size_mb:.2f} MB)")
                 self.update_disk_space()
             else:
                 self.update_status(f"❌ Error deleting {os.path.basename(file_path)}: {str(e)}")
-                
-    def refresh_delete_buttons(self):
-        """Refresh delete button connections after row removal."""
-        for row in range(self.results_table.rowCount()):
-            button = self.results_table.cellWidget(row, 2)
-            if button:
-                # Disconnect old connections and connect with correct row index
-                button.clicked.disconnect()
-                button.clicked.connect(lambda checked, r=row: self.delete_file(r))
     
     def create_drive_selection(self):
         """Create the drive selection widget."""
@@ -2922,8 +2959,7 @@ class MainAppWindow(QMainWindow):
         self.update_disk_space()
         
         # Clear current results
-        self.results_table.setRowCount(0)
-        self.files_data.clear()
+        self.files_model.set_files([])
         
         self.update_status(f"Selected {drive_letter}: drive - ready to scan for safe-to-delete files")
     
@@ -3002,79 +3038,31 @@ class MainAppWindow(QMainWindow):
     
     def bulk_delete_files(self):
         """Delete all selected files immediately."""
-        selected_items = self.results_table.selectedItems()
+        if self.deletion_thread and self.deletion_thread.isRunning():
+            self.update_status("A deletion is already in progress")
+            return
         
-        # Get unique row numbers from selected items
-        selected_rows = list(set(item.row() for item in selected_items))
+        selected_rows = self.selected_result_rows()
         
         if not selected_rows:
             self.update_status("No files selected for deletion")
             return
         
-        deleted_count = 0
-        error_count = 0
-        total_size_deleted = 0.0
-        
-        # Delete in reverse order to maintain row indices
-        for row in reversed(selected_rows):
-            if row < len(self.files_data):
-                file_path, size_mb, is_safe_to_delete = self.files_data[row]
-                
-                try:
-                    # Attempt to delete the file
-                    os.remove(file_path)
-                    
-                    # Remove from data and table
-                    self.files_data.pop(row)
-                    self.results_table.removeRow(row)
-                    
-                    deleted_count += 1
-                    total_size_deleted += size_mb
-                    
-                except PermissionError:
-                    # Try to schedule for deletion on reboot
-                    if force_delete_on_reboot(file_path):
-                        self.files_data.pop(row)
-                        self.results_table.removeRow(row)
-                        deleted_count += 1
-                        total_size_deleted += size_mb
-                    else:
-                        error_count += 1
-                except FileNotFoundError:
-                    # File doesn't exist, remove from table anyway
-                    self.files_data.pop(row)
-                    self.results_table.removeRow(row)
-                    deleted_count += 1
-                except Exception:
-                    # Try to schedule for deletion on reboot as last resort
-                    if force_delete_on_reboot(file_path):
-                        self.files_data.pop(row)
-                        self.results_table.removeRow(row)
-                        deleted_count += 1
-                        total_size_deleted += size_mb
-                    else:
-                        error_count += 1
-        
-        # Refresh button connections
-        self.refresh_delete_buttons()
-        
-        # Update disk space
-        self.update_disk_space()
-        
-        # Update status
-        if error_count == 0:
-            self.update_status(f"✓ Successfully deleted {deleted_count} files ({total_size_deleted:.2f} MB freed)")
-        else:
-            self.update_status(f"✓ Deleted {deleted_count} files, {error_count} errors ({total_size_deleted:.2f} MB freed)")
+        files = [(file_path, size_mb) for file_path, size_mb, _ in self.files_model.results.rows(selected_rows)]
+        self.start_deletion(files, 'bulk')
     
     def purge_all_temps(self):
         """Delete all safe-to-delete files at once."""
-        if not self.files_data:
+        if self.deletion_thread and self.deletion_thread.isRunning():
+            self.update_status("A deletion is already in progress")
+            return
+        
+        if not self.files_model.results.total_count:
             self.update_status("No files to purge. Run a scan first.")
             return
         
-        # Count safe files
-        safe_files = [(i, file_path, size_mb) for i, (file_path, size_mb, is_safe) in enumerate(self.files_data) if is_safe]
+        # Count safe files among the rows shown (the path filter narrows a purge too)
+        safe_files = [(file_path, size_mb) for file_path, size_mb, is_safe in self.files_model.results.rows() if is_safe]
         
         if not safe_files:
             self.update_status("No safe files found to purge.")
@@ -3085,7 +3073,7 @@ class MainAppWindow(QMainWindow):
             self, 
             "Purge All Temporary Files", 
             f"This will delete {len(safe_files)} temporary/cache files.\n"
-            f"Total size: {sum(size for _, _, size in safe_files):.2f} MB\n\n"
+            f"Total size: {sum(size for _, size in safe_files):.2f} MB\n\n"
             f"Are you sure you want to continue?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.Yes
@@ -3094,50 +3082,65 @@ class MainAppWindow(QMainWindow):
         if reply != QMessageBox.Yes:
             return
         
-        deleted_count = 0
-        reboot_count = 0
-        error_count = 0
-        total_size_deleted = 0.0
-        
-        # Delete safe files in reverse order to maintain indices
-        for row, file_path, size_mb in reversed(safe_files):
-            try:
-                # Attempt to delete the file
-                os.remove(file_path)
-                deleted_count += 1
-                total_size_deleted += size_mb
-                
-            except PermissionError:
-                # Try to schedule for deletion on reboot
-                if force_delete_on_reboot(file_path):
-                    reboot_count += 1
-                    total_size_deleted += size_mb
-                else:
-                    error_count += 1
-                    
-            except FileNotFoundError:
-                # File doesn't exist anymore
-                deleted_count += 1
-                
-            except Exception:
-                # Try to schedule for deletion on reboot as last resort
-                if force_delete_on_reboot(file_path):
-                    reboot_count += 1
-                    total_size_deleted += size_mb
-                else:
-                    error_count += 1
-            
-            # Remove from table regardless of delete method
-            if row < len(self.files_data):
-                self.files_data.pop(row)
-                self.results_table.removeRow(row)
-        
-        # Refresh button connections
-        self.refresh_delete_buttons()
+        self.start_deletion(safe_files, 'purge')
+    
+    def start_deletion(self, files, mode):
+        """Delete (path, size_mb) files on a background thread; mode is 'bulk' or 'purge'."""
+        self.deletion_mode = mode
+        self.bulk_delete_button.setEnabled(False)
+        self.purge_all_temps_button.setEnabled(False)
+        self.scan_button.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.update_status(f"🗑️ Deleting {len(files)} files...")
+        
+        self.deletion_thread = FileDeletionThread(files)
+        self.deletion_thread.progress_updated.connect(self.on_deletion_progress)
+        self.deletion_thread.deletion_completed.connect(self.on_deletion_completed)
+        self.deletion_thread.error_occurred.connect(self.on_scan_error)
+        self.deletion_thread.finished.connect(self.on_deletion_finished)
+        self.deletion_thread.start()
+    
+    def on_deletion_progress(self, done, total, freed_mb):
+        """Show aggregated progress of the running deletion batch."""
+        self.update_status(f"🗑️ Deleting... {done}/{total} files ({freed_mb:.2f} MB freed)")
+    
+    def on_deletion_finished(self):
+        """Re-enable the controls once the deletion thread has stopped."""
+        self.bulk_delete_button.setEnabled(True)
+        self.purge_all_temps_button.setEnabled(True)
+        scanning = bool(self.scanner_thread and self.scanner_thread.isRunning())
+        self.scan_button.setEnabled(not scanning)
+        self.progress_bar.setVisible(scanning)
+    
+    def on_deletion_completed(self, summary):
+        """Drop the handled rows in one table rebuild and report the results."""
+        outcomes = summary.outcomes
+        if self.deletion_mode == 'purge':
+            # Purged rows leave the table whatever the outcome
+            self.files_model.remove_paths(outcomes)
+        else:
+            self.files_model.remove_paths({path for path, outcome in outcomes.items()
+                                           if outcome != BatchDeleter.FAILED})
         
         # Update disk space
         self.update_disk_space()
         
+        if self.deletion_mode == 'purge':
+            self.report_purge(summary)
+        else:
+            deleted_count = summary.deleted + summary.scheduled + summary.missing
+            if summary.failed == 0:
+                self.update_status(f"✓ Successfully deleted {deleted_count} files ({summary.freed_mb:.2f} MB freed)")
+            else:
+                self.update_status(f"✓ Deleted {deleted_count} files, {summary.failed} errors ({summary.freed_mb:.2f} MB freed)")
+    
+    def report_purge(self, summary):
+        """Show the status line and summary dialog for a finished purge."""
+        deleted_count = summary.deleted + summary.missing
+        reboot_count = summary.scheduled
+        error_count = summary.failed
+        total_size_deleted = summary.freed_mb
+        
         # Show comprehensive status
         status_parts = []
         if deleted_count > 0:
@@ -3153,32 +3156,23 @@ class MainAppWindow(QMainWindow):
         self.update_status(f"🚀 PURGE COMPLETE: {status_msg}")
         
         # Show summary dialog
-        summary = f"Purge Summary:\n\n"
-        summary += f"• Successfully deleted: {deleted_count} files\n"
+        summary_text = f"Purge Summary:\n\n"
+        summary_text += f"• Successfully deleted: {deleted_count} files\n"
         if reboot_count > 0:
-            summary += f"• Scheduled for reboot: {reboot_count} files\n"
+            summary_text += f"• Scheduled for reboot: {reboot_count} files\n"
         if error_count > 0:
-            summary += f"• Failed to delete: {error_count} files\n"
-        summary += f"\n💾 Total space freed: {total_size_deleted:.2f} MB ({total_size_deleted/1024:.2f} GB)"
+            summary_text += f"• Failed to delete: {error_count} files\n"
+        summary_text += f"\n💾 Total space freed: {total_size_deleted:.2f} MB ({total_size_deleted/1024:.2f} GB)"
         
         if reboot_count > 0:
-            summary += f"\n\n🔄 Note: {reboot_count} files will be deleted on next system reboot."
+            summary_text += f"\n\n🔄 Note: {reboot_count} files will be deleted on next system reboot."
         
-        QMessageBox.information(self, "Purge Complete", summary)
+        QMessageBox.information(self, "Purge Complete", summary_text)
     
     def copy_selected_files(self):
         """Copy all selected file entries to clipboard."""
-        selected_items = self.results_table.selectedItems()
-        
-        # Get unique row numbers from selected items
-        selected_rows = list(set(item.row() for item in selected_items))
-        selected_files = []
-        
         # Get file data for selected rows
-        for row in selected_rows:
-            if row < len(self.files_data):
-                file_path, size_mb, is_safe_to_delete = self.files_data[row]
-                selected_files.append((file_path, size_mb, is_safe_to_delete))
+        selected_files = self.files_model.results.rows(self.selected_result_rows())
         
         if not selected_files:
             self.update_status("No files selected to copy")
@@ -3217,6 +3211,10 @@ class MainAppWindow(QMainWindow):
                 
     def closeEvent(self, event):
         """Handle application close event."""
+        if self.deletion_thread and self.deletion_thread.isRunning():
+            # Let files already being deleted finish; the rest of the batch is left alone
+            self.deletion_thread.request_stop()
+            self.deletion_thread.wait(5000)
         if self.scanner_thread and self.scanner_thread.isRunning():
             reply = QMessageBox.question(
                 self, 
@@ -3241,6 +3239,7 @@ class HeadlessCleanupManager:
     
     def __init__(self):
         self.files_cleaned = []
+        self.safe_rules = None
         self.registry_issues_fixed = []
         self.software_updated = []
         self.total_mb_cleaned = 0.0
@@ -3329,110 +3328,56 @@ class HeadlessCleanupManager:
     
     def scan_and_clean_drive(self, drive_path, exclusion_keywords, safe_extensions, safe_folders):
         """Scan and clean a specific drive."""
-        cleaned_count = 0
-        error_count = 0
+        # Headless cleanup never used the large-file rule
+        self.safe_rules = SafeDeleteRules(safe_extensions, safe_folders, large_file_mb=None)
+        walk_errors = 0
         
-        try:
-            for root, dirs, files in os.walk(drive_path):
-                # Skip directories that match exclusion keywords
-                dirs[:] = [d for d in dirs if not any(keyword in d.lower() for keyword in exclusion_keywords)]
-                
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        
-                        # Check if path contains any exclusion keywords
-                        if any(keyword in file_path.lower() for keyword in exclusion_keywords):
-                            continue
-                        
-                        # Check if file is safe to delete
-                        if self.is_safe_to_delete(file_path, safe_extensions, safe_folders):
-                            size_bytes = os.path.getsize(file_path)
-                            size_mb = size_bytes / (1024 * 1024)
+        def safe_files():
+            """Yield (path, size_mb) for safe files as the walk finds them."""
+            nonlocal walk_errors
+            try:
+                for root, dirs, files in os.walk(drive_path):
+                    # Skip directories that match exclusion keywords
+                    dirs[:] = [d for d in dirs if not any(keyword in d.lower() for keyword in exclusion_keywords)]
+                    
+                    for file in files:
+                        try:
+                            file_path = os.path.join(root, file)
                             
-                            try:
-                                os.remove(file_path)
-                                self.files_cleaned.append({
-                                    'path': file_path,
-                                    'size_mb': size_mb,
-                                    'type': 'temp_file'
-                                })
-                                self.total_mb_cleaned += size_mb
-                                cleaned_count += 1
-                                
-                            except PermissionError:
-                                # Try to schedule for deletion on reboot
-                                if force_delete_on_reboot(file_path):
-                                    self.files_cleaned.append({
-                                        'path': file_path,
-                                        'size_mb': size_mb,
-                                        'type': 'temp_file_scheduled'
-                                    })
-                                    self.total_mb_cleaned += size_mb
-                                    cleaned_count += 1
-                                else:
-                                    error_count += 1
-                                    
-                            except Exception as e:
-                                error_count += 1
+                            # Check if path contains any exclusion keywords
+                            if any(keyword in file_path.lower() for keyword in exclusion_keywords):
                                 continue
+                            
+                            # Check if file is safe to delete
+                            if self.is_safe_to_delete(file_path, safe_extensions, safe_folders):
+                                yield file_path, os.path.getsize(file_path) / (1024 * 1024)
                                 
-                    except (PermissionError, FileNotFoundError, OSError):
-                        continue
-                        
-        except Exception as e:
-            error_count += 1
-            
+                        except (PermissionError, FileNotFoundError, OSError):
+                            continue
+                            
+            except Exception:
+                walk_errors += 1
+        
+        def record(file_path, size_mb, outcome):
+            if outcome in (BatchDeleter.DELETED, BatchDeleter.SCHEDULED):
+                self.files_cleaned.append({
+                    'path': file_path,
+                    'size_mb': size_mb,
+                    'type': 'temp_file' if outcome == BatchDeleter.DELETED else 'temp_file_scheduled'
+                })
+                self.total_mb_cleaned += size_mb
+        
+        # Same engine as the GUI's bulk actions: files are deleted by a worker pool while the walk goes on
+        summary = BatchDeleter(schedule_on_reboot=force_delete_on_reboot).run(safe_files(), on_result=record)
+        cleaned_count = summary.deleted + summary.scheduled
+        error_count = summary.failed + summary.missing + walk_errors
         return cleaned_count, error_count
     
     def is_safe_to_delete(self, file_path, safe_extensions, safe_folders):
         """Determine if a file is safe to delete."""
-        file_path_lower = file_path.lower()
-        file_name = os.path.basename(file_path_lower)
-        dir_name = os.path.dirname(file_path_lower)
-        
-        # Check file extension
-        file_ext = os.path.splitext(file_name)[1]
-        if file_ext in safe_extensions:
-            return True
-        
-        # Check if file is in a safe folder
-        for safe_folder in safe_folders:
-            if safe_folder in dir_name:
-                return True
-        
-        # Check specific safe file patterns
-        safe_patterns = [
-            'thumbs.db', 'desktop.ini', '.ds_store', 'hiberfil.sys',
-            'pagefile.sys', 'swapfile.sys', 'memory.dmp', 'error.log',
-            'crash', 'dump', 'minidump', 'temp_', '_temp', 'temporary',
-            'cache_', '_cache', 'backup_', '_backup', 'old_', '_old'
-        ]
-        
-        for pattern in safe_patterns:
-            if pattern in file_name:
-                return True
-        
-        # Check Windows and application temporary directories
-        temp_paths = [
-            '\\\\windows\\\\temp\\\\', '\\\\temp\\\\', '\\\\tmp\\\\',
-            '\\\\appdata\\\\local\\\\temp\\\\', '\\\\appdata\\\\roaming\\\\temp\\\\',
-            '\\\\windows\\\\prefetch\\\\', '\\\\windows\\\\logs\\\\',
-            '\\\\windows\\\\winsxs\\\\backup\\\\', '\\\\windows\\\\softwaredistribution\\\\',
-            '\\\\programdata\\\\microsoft\\\\windows\\\\wer\\\\',
-            '\\\\users\\\\.*\\\\appdata\\\\local\\\\crashdumps\\\\',
-            '\\\\windows\\\\system32\\\\logfiles\\\\',
-            '\\\\windows\\\\memory.dmp', '\\\\windows\\\\minidump\\\\',
-            '\\\\windows\\\\temp\\\\', '\\\\windows\\\\logs\\\\cbs\\\\',
-            '\\\\windows\\\\logs\\\\dism\\\\', '\\\\windows\\\\panther\\\\',
-            '\\\\windows\\\\inf\\\\setupapi\\\\'
-        ]
-        
-        for temp_path in temp_paths:
-            if temp_path in file_path_lower:
-                return True
-        
-        return False
+        if self.safe_rules is None:
+            self.safe_rules = SafeDeleteRules(safe_extensions, safe_folders, large_file_mb=None)
+        return self.safe_rules.match(file_path) is not None
     
     def clean_registry_issues(self):
         """Clean registry issues in headless mode."""
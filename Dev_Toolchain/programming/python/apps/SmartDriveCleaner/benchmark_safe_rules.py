@@ -0,0 +1,165 @@
+"""Micro-benchmark: compiled SafeDeleteRules vs. the original per-file substring loops.
+
+Runs on any OS (paths are synthetic Windows paths, nothing is touched on disk):
+
+    python benchmark_safe_rules.py --files 500000 --repeat 3
+"""
+import argparse
+import json
+import ntpath
+import random
+import time
+
+from cleaner_core import SafeDeleteRules
+
+SAFE_EXTENSIONS = {
+    '.tmp', '.temp', '.log', '.bak', '.backup', '.old', '.dmp',
+    '.cache', '.crdownload', '.partial', '.prefetch', '.chk',
+    '.etl', '.evtx', '.wer', '.cab', '.dmp', '.mdmp', '.hdmp',
+    '.trace', '.blf', '.regtrans-ms', '.dat.old', '.bak~'
+}
+
+SAFE_FOLDERS = {
+    'temp', 'tmp', 'cache', 'logs', 'backup', 'backups',
+    'recycle.bin', '$recycle.bin', 'system volume information',
+    'windows.old', 'prefetch', 'recent', 'temporary internet files',
+    'downloaded program files', 'internet cache', 'webcache',
+    'windows error reporting', 'minidump', 'memory dumps',
+    'thumbnail cache', 'icon cache', 'crash dumps'
+}
+
+
+def legacy_is_safe_to_delete(file_path, safe_extensions, safe_folders):
+    """The loops FileScannerThread.is_safe_to_delete used before the compiled rules (minus the stat)."""
+    file_path_lower = file_path.lower()
+    file_name = ntpath.basename(file_path_lower)
+    dir_name = ntpath.dirname(file_path_lower)
+
+    file_ext = ntpath.splitext(file_name)[1]
+    if file_ext in safe_extensions:
+        return True
+
+    for safe_folder in safe_folders:
+        if safe_folder in dir_name:
+            return True
+
+    safe_patterns = [
+        'thumbs.db', 'desktop.ini', '.ds_store', 'hiberfil.sys',
+        'pagefile.sys', 'swapfile.sys', 'memory.dmp', 'error.log',
+        'crash', 'dump', 'minidump', 'temp_', '_temp', 'temporary',
+        'cache_', '_cache', 'backup_', '_backup', 'old_', '_old'
+    ]
+    for pattern in safe_patterns:
+        if pattern in file_name:
+            return True
+
+    temp_paths = [
+        '\\\\windows\\\\temp\\\\', '\\\\temp\\\\', '\\\\tmp\\\\',
+        '\\\\appdata\\\\local\\\\temp\\\\', '\\\\appdata\\\\roaming\\\\temp\\\\',
+        '\\\\windows\\\\prefetch\\\\', '\\\\windows\\\\logs\\\\',
+        '\\\\windows\\\\winsxs\\\\backup\\\\', '\\\\windows\\\\softwaredistribution\\\\',
+        '\\\\programdata\\\\microsoft\\\\windows\\\\wer\\\\',
+        '\\\\users\\\\.*\\\\appdata\\\\local\\\\crashdumps\\\\',
+        '\\\\windows\\\\system32\\\\logfiles\\\\',
+        '\\\\windows\\\\memory.dmp', '\\\\windows\\\\minidump\\\\',
+        '\\\\windows\\\\temp\\\\', '\\\\windows\\\\logs\\\\cbs\\\\',
+        '\\\\windows\\\\logs\\\\dism\\\\', '\\\\windows\\\\panther\\\\',
+        '\\\\windows\\\\inf\\\\setupapi\\\\'
+    ]
+    for temp_path in temp_paths:
+        if temp_path in file_path_lower:
+            return True
+
+    return False
+
+
+COMPONENTS = [
+    'Users', 'alex', 'Documents', 'Projects', 'src', 'node_modules', 'lib', 'AppData', 'Local',
+    'Roaming', 'Packages', 'Games', 'Steam', 'steamapps', 'common', 'Music', 'Pictures', '2023',
+    'bin', 'obj', 'Debug', 'Release', 'Videos', 'Downloads', 'site-packages', 'assets', 'textures',
+]
+SYSTEM_DIRS = [
+    'Windows\\Temp', 'Windows\\Logs\\CBS', 'Windows\\SoftwareDistribution\\Download', 'Windows\\Panther',
+    'ProgramData\\Microsoft\\Windows\\WER\\ReportQueue', 'Users\\alex\\AppData\\Local\\CrashDumps',
+    'Windows\\System32\\LogFiles\\WMI', 'Windows\\INF\\SetupAPI', 'Users\\alex\\AppData\\Local\\Temp',
+]
+NAMES = [
+    'main.cpp', 'index.js', 'IMG_0001.JPG', 'track01.mp3', 'README.md', 'data.bin', 'setup.exe',
+    'report.pdf', 'clip.mp4', 'module.pyc', 'save_old.dat', 'thumbs.db', 'install.log', 'core.dmp',
+    'package.json', 'texture_cache_01.pak', 'notes.txt',
+]
+
+
+def make_paths(count, seed):
+    """Synthetic C: drive listing: mostly user/app trees, about 5% under system temp locations."""
+    rng = random.Random(seed)
+    paths = []
+    while len(paths) < count:
+        if rng.random() < 0.05:
+            directory = 'C:\\' + rng.choice(SYSTEM_DIRS)
+        else:
+            directory = 'C:\\' + '\\'.join(rng.choice(COMPONENTS) for _ in range(rng.randint(2, 9)))
+        # Files of one directory arrive together, as os.walk yields them
+        for _ in range(rng.randint(1, 40)):
+            paths.append(directory + '\\' + rng.choice(NAMES))
+    return paths[:count]
+
+
+def time_best(function, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the compiled safe-to-delete rules')
+    parser.add_argument('--files', type=int, default=300000, help='Number of synthetic paths (default: 300000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per implementation; best is reported')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--system-paths', action='store_true',
+                        help='Also enable the system temp path rules, which the original loops never matched')
+    args = parser.parse_args()
+
+    paths = make_paths(args.files, args.seed)
+
+    legacy_seconds, legacy = time_best(
+        lambda: [legacy_is_safe_to_delete(path, SAFE_EXTENSIONS, SAFE_FOLDERS) for path in paths], args.repeat)
+
+    def compiled_run():
+        # Built once per scan
+        rules = SafeDeleteRules(SAFE_EXTENSIONS, SAFE_FOLDERS, large_file_mb=None, system_paths=args.system_paths)
+        return [rules.match(path) for path in paths]
+
+    compiled_seconds, compiled = time_best(compiled_run, args.repeat)
+
+    # By default the rules must agree exactly; with --system-paths the temp path rules (single
+    # backslashes and a real wildcard) may additionally match
+    disagreements = {}
+    for old, rule in zip(legacy, compiled):
+        if old != (rule is not None):
+            key = rule or 'none'
+            disagreements[key] = disagreements.get(key, 0) + 1
+    unexpected = {rule: count for rule, count in disagreements.items()
+                  if not (args.system_paths and rule.startswith('path:'))}
+
+    print(json.dumps({
+        'files': len(paths),
+        'legacy_seconds': round(legacy_seconds, 4),
+        'compiled_seconds': round(compiled_seconds, 4),
+        'legacy_files_per_second': round(len(paths) / legacy_seconds),
+        'compiled_files_per_second': round(len(paths) / compiled_seconds),
+        'speedup': round(legacy_seconds / compiled_seconds, 2),
+        'safe_legacy': sum(legacy),
+        'safe_compiled': sum(rule is not None for rule in compiled),
+        'newly_matched_by_rule': disagreements,
+        'unexpected_disagreements': unexpected,
+    }, indent=2))
+    return 1 if unexpected else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,681 @@
+"""Qt-free scanning and classification helpers shared by the Smart Drive Cleaner front ends."""
+import heapq
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import deque
+
+
+def _trie_pattern(words):
+    """Build a regex alternation of literal words, factored into a prefix trie.
+
+    The regex engine then tries one branch per distinct leading character at
+    each position instead of every word in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class SafeDeleteRules:
+    """Compiled safe-to-delete classifier for lowercase Windows paths.
+
+    Build one per scan. match() returns the ID of the first rule that marks a
+    file safe (checked in the original order: extension, folder, file name,
+    system temp path, large file in a log folder) or None. Folder and path
+    rules depend only on the directory, so their result is reused for every
+    file of the directory that was checked last.
+
+    The system temp path rules never matched in the original loops (they were
+    written with doubled backslashes), so they stay off unless system_paths is
+    set; by default the rules mark exactly the files the original code did.
+    """
+
+    # Specific safe file patterns, matched anywhere in the file name
+    SAFE_PATTERNS = (
+        'thumbs.db', 'desktop.ini', '.ds_store', 'hiberfil.sys',
+        'pagefile.sys', 'swapfile.sys', 'memory.dmp', 'error.log',
+        'crash', 'dump', 'minidump', 'temp_', '_temp', 'temporary',
+        'cache_', '_cache', 'backup_', '_backup', 'old_', '_old'
+    )
+
+    # Windows and application temporary directories, matched against the directory plus a trailing
+    # separator when system_paths is set. \windows\memory.dmp is left out: its name is already a
+    # safe pattern.
+    TEMP_PATHS = (
+        '\\windows\\temp\\', '\\temp\\', '\\tmp\\',
+        '\\appdata\\local\\temp\\', '\\appdata\\roaming\\temp\\',
+        '\\windows\\prefetch\\', '\\windows\\logs\\',
+        '\\windows\\winsxs\\backup\\', '\\windows\\softwaredistribution\\',
+        '\\programdata\\microsoft\\windows\\wer\\',
+        '\\windows\\system32\\logfiles\\',
+        '\\windows\\minidump\\',
+        '\\windows\\logs\\cbs\\',
+        '\\windows\\logs\\dism\\', '\\windows\\panther\\',
+        '\\windows\\inf\\setupapi\\'
+    )
+
+    # Temp paths with a wildcard component: rule ID -> regex
+    TEMP_PATH_PATTERNS = {
+        '\\users\\*\\appdata\\local\\crashdumps\\': r'\\users\\[^\\]+\\appdata\\local\\crashdumps\\',
+    }
+
+    # Folders where files of at least large_file_mb are treated as disposable
+    LARGE_FILE_FOLDERS = ('temp', 'cache', 'log')
+
+    def __init__(self, safe_extensions, safe_folders, large_file_mb=100, system_paths=False):
+        self.safe_extensions = frozenset(safe_extensions)
+        self.large_file_bytes = None if large_file_mb is None else large_file_mb * 1024 * 1024
+        self.folder_re = re.compile(_trie_pattern(safe_folders))
+        self.name_re = re.compile(_trie_pattern(self.SAFE_PATTERNS))
+        self.path_re = re.compile('|'.join(
+            [_trie_pattern(self.TEMP_PATHS)] + list(self.TEMP_PATH_PATTERNS.values()))) if system_paths else None
+        self.large_folder_re = re.compile(_trie_pattern(self.LARGE_FILE_FOLDERS))
+        self._last_directory = (None, None, False)
+        # Identifies the rule set, e.g. for ScanCache: cached flags are only valid for the same rules
+        self.signature = repr((sorted(self.safe_extensions), self.large_file_bytes, self.folder_re.pattern,
+                               self.name_re.pattern, self.path_re and self.path_re.pattern,
+                               self.large_folder_re.pattern))
+
+    def directory_rule(self, dir_name):
+        """Return (rule ID from the folder or temp path rules, whether large files are safe) for a lowercase directory."""
+        last = self._last_directory  # Read once; workers may replace it concurrently
+        if last[0] == dir_name:
+            return last[1], last[2]
+        rule = None
+        match = self.folder_re.search(dir_name)
+        if match:
+            rule = 'folder:' + match.group()
+        elif self.path_re is not None:
+            match = self.path_re.search(dir_name.replace('/', '\\') + '\\')
+            if match:
+                rule = 'path:' + self._path_rule_id(match.group())
+        large_files = self.large_file_bytes is not None and bool(self.large_folder_re.search(dir_name))
+        self._last_directory = (dir_name, rule, large_files)
+        return rule, large_files
+
+    def _path_rule_id(self, matched):
+        if matched in self.TEMP_PATHS:
+            return matched
+        for rule_id, pattern in self.TEMP_PATH_PATTERNS.items():
+            if re.fullmatch(pattern, matched):
+                return rule_id
+        return matched
+
+    def match(self, file_path, size_bytes=None):
+        """Return the ID of the rule that marks file_path safe to delete, or None.
+
+        size_bytes is only consulted for the large-file rule; when it is not
+        given the file is stat()ed only if that rule could apply.
+        """
+        path_lower = file_path.lower()
+        cut = max(path_lower.rfind('\\'), path_lower.rfind('/'))
+        file_name = path_lower[cut + 1:]
+        # Same directory string as os.path.dirname: trailing separators dropped, except at a root
+        head = path_lower[:cut + 1]
+        stripped = head.rstrip('\\/')
+        dir_name = stripped if stripped and not stripped.endswith(':') else head
+
+        # Check file extension (as os.path.splitext: leading dots do not start one)
+        dot = file_name.rfind('.')
+        if dot >= len(file_name) - len(file_name.lstrip('.')) and file_name[dot:] in self.safe_extensions:
+            return 'extension:' + file_name[dot:]
+
+        # Folder rules and name patterns keep their original precedence
+        folder_rule, large_files = self.directory_rule(dir_name)
+        if folder_rule is not None and folder_rule.startswith('folder:'):
+            return folder_rule
+        match = self.name_re.search(file_name)
+        if match:
+            return 'name:' + match.group()
+        if folder_rule is not None:
+            return folder_rule
+
+        # Check for large files in temp/cache/log locations
+        if large_files:
+            if size_bytes is None:
+                try:
+                    size_bytes = os.path.getsize(file_path)
+                except OSError:
+                    return None
+            if size_bytes >= self.large_file_bytes:
+                return 'large-file'
+        return None
+
+
+class CachedDirectory:
+    """One directory as recorded by ScanCache; file columns are decoded only when needed."""
+
+    __slots__ = ('path', 'subdirs', 'file_count', 'max_size', 'safe_max', '_names', '_sizes', '_safe')
+
+    def __init__(self, path, subdirs, file_count, max_size, safe_max, names, sizes, safe):
+        self.path = path
+        self.subdirs = subdirs
+        self.file_count = file_count
+        self.max_size = max_size
+        self.safe_max = safe_max
+        self._names = names
+        self._sizes = sizes
+        self._safe = safe
+
+    def largest(self, include_all):
+        """Size of the largest file that would be kept (-1 when there is none)."""
+        return self.max_size if include_all else self.safe_max
+
+    def candidates(self, include_all, threshold=-1):
+        """(size_bytes, path, is_safe) for kept files larger than threshold."""
+        if not self.file_count:
+            return []
+        sizes = array('q')
+        sizes.frombytes(self._sizes)
+        names = self._names.split('\0')
+        return [(size, os.path.join(self.path, name), bool(safe))
+                for name, size, safe in zip(names, sizes, self._safe)
+                if size > threshold and (safe or include_all)]
+
+
+class ScanCache:
+    """SQLite cache of scanned directories, keyed by path and modification time.
+
+    Each row holds one directory's subdirectory names, its files (names,
+    sizes and safe-to-delete flags in compact columns) and their subtotals.
+    A directory whose mtime is unchanged is reused without being listed:
+    adding, removing or renaming an entry changes the mtime. Rows are not
+    trusted when the directory was modified within RACY_WINDOW seconds of
+    being listed, since a change in that window can leave the mtime as it
+    was, or when they are older than max_age seconds, because a file
+    rewritten in place does not touch its directory. When a directory is
+    listed again, cached subtrees of subdirectories that disappeared are
+    dropped. signature identifies the classification and exclusion rules;
+    when it differs from the stored one the whole cache is cleared.
+
+    Safe to share between worker threads.
+    """
+
+    RACY_WINDOW = 2.0
+    COMMIT_EVERY = 1000  # Directories written per transaction
+
+    def __init__(self, db_path, signature='', max_age=None):
+        self.db_path = db_path
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                scanned_at REAL NOT NULL,
+                subdirs TEXT NOT NULL,
+                names TEXT NOT NULL,
+                sizes BLOB NOT NULL,
+                safe BLOB NOT NULL,
+                file_count INTEGER NOT NULL,
+                total_bytes INTEGER NOT NULL,
+                max_size INTEGER NOT NULL,
+                safe_count INTEGER NOT NULL,
+                safe_bytes INTEGER NOT NULL,
+                safe_max INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        ''')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if row is None or row[0] != signature:
+            self.conn.execute('DELETE FROM dirs')
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+        self.conn.commit()
+
+    def get(self, directory, mtime_ns):
+        """Return the CachedDirectory for directory if it can be reused at mtime_ns, else None."""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT mtime_ns, scanned_at, subdirs, file_count, max_size, safe_max, names, sizes, safe '
+                'FROM dirs WHERE path = ?', (directory,)).fetchone()
+            if (row is None or row[0] != mtime_ns
+                    or mtime_ns / 1e9 >= row[1] - self.RACY_WINDOW
+                    or (self.max_age is not None and time.time() - row[1] > self.max_age)):
+                self.misses += 1
+                return None
+            self.hits += 1
+        subdirs = [os.path.join(directory, name) for name in row[2].split('\0')] if row[2] else []
+        return CachedDirectory(directory, subdirs, row[3], row[4], row[5], row[6], row[7], row[8])
+
+    def put(self, directory, mtime_ns, scanned_at, subdirs, files):
+        """Record a listing: subdirs are paths, files (name, size_bytes, is_safe) tuples.
+
+        mtime_ns must be taken before the directory was listed.
+        """
+        sizes = array('q', [size for _, size, _ in files])
+        safe_sizes = [size for _, size, is_safe in files if is_safe]
+        subdir_names = [os.path.basename(path) for path in subdirs]
+        with self._lock:
+            row = self.conn.execute('SELECT subdirs FROM dirs WHERE path = ?', (directory,)).fetchone()
+            if row is not None and row[0]:
+                for name in set(row[0].split('\0')).difference(subdir_names):
+                    self._delete_subtree(os.path.join(directory, name))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (directory, mtime_ns, scanned_at, '\0'.join(subdir_names),
+                 '\0'.join(name for name, _, _ in files), sizes.tobytes(),
+                 bytes(bool(is_safe) for _, _, is_safe in files),
+                 len(files), sum(sizes), max(sizes, default=-1),
+                 len(safe_sizes), sum(safe_sizes), max(safe_sizes, default=-1)))
+            self._uncommitted += 1
+            if self._uncommitted >= self.COMMIT_EVERY:
+                self.conn.commit()
+                self._uncommitted = 0
+
+    def _delete_subtree(self, path):
+        prefix = path.rstrip('\\/') + os.sep
+        self.conn.execute('DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)',
+                          (path, prefix, prefix[:-1] + chr(ord(os.sep) + 1)))
+
+    def subtotal(self, directory):
+        """(file_count, total_bytes, safe_count, safe_bytes) recorded for directory itself, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT file_count, total_bytes, safe_count, safe_bytes FROM dirs WHERE path = ?',
+                (directory,)).fetchone()
+        return tuple(row) if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM dirs').fetchone()[0]
+
+    def flush(self):
+        with self._lock:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class TopFilesScan:
+    """Parallel scandir walk that keeps only the largest matching files.
+
+    Worker threads share a queue of directories. Each lists one directory with
+    os.scandir (file sizes come from the DirEntry, which is free on Windows),
+    queues its subdirectories and offers the files to a min-heap bounded to
+    limit entries, so memory stays O(limit) however large the drive is. Once
+    the heap is full, files no larger than its smallest entry are dropped
+    before they are classified. Directories and files whose names contain an
+    exclusion keyword are skipped, as is every file when the root path
+    contains one (os.walk plus a full-path check gave the same result).
+
+    classify(path, size_bytes) returns whether a file is safe to delete; with
+    include_all False only safe files are kept. With a ScanCache, directories
+    whose mtime is unchanged since the last scan are taken from the cache
+    instead of being listed, and every listed directory is recorded in it.
+    """
+
+    def __init__(self, root, classify, exclusion_keywords=(), limit=10000, include_all=False,
+                 workers=None, should_stop=None, cache=None):
+        self.root = root
+        self.classify = classify
+        self.excluded_re = re.compile(_trie_pattern(k.lower() for k in exclusion_keywords)) if exclusion_keywords else None
+        self.limit = limit
+        self.include_all = include_all
+        self.workers = workers or min(16, (os.cpu_count() or 1) + 4)
+        self.should_stop = should_stop or (lambda: False)
+        self.cache = cache
+        self.files_seen = 0
+        self.directories_scanned = 0
+        self.directories_reused = 0
+        self.errors = 0
+        self.cache_errors = 0  # Cache reads and writes that failed and were skipped
+        self._heap = []  # (size_bytes, path, is_safe), smallest first
+        self._threshold = -1  # Smallest size in the heap once it is full
+        self._heap_lock = threading.Lock()
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._pending = 0  # Directories queued or being listed
+
+    def _excluded(self, name):
+        return self.excluded_re is not None and self.excluded_re.search(name.lower()) is not None
+
+    def run(self, on_partial=None, partial_interval=0.5, partial_rows=200):
+        """Scan the tree and return [(path, size_mb, is_safe)] largest first.
+
+        While the workers run, on_partial(rows) is called from this thread
+        every partial_interval seconds with the current largest partial_rows.
+        The scan ends early (keeping what was found) when should_stop() is true.
+        """
+        if self._excluded(self.root):
+            return []
+        self._queue.append(self.root)
+        self._pending = 1
+        threads = [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        while True:
+            with self._cond:
+                if self._pending and not self.should_stop():
+                    self._cond.wait(partial_interval)
+                done = not self._pending or self.should_stop()
+            if done:
+                break
+            if on_partial is not None:
+                on_partial(self.snapshot(partial_rows))
+        for thread in threads:
+            thread.join()
+        return self.snapshot()
+
+    def snapshot(self, count=None):
+        """The largest files found so far, largest first."""
+        with self._heap_lock:
+            heap = list(self._heap)
+        top = sorted(heap, reverse=True) if count is None else heapq.nlargest(count, heap)
+        return [(path, size / (1024 * 1024), is_safe) for size, path, is_safe in top]
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue and self._pending and not self.should_stop():
+                    self._cond.wait(0.05)
+                if not self._queue or self.should_stop():
+                    return
+                directory = self._queue.pop()  # Newest first keeps the queue short
+            subdirs, seen, reused, failed = [], 0, False, 1
+            try:
+                subdirs, seen, reused = self._visit(directory)
+                failed = 0
+            except Exception:  # Unreadable directory or classifier error: only this directory is lost
+                pass
+            finally:
+                # Always settle the directory, or run() would wait for it forever
+                with self._cond:
+                    self._queue.extend(subdirs)
+                    self._pending += len(subdirs) - 1
+                    self.directories_scanned += 1
+                    self.directories_reused += reused
+                    self.files_seen += seen
+                    self.errors += failed
+                    self._cond.notify_all()
+
+    def _visit(self, directory):
+        """Offer one directory's files to the heap; returns (subdirectories, files seen, reused)."""
+        if self.cache is None:
+            subdirs, seen = self._scan(directory)
+            return subdirs, seen, False
+        mtime_ns = os.stat(directory).st_mtime_ns  # Before listing, so a concurrent change is caught next time
+        try:
+            cached = self.cache.get(directory, mtime_ns)
+        except sqlite3.Error:  # E.g. database is locked: list the directory as on a miss
+            cached = None
+            self.cache_errors += 1
+        if cached is not None:
+            if cached.largest(self.include_all) > self._threshold:
+                self._offer(cached.candidates(self.include_all, self._threshold))
+            return cached.subdirs, cached.file_count, True
+        scanned_at = time.time()
+        files = []
+        subdirs, seen = self._scan(directory, files)
+        try:
+            self.cache.put(directory, mtime_ns, scanned_at, subdirs, files)
+        except sqlite3.Error:  # Not recorded; the directory is listed again next scan
+            self.cache_errors += 1
+        return subdirs, seen, False
+
+    def _scan(self, directory, record=None):
+        """List one directory and offer its files to the heap; returns (subdirectories, files seen).
+
+        When record is a list, (name, size_bytes, is_safe) is appended for every file.
+        """
+        subdirs = []
+        candidates = []
+        seen = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if self._excluded(entry.name):
+                    continue
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():  # Same as os.walk: don't descend into linked dirs
+                            subdirs.append(entry.path)
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                seen += 1
+                if record is None and size <= self._threshold:
+                    continue
+                is_safe = self.classify(entry.path, size)
+                if record is not None:
+                    record.append((entry.name, size, is_safe))
+                if (is_safe or self.include_all) and size > self._threshold:
+                    candidates.append((size, entry.path, is_safe))
+        self._offer(candidates)
+        return subdirs, seen
+
+    def _offer(self, candidates):
+        if not candidates:
+            return
+        with self._heap_lock:
+            heap = self._heap
+            for candidate in candidates:
+                if len(heap) < self.limit:
+                    heapq.heappush(heap, candidate)
+                elif candidate > heap[0]:
+                    heapq.heapreplace(heap, candidate)
+            if len(heap) >= self.limit:
+                self._threshold = heap[0][0]
+
+
+class DeleteSummary:
+    """Counts and freed space of one BatchDeleter run."""
+
+    def __init__(self, record_outcomes=False):
+        self.deleted = 0
+        self.scheduled = 0  # Left for deletion on the next reboot
+        self.missing = 0
+        self.failed = 0
+        self.freed_mb = 0.0  # Deleted plus scheduled files
+        self.failed_paths = []
+        self.outcomes = {} if record_outcomes else None  # path -> outcome
+        self.source_error = None  # Exception raised by the item source, which ended the run early
+
+    @property
+    def done(self):
+        return self.deleted + self.scheduled + self.missing + self.failed
+
+
+class BatchDeleter:
+    """Delete a batch of files with a pool of worker threads.
+
+    run() takes (path, size_mb) items and pulls them lazily, so it can be fed
+    straight from a directory walk. A file that cannot be removed is handed to
+    schedule_on_reboot(path) when given; if that returns true it counts as
+    scheduled, otherwise as failed. A file that is already gone counts as
+    missing and frees nothing.
+    """
+
+    DELETED = 'deleted'
+    SCHEDULED = 'scheduled'
+    MISSING = 'missing'
+    FAILED = 'failed'
+
+    def __init__(self, workers=None, schedule_on_reboot=None, should_stop=None, record_outcomes=False):
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 4)
+        self.schedule_on_reboot = schedule_on_reboot
+        self.should_stop = should_stop or (lambda: False)
+        self.record_outcomes = record_outcomes
+
+    def delete(self, path):
+        """Delete one file and return its outcome."""
+        try:
+            os.remove(path)
+            return self.DELETED
+        except FileNotFoundError:
+            return self.MISSING
+        except OSError:
+            if self.schedule_on_reboot is not None and self.schedule_on_reboot(path):
+                return self.SCHEDULED
+            return self.FAILED
+
+    def run(self, items, on_progress=None, on_result=None, progress_interval=0.25):
+        """Delete every item and return a DeleteSummary.
+
+        on_result(path, size_mb, outcome) is called from the worker threads,
+        one call at a time. on_progress(summary) is called from this thread
+        every progress_interval seconds while the workers run. Items not yet
+        taken when should_stop() turns true are left alone. If items raises,
+        that counts as one failure, is kept as summary.source_error and ends
+        the run once the items already taken are done.
+        """
+        summary = DeleteSummary(self.record_outcomes)
+        source = iter(items)
+        lock = threading.Lock()
+        exhausted = []  # Non-empty once the source has ended or raised
+
+        def work():
+            while not self.should_stop():
+                with lock:
+                    if exhausted:
+                        return
+                    try:
+                        item = next(source, None)  # Generators are not thread-safe on their own
+                    except Exception as e:
+                        summary.failed += 1
+                        summary.source_error = e
+                        item = None
+                    if item is None:
+                        exhausted.append(True)
+                        return
+                path, size_mb = item
+                outcome = self.delete(path)
+                with lock:
+                    if outcome == self.DELETED:
+                        summary.deleted += 1
+                        summary.freed_mb += size_mb
+                    elif outcome == self.SCHEDULED:
+                        summary.scheduled += 1
+                        summary.freed_mb += size_mb
+                    elif outcome == self.MISSING:
+                        summary.missing += 1
+                    else:
+                        summary.failed += 1
+                        summary.failed_paths.append(path)
+                    if summary.outcomes is not None:
+                        summary.outcomes[path] = outcome
+                    if on_result is not None:
+                        on_result(path, size_mb, outcome)
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(progress_interval)
+            while thread.is_alive():
+                if on_progress is not None:
+                    on_progress(summary)
+                thread.join(progress_interval)
+        return summary
+
+
+class ScanResults:
+    """Scan results in compact columns, with a sorted and filtered view over them.
+
+    Rows are (path, size_mb, is_safe). Paths are kept in a list, sizes in an
+    array of doubles and safe flags in a bytearray; the view is an array of
+    row indices in display order, so sorting and filtering never copy rows.
+    Positions passed to row() and rows() are view positions.
+    """
+
+    def __init__(self, files=()):
+        self.sort_key = 'size'
+        self.descending = True
+        self.filter_text = ''
+        self.set_files(files)
+
+    def set_files(self, files):
+        """Replace every row with files, keeping the current sort and filter."""
+        self.paths = []
+        self.sizes = array('d')
+        self.safe = bytearray()
+        for path, size_mb, is_safe in files:
+            self.paths.append(path)
+            self.sizes.append(size_mb)
+            self.safe.append(bool(is_safe))
+        self._rebuild_view()
+
+    def __len__(self):
+        return len(self.view)
+
+    @property
+    def total_count(self):
+        """Rows stored, including those hidden by the filter."""
+        return len(self.paths)
+
+    def row(self, position):
+        index = self.view[position]
+        return self.paths[index], self.sizes[index], bool(self.safe[index])
+
+    def rows(self, positions=None):
+        """Rows at the given view positions, or every visible row."""
+        if positions is None:
+            positions = range(len(self.view))
+        return [self.row(position) for position in positions]
+
+    def set_sort(self, key, descending=False):
+        self.sort_key = key
+        self.descending = descending
+        self._rebuild_view()
+
+    def set_filter(self, text):
+        """Show only rows whose path contains text (case-insensitive)."""
+        self.filter_text = text.strip().lower()
+        self._rebuild_view()
+
+    def remove_paths(self, paths):
+        """Drop every row whose path is in paths; returns how many were dropped."""
+        keep = [index for index, path in enumerate(self.paths) if path not in paths]
+        removed = len(self.paths) - len(keep)
+        if removed:
+            self.paths = [self.paths[index] for index in keep]
+            self.sizes = array('d', (self.sizes[index] for index in keep))
+            self.safe = bytearray(self.safe[index] for index in keep)
+            self._rebuild_view()
+        return removed
+
+    def visible_totals(self):
+        """(row count, safe row count, total MB) of the visible rows."""
+        sizes, safe = self.sizes, self.safe
+        return (len(self.view), sum(safe[index] for index in self.view),
+                sum(sizes[index] for index in self.view))
+
+    def _rebuild_view(self):
+        indices = range(len(self.paths))
+        if self.filter_text:
+            needle = self.filter_text
+            indices = [index for index in indices if needle in self.paths[index].lower()]
+        if self.sort_key == 'path':
+            key = lambda index: self.paths[index].lower()
+        elif self.sort_key == 'safe':
+            key = lambda index: (self.safe[index], self.sizes[index])
+        else:
+            key = self.sizes.__getitem__
+        self.view = array('i', sorted(indices, key=key, reverse=self.descending))
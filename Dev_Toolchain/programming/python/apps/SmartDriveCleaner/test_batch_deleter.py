@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for BatchDeleter, the worker pool behind purge, bulk delete and headless cleanup
+These run on any platform; only cleaner_core is imported, so PyQt5 is not needed
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the current directory to Python path to import cleaner_core
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cleaner_core import BatchDeleter
+
+
+class BatchDeleterTestCase(unittest.TestCase):
+    """Creates numbered files in a temporary directory."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='smartdrivecleaner_delete_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_files(self, count, prefix='file'):
+        """Create count files and return their (path, size_mb) items; size_mb is 1 + the file number."""
+        items = []
+        for i in range(count):
+            path = os.path.join(self.test_dir, f'{prefix}_{i}.tmp')
+            with open(path, 'wb') as f:
+                f.write(b'x')
+            items.append((path, 1.0 + i))
+        return items
+
+
+class TestOutcomes(BatchDeleterTestCase):
+
+    def test_deleted_and_missing(self):
+        items = self.make_files(20)
+        missing = [(os.path.join(self.test_dir, f'gone_{i}.tmp'), 50.0) for i in range(3)]
+        summary = BatchDeleter(workers=4, record_outcomes=True).run(items + missing)
+        self.assertEqual((summary.deleted, summary.missing, summary.failed, summary.scheduled), (20, 3, 0, 0))
+        self.assertEqual(summary.done, 23)
+        self.assertAlmostEqual(summary.freed_mb, sum(size for _, size in items))
+        self.assertEqual(summary.outcomes[missing[0][0]], BatchDeleter.MISSING)
+        self.assertFalse(any(os.path.exists(path) for path, _ in items))
+
+    def test_refused_files_are_failed_or_scheduled(self):
+        items = self.make_files(6)
+        refused = {path for path, _ in items[:4]}
+        real_remove = os.remove
+
+        def remove(path):
+            if path in refused:
+                raise PermissionError(13, 'Access is denied', path)
+            real_remove(path)
+
+        scheduled = []
+
+        def schedule(path):
+            scheduled.append(path)
+            return path == items[0][0]
+
+        with patch('cleaner_core.os.remove', side_effect=remove):
+            summary = BatchDeleter(workers=3, schedule_on_reboot=schedule, record_outcomes=True).run(items)
+        self.assertEqual(sorted(scheduled), sorted(refused))
+        self.assertEqual((summary.deleted, summary.scheduled, summary.failed), (2, 1, 3))
+        self.assertEqual(sorted(summary.failed_paths), sorted(path for path, _ in items[1:4]))
+        # Deleted and scheduled files free their size; failed ones do not
+        self.assertAlmostEqual(summary.freed_mb, items[0][1] + items[4][1] + items[5][1])
+        self.assertEqual(summary.outcomes[items[0][0]], BatchDeleter.SCHEDULED)
+
+    def test_without_reboot_scheduling_refusals_fail(self):
+        items = self.make_files(2)
+        with patch('cleaner_core.os.remove', side_effect=PermissionError(13, 'Access is denied')):
+            summary = BatchDeleter(workers=2).run(items)
+        self.assertEqual((summary.failed, summary.freed_mb), (2, 0.0))
+        self.assertIsNone(summary.outcomes)
+
+    def test_on_result_is_called_once_per_item(self):
+        items = self.make_files(30)
+        results = []
+        BatchDeleter(workers=8).run(items, on_result=lambda path, size_mb, outcome: results.append(path))
+        self.assertEqual(sorted(results), sorted(path for path, _ in items))
+
+
+class TestSources(BatchDeleterTestCase):
+
+    def test_generator_source(self):
+        items = self.make_files(40)
+        taken = []
+
+        def walk():
+            for item in items:
+                taken.append(item)
+                yield item
+
+        summary = BatchDeleter(workers=6).run(walk())
+        self.assertEqual(summary.deleted, 40)
+        self.assertEqual(len(taken), 40)
+
+    def test_should_stop_leaves_untaken_items_alone(self):
+        items = self.make_files(50)
+        stop = threading.Event()
+        taken = []
+
+        def walk():
+            for item in items:
+                if len(taken) == 10:
+                    stop.set()
+                taken.append(item)
+                yield item
+
+        summary = BatchDeleter(workers=1, should_stop=stop.is_set).run(walk())
+        # The item taken as the flag went up is still deleted; nothing after it is touched
+        self.assertEqual((summary.deleted, len(taken)), (11, 11))
+        self.assertEqual(sum(os.path.exists(path) for path, _ in items), 39)
+
+    def test_failing_source_is_counted_and_ends_the_run(self):
+        items = self.make_files(5)
+
+        def walk():
+            yield from items[:3]
+            raise OSError('drive went away')
+
+        summary = BatchDeleter(workers=4).run(walk())
+        self.assertEqual((summary.deleted, summary.failed), (3, 1))
+        self.assertIsInstance(summary.source_error, OSError)
+        self.assertTrue(all(os.path.exists(path) for path, _ in items[3:]))
+
+    def test_failing_iterator_is_not_asked_again(self):
+        calls = []
+
+        class Broken:
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                calls.append(1)
+                raise RuntimeError('bad source')
+
+        summary = BatchDeleter(workers=8).run(Broken())
+        self.assertEqual((summary.failed, len(calls)), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent scan cache and the scans that reuse it
+These run on any platform; only cleaner_core is imported, so PyQt5 is not needed
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+# Add the current directory to Python path to import cleaner_core
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cleaner_core import SafeDeleteRules, ScanCache, TopFilesScan
+
+
+def write_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def is_safe(path, size):
+    """Test classifier; SafeDeleteRules would treat everything under /tmp as safe."""
+    return os.path.splitext(path)[1] in ('.tmp', '.log') or os.sep + 'cache' + os.sep in path
+
+
+class LockedCache(ScanCache):
+    """Cache whose database is always locked by another writer."""
+
+    def get(self, directory, mtime_ns):
+        raise sqlite3.OperationalError('database is locked')
+
+    def put(self, directory, mtime_ns, scanned_at, subdirs, files):
+        raise sqlite3.OperationalError('database is locked')
+
+
+def backdate(directory, seconds=60):
+    """Move a directory mtime back so its listing is outside the racy window."""
+    stamp = time.time() - seconds
+    os.utime(directory, (stamp, stamp))
+
+
+def age_tree(root, seconds=60):
+    """Backdate every directory below root."""
+    for directory, _, _ in os.walk(root):
+        backdate(directory, seconds)
+
+
+class ScanCacheTestCase(unittest.TestCase):
+    """Builds a small tree and scans it with and without the cache."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='smartdrivecleaner_cache_test_')
+        self.root = os.path.join(self.test_dir, 'drive')
+        self.db_path = os.path.join(self.test_dir, 'cache', 'scan_cache.db')
+        write_file(os.path.join(self.root, 'big.bin'), 5000)
+        write_file(os.path.join(self.root, 'notes.log'), 300)
+        write_file(os.path.join(self.root, 'app', 'data.bin'), 4000)
+        write_file(os.path.join(self.root, 'app', 'cache', 'blob.bin'), 2000)
+        write_file(os.path.join(self.root, 'app', 'cache', 'deep', 'old.tmp'), 1000)
+        write_file(os.path.join(self.root, 'python', 'skip.tmp'), 9000)
+        age_tree(self.root)
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def open_cache(self, signature=None, max_age=None):
+        cache = ScanCache(self.db_path, 'test rules' if signature is None else signature, max_age)
+        self.caches.append(cache)
+        return cache
+
+    def scan(self, cache=None, include_all=True, limit=100):
+        scan = TopFilesScan(self.root, is_safe, ['python'], limit=limit, include_all=include_all, workers=3, cache=cache)
+        return scan, scan.run()
+
+    def paths(self, result):
+        return [os.path.relpath(path, self.root) for path, _, _ in result]
+
+
+class TestScanCacheReuse(ScanCacheTestCase):
+
+    def test_cold_and_warm_scans_match_uncached_scan(self):
+        _, expected = self.scan()
+        cache = self.open_cache()
+        cold_scan, cold = self.scan(cache)
+        warm_scan, warm = self.scan(cache)
+        self.assertEqual(cold, expected)
+        self.assertEqual(warm, expected)
+        self.assertEqual(cold_scan.directories_reused, 0)
+        self.assertEqual(warm_scan.directories_reused, warm_scan.directories_scanned)
+        self.assertEqual(warm_scan.files_seen, cold_scan.files_seen)
+
+    def test_safe_only_and_top_k_from_cache(self):
+        cache = self.open_cache()
+        self.scan(cache)
+        _, expected = self.scan(include_all=False, limit=2)
+        _, cached = self.scan(cache, include_all=False, limit=2)
+        self.assertEqual(cached, expected)
+        self.assertEqual(self.paths(cached), [os.path.join('app', 'cache', 'blob.bin'),
+                                              os.path.join('app', 'cache', 'deep', 'old.tmp')])
+
+    def test_cache_survives_reopening(self):
+        self.scan(self.open_cache())
+        self.caches.pop().close()
+        scan, _ = self.scan(self.open_cache())
+        self.assertEqual(scan.directories_reused, scan.directories_scanned)
+
+    def test_subtotals_are_recorded(self):
+        cache = self.open_cache()
+        self.scan(cache)
+        self.assertEqual(cache.subtotal(self.root), (2, 5300, 1, 300))
+        self.assertEqual(cache.subtotal(os.path.join(self.root, 'app', 'cache')), (1, 2000, 1, 2000))
+        self.assertIsNone(cache.subtotal(os.path.join(self.root, 'python')))
+
+
+class TestScanErrors(ScanCacheTestCase):
+
+    def run_with_timeout(self, scan):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(scan.run()), daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive(), 'scan did not finish')
+        return result[0]
+
+    def test_locked_cache_falls_back_to_listing(self):
+        _, expected = self.scan()
+        cache = LockedCache(self.db_path, 'test rules')
+        self.caches.append(cache)
+        scan = TopFilesScan(self.root, is_safe, ['python'], limit=100, include_all=True, workers=3, cache=cache)
+        self.assertEqual(self.run_with_timeout(scan), expected)
+        self.assertEqual(scan.errors, 0)
+        self.assertEqual(scan.cache_errors, 2 * scan.directories_scanned)
+
+    def test_classifier_error_does_not_stall_the_scan(self):
+        def classify(path, size):
+            if path.endswith('data.bin'):
+                raise ValueError('bad rule')
+            return is_safe(path, size)
+
+        scan = TopFilesScan(self.root, classify, ['python'], limit=100, include_all=True, workers=3)
+        result = self.run_with_timeout(scan)
+        self.assertEqual(scan.errors, 1)
+        self.assertIn('big.bin', self.paths(result))
+
+
+class TestScanCacheInvalidation(ScanCacheTestCase):
+
+    def test_added_file_relists_only_its_directory(self):
+        cache = self.open_cache()
+        self.scan(cache)
+        write_file(os.path.join(self.root, 'app', 'new.bin'), 7000)
+        backdate(os.path.join(self.root, 'app'), 30)
+        scan, result = self.scan(cache)
+        self.assertEqual(self.paths(result)[0], os.path.join('app', 'new.bin'))
+        self.assertEqual(scan.directories_reused, scan.directories_scanned - 1)
+        _, expected = self.scan()
+        self.assertEqual(result, expected)
+
+    def test_removed_file_is_dropped(self):
+        cache = self.open_cache()
+        self.scan(cache)
+        os.remove(os.path.join(self.root, 'big.bin'))
+        backdate(self.root, 30)
+        _, result = self.scan(cache)
+        self.assertNotIn('big.bin', self.paths(result))
+        self.assertEqual(cache.subtotal(self.root), (1, 300, 1, 300))
+
+    def test_removed_subtree_rows_are_deleted(self):
+        cache = self.open_cache()
+        self.scan(cache)
+        self.assertEqual(len(cache), 4)
+        shutil.rmtree(os.path.join(self.root, 'app', 'cache'))
+        backdate(os.path.join(self.root, 'app'), 30)
+        _, result = self.scan(cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.subtotal(os.path.join(self.root, 'app', 'cache', 'deep')))
+        self.assertEqual(sorted(self.paths(result)),
+                         sorted(['big.bin', 'notes.log', os.path.join('app', 'data.bin')]))
+
+    def test_recently_modified_directory_is_not_trusted(self):
+        cache = self.open_cache()
+        now = time.time()
+        os.utime(self.root, (now, now))
+        self.scan(cache)
+        scan, _ = self.scan(cache)
+        self.assertEqual(scan.directories_reused, scan.directories_scanned - 1)
+
+    def test_entries_older_than_max_age_are_relisted(self):
+        self.scan(self.open_cache())
+        self.caches.pop().close()
+        cache = self.open_cache(max_age=0)
+        time.sleep(0.01)
+        scan, _ = self.scan(cache)
+        self.assertEqual(scan.directories_reused, 0)
+        self.assertEqual(cache.misses, scan.directories_scanned)
+
+    def test_changed_signature_clears_cache(self):
+        self.scan(self.open_cache())
+        self.caches.pop().close()
+        cache = self.open_cache(signature='other rules')
+        self.assertEqual(len(cache), 0)
+        scan, _ = self.scan(cache)
+        self.assertEqual(scan.directories_reused, 0)
+
+    def test_rule_signature_tracks_rule_settings(self):
+        rules = SafeDeleteRules({'.tmp', '.log'}, {'cache'}, large_file_mb=None)
+        self.assertEqual(rules.signature, SafeDeleteRules({'.log', '.tmp'}, {'cache'}, large_file_mb=None).signature)
+        self.assertNotEqual(rules.signature, SafeDeleteRules({'.tmp', '.log'}, {'cache'}, large_file_mb=100).signature)
+        self.assertNotEqual(rules.signature, SafeDeleteRules({'.tmp', '.log'}, {'cache', 'temp'}).signature)
+        self.assertNotEqual(rules.signature,
+                            SafeDeleteRules({'.tmp', '.log'}, {'cache'}, large_file_mb=None, system_paths=True).signature)
+
+    def test_system_temp_paths_are_opt_in(self):
+        path = 'C:\\Windows\\SoftwareDistribution\\DataStore\\DataStore.edb'
+        self.assertIsNone(SafeDeleteRules({'.tmp'}, {'cache'}, large_file_mb=None).match(path))
+        self.assertEqual(SafeDeleteRules({'.tmp'}, {'cache'}, large_file_mb=None, system_paths=True).match(path),
+                         'path:\\windows\\softwaredistribution\\')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ScanResults, the sorted and filtered view behind the results table
+These run on any platform; only cleaner_core is imported, so PyQt5 is not needed
+"""
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path to import cleaner_core
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cleaner_core import ScanResults
+
+FILES = [
+    (r'C:\Temp\b.tmp', 5.0, True),
+    (r'C:\Users\me\Videos\Movie.mkv', 900.0, False),
+    (r'C:\Temp\A.log', 0.5, True),
+    (r'C:\Users\me\Downloads\setup.exe', 120.0, False),
+    (r'C:\Temp\cache\c.tmp', 120.0, True),
+]
+
+
+class ScanResultsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.results = ScanResults(FILES)
+
+    def visible_paths(self):
+        return [path for path, _, _ in self.results.rows()]
+
+
+class TestSort(ScanResultsTestCase):
+
+    def test_default_is_largest_first(self):
+        self.assertEqual([size for _, size, _ in self.results.rows()], [900.0, 120.0, 120.0, 5.0, 0.5])
+
+    def test_size(self):
+        self.results.set_sort('size')
+        self.assertEqual([size for _, size, _ in self.results.rows()], [0.5, 5.0, 120.0, 120.0, 900.0])
+        self.results.set_sort('size', descending=True)
+        self.assertEqual(self.visible_paths()[0], r'C:\Users\me\Videos\Movie.mkv')
+
+    def test_path_ignores_case(self):
+        self.results.set_sort('path')
+        self.assertEqual(self.visible_paths(), [r'C:\Temp\A.log', r'C:\Temp\b.tmp', r'C:\Temp\cache\c.tmp',
+                                                r'C:\Users\me\Downloads\setup.exe', r'C:\Users\me\Videos\Movie.mkv'])
+        self.results.set_sort('path', descending=True)
+        self.assertEqual(self.visible_paths()[0], r'C:\Users\me\Videos\Movie.mkv')
+
+    def test_safe_then_size(self):
+        self.results.set_sort('safe')
+        self.assertEqual(self.visible_paths(), [r'C:\Users\me\Downloads\setup.exe', r'C:\Users\me\Videos\Movie.mkv',
+                                                r'C:\Temp\A.log', r'C:\Temp\b.tmp', r'C:\Temp\cache\c.tmp'])
+        self.results.set_sort('safe', descending=True)
+        self.assertEqual(self.visible_paths()[:3], [r'C:\Temp\cache\c.tmp', r'C:\Temp\b.tmp', r'C:\Temp\A.log'])
+
+    def test_row_positions_follow_the_view(self):
+        self.results.set_sort('path')
+        self.assertEqual(self.results.row(0), (r'C:\Temp\A.log', 0.5, True))
+        self.assertEqual(self.results.rows([4, 1]), [(r'C:\Users\me\Videos\Movie.mkv', 900.0, False),
+                                                     (r'C:\Temp\b.tmp', 5.0, True)])
+
+    def test_set_files_keeps_sort_and_filter(self):
+        self.results.set_sort('path')
+        self.results.set_filter('temp')
+        self.results.set_files(FILES + [(r'C:\Temp\0.tmp', 1.0, True), (r'D:\other.bin', 2.0, False)])
+        self.assertEqual(self.visible_paths(), [r'C:\Temp\0.tmp', r'C:\Temp\A.log', r'C:\Temp\b.tmp',
+                                                r'C:\Temp\cache\c.tmp'])
+        self.assertEqual(self.results.total_count, 7)
+
+
+class TestFilter(ScanResultsTestCase):
+
+    def test_filter_is_case_insensitive_substring(self):
+        self.results.set_filter('  TEMP\\C ')
+        self.assertEqual(self.visible_paths(), [r'C:\Temp\cache\c.tmp'])
+        self.assertEqual(len(self.results), 1)
+        self.assertEqual(self.results.total_count, 5)
+
+    def test_visible_totals(self):
+        self.assertEqual(self.results.visible_totals(), (5, 3, 1145.5))
+        self.results.set_filter('.tmp')
+        self.assertEqual(self.results.visible_totals(), (2, 2, 125.0))
+        self.results.set_filter('nothing matches')
+        self.assertEqual(self.results.visible_totals(), (0, 0, 0))
+        self.results.set_filter('')
+        self.assertEqual(len(self.results), 5)
+
+
+class TestRemove(ScanResultsTestCase):
+
+    def test_remove_with_filter_active(self):
+        self.results.set_filter('temp')
+        removed = self.results.remove_paths({r'C:\Temp\b.tmp', r'C:\Users\me\Videos\Movie.mkv', r'C:\missing'})
+        # Hidden rows are removed too; the filter still applies to what is left
+        self.assertEqual(removed, 2)
+        self.assertEqual(self.visible_paths(), [r'C:\Temp\cache\c.tmp', r'C:\Temp\A.log'])
+        self.assertEqual(self.results.visible_totals(), (2, 2, 120.5))
+        self.assertEqual(self.results.total_count, 3)
+        self.results.set_filter('')
+        # Equal sizes keep their stored order
+        self.assertEqual(self.visible_paths(), [r'C:\Users\me\Downloads\setup.exe', r'C:\Temp\cache\c.tmp',
+                                                r'C:\Temp\A.log'])
+
+    def test_removing_nothing_keeps_the_view(self):
+        view = self.results.view
+        self.assertEqual(self.results.remove_paths(set()), 0)
+        self.assertIs(self.results.view, view)
+
+
+if __name__ == '__main__':
+    unittest.main()
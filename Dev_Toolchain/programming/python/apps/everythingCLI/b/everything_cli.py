@@ -5,15 +5,16 @@ Shows all files and folders sorted by size with interactive delete functionality
 """
 
 import os
+import re
 import sys
 import time
 import shutil
-import threading
 import concurrent.futures
 from pathlib import Path
 from typing import List, Tuple, Optional
 import argparse
 from collections import defaultdict
+from array import array
 
 try:
     import keyboard
@@ -22,6 +23,75 @@ except ImportError:
     KEYBOARD_AVAILABLE = False
     print("Warning: 'keyboard' module not found. Install with: pip install keyboard")
 
+class ExclusionMatcher:
+    """Path and file-name exclusion lists, each compiled into one regular expression"""
+    
+    # Common exclusion patterns, matched anywhere in the lowercased path
+    PATH_PATTERNS = [
+        # WSL2 related
+        'wsl', 'wsl2', 'wslg', '\\wsl$', '\\wsl.localhost',
+        
+        # Docker related
+        'docker', 'docker desktop', 'dockerfile', 'docker-compose',
+        
+        # .NET related
+        '.net', 'dotnet', 'microsoft.net',
+        
+        # NVIDIA related
+        'nvidia', 'nvidiagfe', 'nvidia corporation',
+        
+        # Windows system directories
+        'windows', 'program files', 'program files (x86)', 
+        'system volume information', '$recycle.bin',
+        'boot', 'efi', 'intel', 'amd', 'microsoft',
+        'appdata', 'local settings', 'temporary internet files'
+    ]
+    
+    # File patterns to exclude, matched anywhere in the lowercased name
+    FILE_PATTERNS = [
+        # WSL2 related
+        'wsl.exe', 'wslhost.exe', 'wslbridge.exe',
+        
+        # Docker related
+        'docker.exe', 'dockerd.exe', 'docker-compose.exe',
+        
+        # .NET related
+        '.net', 'dotnet.exe', 'mscor', '.dll', '.pdb',
+        
+        # NVIDIA related
+        'nvidia', 'nv', 'gpu',
+        
+        # Windows system files
+        '.sys', '.drv', 'pagefile.sys', 'hiberfil.sys', 'swapfile.sys',
+        'bootmgr', 'ntldr', 'ntdetect.com', 'bcdedit.exe'
+    ]
+    
+    def __init__(self, path_patterns: List[str] = PATH_PATTERNS, file_patterns: List[str] = FILE_PATTERNS):
+        self.path_re = re.compile('|'.join(map(re.escape, path_patterns)))
+        self.file_re = re.compile('|'.join(map(re.escape, file_patterns)))
+        # A path pattern that reaches into a name starts at most this far before it
+        self.context = max(map(len, path_patterns)) - 1
+    
+    def excludes(self, path: str) -> bool:
+        """Check a full path"""
+        path_lower = path.lower()
+        return bool(self.path_re.search(path_lower) or self.file_re.search(os.path.basename(path_lower)))
+    
+    def tail(self, directory: str) -> str:
+        """Lowercased end of a directory path, joined so a child name can be appended"""
+        return os.path.join(directory, '').lower()[-self.context:]
+    
+    def excludes_child(self, tail: str, name: str) -> bool:
+        """Same answer as excludes() for an entry of a directory that is itself not excluded
+        
+        Only the directory's tail is searched along with the name, instead of
+        the whole path once per pattern.
+        """
+        name_lower = name.lower()
+        return bool(self.file_re.search(name_lower) or self.path_re.search(tail + name_lower))
+
+DEFAULT_EXCLUSIONS = ExclusionMatcher()
+
 class FileEntry:
     def __init__(self, path: str, size: int, is_dir: bool = False, size_calculated: bool = True):
         self.path = path
@@ -37,61 +107,7 @@ class FileEntry:
     
     def should_exclude_path(self, path: str) -> bool:
         """Check if a path should be excluded based on filters"""
-        # These are basic exclusions that can be checked at the FileEntry level
-        path_lower = path.lower()
-        
-        # Common exclusion patterns
-        exclude_patterns = [
-            # WSL2 related
-            'wsl', 'wsl2', 'wslg', '\\wsl$', '\\wsl.localhost',
-            
-            # Docker related
-            'docker', 'docker desktop', 'dockerfile', 'docker-compose',
-            
-            # .NET related
-            '.net', 'dotnet', 'microsoft.net',
-            
-            # NVIDIA related
-            'nvidia', 'nvidiagfe', 'nvidia corporation',
-            
-            # Windows system directories
-            'windows', 'program files', 'program files (x86)', 
-            'system volume information', '$recycle.bin',
-            'boot', 'efi', 'intel', 'amd', 'microsoft',
-            'appdata', 'local settings', 'temporary internet files'
-        ]
-        
-        # File patterns to exclude
-        exclude_files = [
-            # WSL2 related
-            'wsl.exe', 'wslhost.exe', 'wslbridge.exe',
-            
-            # Docker related
-            'docker.exe', 'dockerd.exe', 'docker-compose.exe',
-            
-            # .NET related
-            '.net', 'dotnet.exe', 'mscor', '.dll', '.pdb',
-            
-            # NVIDIA related
-            'nvidia', 'nv', 'gpu',
-            
-            # Windows system files
-            '.sys', '.drv', 'pagefile.sys', 'hiberfil.sys', 'swapfile.sys',
-            'bootmgr', 'ntldr', 'ntdetect.com', 'bcdedit.exe'
-        ]
-        
-        # Check directory exclusions
-        for exclude_pattern in exclude_patterns:
-            if exclude_pattern in path_lower:
-                return True
-                
-        # Check file exclusions
-        filename = os.path.basename(path_lower)
-        for exclude_file in exclude_files:
-            if exclude_file in filename:
-                return True
-                
-        return False
+        return DEFAULT_EXCLUSIONS.excludes(path)
     
     def is_safe_to_delete(self) -> bool:
         """Determine if a file/directory is safe to delete"""
@@ -159,10 +175,130 @@ class FileEntry:
             size /= 1024.0
         return f"{size:6.1f}PB"
 
+class EntryStore:
+    """Column-oriented table of scanned entries, read in size order through an index array
+    
+    Entry i is parents[i] (index of its directory, -1 for the scan root),
+    names[i] (one shared string per distinct name), sizes[i] and flags[i].
+    Paths are rebuilt from the parent chain only for rows that are shown, and
+    rank r in size order is entry order[r], so indexing the store by rank
+    yields a FileEntry view.
+    """
+    
+    DIR = 1
+    DELETED = 2
+    
+    def __init__(self, root_path: str = ""):
+        self.root_path = root_path
+        self.root_size = 0
+        self.parents = array('i')
+        self.names: List[str] = []
+        self.sizes = array('q')
+        self.flags = bytearray()
+        self.order = array('i')
+        self._interned = {}
+    
+    def add(self, parent: int, name: str, size: int, is_dir: bool) -> int:
+        """Append an entry below parent (-1 for the root) and return its index"""
+        self.parents.append(parent)
+        self.names.append(self._interned.setdefault(name, name))
+        self.sizes.append(size)
+        self.flags.append(self.DIR if is_dir else 0)
+        return len(self.sizes) - 1
+    
+    def add_size(self, index: int, size: int) -> None:
+        """Count bytes that have no entry of their own (e.g. filtered files) towards a directory"""
+        if index < 0:
+            self.root_size += size
+        else:
+            self.sizes[index] += size
+    
+    def path(self, index: int) -> str:
+        parts = []
+        while index >= 0:
+            parts.append(self.names[index])
+            index = self.parents[index]
+        return os.path.join(self.root_path, *reversed(parts))
+    
+    def finish(self) -> None:
+        """Roll every size up into its directories in one post-order pass, then sort
+        
+        A directory is always added before anything inside it, so walking the
+        entries backwards visits each directory after all its descendants.
+        """
+        self._interned = {}  # Only needed while adding; the names list keeps one copy of each
+        parents, sizes = self.parents, self.sizes
+        for index in range(len(sizes) - 1, -1, -1):
+            parent = parents[index]
+            if parent >= 0:
+                sizes[parent] += sizes[index]
+            else:
+                self.root_size += sizes[index]
+        self.sort()
+    
+    def sort(self) -> None:
+        """Rebuild the size order (largest first) from the columns, without touching the disk"""
+        flags = self.flags
+        live = [index for index in range(len(self.sizes)) if not flags[index] & self.DELETED]
+        live.sort(key=self.sizes.__getitem__, reverse=True)
+        self.order = array('i', live)
+    
+    def _insert_in_order(self, index: int) -> None:
+        """Put an entry back into the size order where sort() would place it"""
+        order, sizes = self.order, self.sizes
+        key = (-sizes[index], index)
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            other = order[middle]
+            if (-sizes[other], other) < key:
+                low = middle + 1
+            else:
+                high = middle
+        order.insert(low, index)
+    
+    def remove(self, rank: int) -> None:
+        """Drop the entry at rank and everything below it, taking its size off every parent"""
+        index = self.order[rank]
+        parents, sizes, flags = self.parents, self.sizes, self.flags
+        size = sizes[index]
+        ancestors = []
+        parent = parents[index]
+        while parent >= 0:
+            sizes[parent] -= size
+            ancestors.append(parent)
+            parent = parents[parent]
+        self.root_size -= size
+        flags[index] |= self.DELETED
+        if flags[index] & self.DIR:
+            # Descendants come after their directory, so one forward pass reaches them all
+            for child in range(index + 1, len(sizes)):
+                parent = parents[child]
+                if parent >= 0 and flags[parent] & self.DELETED:
+                    flags[child] |= self.DELETED
+        # Only the ancestors changed size: filter out them and the removed entries, then re-place the ancestors
+        moved = set(ancestors)
+        self.order = array('i', [entry for entry in self.order if not flags[entry] & self.DELETED and entry not in moved])
+        for ancestor in ancestors:
+            self._insert_in_order(ancestor)
+    
+    def children(self, rank: int) -> List[FileEntry]:
+        """Entries directly inside the entry at rank, largest first"""
+        index = self.order[rank]
+        parents = self.parents
+        return [self[position] for position, child in enumerate(self.order) if parents[child] == index]
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def __getitem__(self, rank: int) -> FileEntry:
+        index = self.order[rank]
+        return FileEntry(self.path(index), self.sizes[index], bool(self.flags[index] & self.DIR))
+
 class EverythingCLI:
     def __init__(self, root_path: str = None):
         self.root_path = root_path or "C:\\"
-        self.files: List[FileEntry] = []
+        self.files = EntryStore(self.root_path)
         self.current_index = 0
         self.display_offset = 0
         self.lines_per_page = 1000  # Show up to 1000 items
@@ -171,33 +307,23 @@ class EverythingCLI:
         self.max_workers = min(32, os.cpu_count() + 4)  # Optimized thread count
         self.min_file_size = 0  # Filter files smaller than this (bytes)
         self.file_extensions = None  # Filter by extensions if set
+        self.exclusions = DEFAULT_EXCLUSIONS
         
-    def get_directory_size_fast(self, path: str) -> int:
-        """Fast directory size calculation using scandir"""
-        total = 0
-        try:
-            with os.scandir(path) as entries:
-                for entry in entries:
-                    try:
-                        if entry.is_file(follow_symlinks=False):
-                            total += entry.stat().st_size
-                        elif entry.is_dir(follow_symlinks=False):
-                            total += self.get_directory_size_fast(entry.path)
-                    except (OSError, IOError):
-                        continue
-        except (OSError, IOError):
-            pass
-        return total
-    
-    def scan_directory_chunk(self, scan_path: str) -> List[FileEntry]:
-        """Scan a directory chunk and return FileEntry objects"""
-        entries = []
+    def scan_directory_chunk(self, index: int, scan_path: str) -> Tuple[int, str, list, int]:
+        """List one directory; returns (its index, its path, (name, size, is_dir) records, hidden bytes)
+        
+        Files dropped by the size or extension filters are not recorded but
+        still count towards the directory's size, so folder totals stay exact.
+        """
+        records = []
+        hidden_size = 0
+        tail = self.exclusions.tail(scan_path)
         try:
             with os.scandir(scan_path) as dir_entries:
                 for entry in dir_entries:
                     try:
                         # Skip excluded paths
-                        if FileEntry("", 0).should_exclude_path(entry.path):
+                        if self.exclusions.excludes_child(tail, entry.name):
                             continue
                             
                         if entry.is_file(follow_symlinks=False):
@@ -206,22 +332,21 @@ class EverythingCLI:
                             
                             # Apply size filter
                             if file_size < self.min_file_size:
+                                hidden_size += file_size
                                 continue
                                 
                             # Apply extension filter
                             if self.file_extensions:
                                 _, ext = os.path.splitext(entry.name)
                                 if ext.lower() not in self.file_extensions:
+                                    hidden_size += file_size
                                     continue
                             
-                            entries.append(FileEntry(entry.path, file_size, False))
+                            records.append((entry.name, file_size, False))
                             
                         elif entry.is_dir(follow_symlinks=False):
-                            # Skip excluded directories
-                            if FileEntry("", 0).should_exclude_path(entry.path):
-                                continue
-                            # For directories, add with lazy size calculation
-                            entries.append(FileEntry(entry.path, 0, True, False))
+                            # Size is filled in by EntryStore.finish once the whole tree is listed
+                            records.append((entry.name, 0, True))
                             
                     except (OSError, IOError):
                         continue
@@ -229,66 +354,58 @@ class EverythingCLI:
         except (OSError, IOError, PermissionError):
             pass
             
-        return entries
-    
-    def calculate_dir_size_lazy(self, file_entry: FileEntry) -> None:
-        """Calculate directory size on demand"""
-        if file_entry.is_dir and not file_entry.size_calculated:
-            file_entry.size = self.get_directory_size_fast(file_entry.path)
-            file_entry.size_calculated = True
+        return index, scan_path, records, hidden_size
     
     def scan_files(self, path: str = None) -> None:
-        """Fast multi-threaded file scanning"""
+        """Fast multi-threaded file scanning
+        
+        Every directory is listed exactly once: subdirectories are queued as
+        they are found, and folder sizes come from the in-memory tree afterwards.
+        """
         if path is None:
             # Limit to C drive only
             path = "C:\\" if os.name == 'nt' else "/"
             
         self.scanning = True
-        self.files.clear()
+        self.files = EntryStore(path)
+        self.current_index = 0
         
         print(f"Fast scanning from: {path}")
         print("Using multithreaded scanning for better performance...")
         
-        directories_to_scan = []
         scanned_count = 0
+        pending = set()
         
         try:
             # Only scan C drive
-            scan_paths = [path]
-            
-            # Build directory list for parallel processing
-            for scan_path in scan_paths:
-                for root, dirs, files in os.walk(scan_path):
-                    # Skip excluded directories
-                    if FileEntry("", 0).should_exclude_path(root):
-                        continue
-                    directories_to_scan.append(root)
-                    if len(directories_to_scan) % 1000 == 0:
-                        print(f"\rMapping directories: {len(directories_to_scan)}", end='', flush=True)
-            
-            print(f"\rFound {len(directories_to_scan)} directories to scan")
-            
-            # Process directories in parallel
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_dir = {
-                    executor.submit(self.scan_directory_chunk, dir_path): dir_path 
-                    for dir_path in directories_to_scan
-                }
-                
-                # Collect results as they complete
-                for future in concurrent.futures.as_completed(future_to_dir):
-                    try:
-                        entries = future.result()
-                        self.files.extend(entries)
-                        scanned_count += len(entries)
-                        
-                        if scanned_count % 500 == 0:
-                            print(f"\rProcessed {scanned_count} items...", end='', flush=True)
+                pending.add(executor.submit(self.scan_directory_chunk, -1, path))
+                try:
+                    # Collect results as they complete; only this thread writes to the store
+                    while pending:
+                        done, pending = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            try:
+                                index, scan_path, records, hidden_size = future.result()
+                            except Exception:
+                                # Skip problematic directories
+                                continue
+                            self.files.add_size(index, hidden_size)
+                            for name, size, is_dir in records:
+                                child = self.files.add(index, name, size, is_dir)
+                                if is_dir:
+                                    pending.add(executor.submit(
+                                        self.scan_directory_chunk, child, os.path.join(scan_path, name)))
                             
-                    except Exception as e:
-                        # Skip problematic directories
-                        continue
+                            previous = scanned_count
+                            scanned_count += len(records)
+                            if scanned_count // 500 != previous // 500:
+                                print(f"\rProcessed {scanned_count} items...", end='', flush=True)
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
                         
         except KeyboardInterrupt:
             print("\nScan interrupted by user")
@@ -297,22 +414,14 @@ class EverythingCLI:
         
         print(f"\nProcessing results...")
         
-        # Sort files by size (files with calculated sizes first, then by size)
-        def sort_key(x):
-            if x.size_calculated:
-                return (0, -x.size)  # Calculated sizes first, largest first
-            else:
-                return (1, 0)  # Uncalculated sizes last
-        
-        self.files.sort(key=sort_key)
+        self.files.finish()
         self.scanning = False
         
-        print(f"Fast scan complete! Found {len(self.files)} items.")
-        print("Directory sizes will be calculated on-demand for better performance")
+        print(f"Fast scan complete! Found {len(self.files)} items ({FileEntry.format_size(self.files.root_size).strip()} total).")
         print("Navigation: Up/Down arrows, 'd'=delete, 'q'=quit, 'r'=rescan")
 
     def display_files(self) -> None:
-        """Display current page of files with lazy size calculation"""
+        """Display current page of files"""
         os.system('cls' if os.name == 'nt' else 'clear')
         
         print("=" * 80)
@@ -320,7 +429,7 @@ class EverythingCLI:
         print("=" * 80)
         print(f"Total items: {len(self.files)} | Current: {self.current_index + 1}")
         print(f"Threads: {self.max_workers} | Min size: {FileEntry.format_size(self.min_file_size)}")
-        print("Navigation: Up/Down arrows, 'd'=delete, 'q'=quit, 'r'=rescan, 'c'=calc dir")
+        print("Navigation: Up/Down arrows, 'd'=delete, 'q'=quit, 'r'=rescan, 'c'=dir contents")
         print("NOTE: Files shown in GREEN are safe to delete")
         print("-" * 80)
         
@@ -335,33 +444,17 @@ class EverythingCLI:
             marker = ">" if i == self.current_index else " "
             delete_btn = "[DEL]" if i == self.current_index else "     "
             
-            # Check if file is safe to delete
             file_entry = self.files[i]
             
-            # Calculate directory size on demand for visible entries
-            if (file_entry.is_dir and not file_entry.size_calculated and 
-                i == self.current_index):
-                # Check if file is safe to delete
-                is_safe = file_entry.is_safe_to_delete()
-                
-                # Display in green if safe
-                if is_safe:
-                    # ANSI escape code for green text
-                    print(f"{marker} {delete_btn} \033[92m[DIR ]  CALC...  | {file_entry.path} (calculating...)\033[0m")
-                else:
-                    print(f"{marker} {delete_btn} [DIR ]  CALC...  | {file_entry.path} (calculating...)")
-                threading.Thread(target=self.calculate_dir_size_lazy, 
-                               args=(file_entry,), daemon=True).start()
+            # Check if file is safe to delete
+            is_safe = file_entry.is_safe_to_delete()
+            
+            # Display in green if safe
+            if is_safe:
+                # ANSI escape code for green text
+                print(f"{marker} {delete_btn} \033[92m{file_entry}\033[0m")
             else:
-                # Check if file is safe to delete
-                is_safe = file_entry.is_safe_to_delete()
-                
-                # Display in green if safe
-                if is_safe:
-                    # ANSI escape code for green text
-                    print(f"{marker} {delete_btn} \033[92m{file_entry}\033[0m")
-                else:
-                    print(f"{marker} {delete_btn} {file_entry}")
+                print(f"{marker} {delete_btn} {file_entry}")
         
         if display_count < len(self.files):
             print(f"\n... and {len(self.files) - display_count} more items (showing top 1000) ...")
@@ -381,29 +474,22 @@ class EverythingCLI:
                 self.display_offset = min(len(self.files) - self.lines_per_page, 
                                         self.display_offset + self.lines_per_page)
     
-    def YOUR_CLIENT_SECRET_HEREe(self) -> None:
-        """Calculate size of currently selected directory"""
+    def show_selected_directory(self) -> None:
+        """Show the largest items directly inside the selected directory"""
         if (self.files and self.current_index < len(self.files) and 
             self.files[self.current_index].is_dir):
             
             selected = self.files[self.current_index]
-            if not selected.size_calculated:
-                print("\nCalculating directory size...")
-                self.calculate_dir_size_lazy(selected)
-                # Re-sort after size calculation
-                self.resort_files()
-                print("Directory size calculated!")
-                input("Press Enter to continue...")
+            # Sizes are already exact, so this only walks the in-memory columns
+            children = self.files.children(self.current_index)
+            print(f"\n{selected.path}: {FileEntry.format_size(selected.size).strip()} in {len(children)} listed items")
+            for child in children[:20]:
+                print(f"  {child}")
+            input("Press Enter to continue...")
 
     def resort_files(self) -> None:
-        """Re-sort files after size calculations"""
-        def sort_key(x):
-            if x.size_calculated:
-                return (0, -x.size)
-            else:
-                return (1, 0)
-        
-        self.files.sort(key=sort_key)
+        """Re-sort files after size changes (in memory, largest first)"""
+        self.files.sort()
     
     def force_delete_current(self) -> None:
         """Force delete currently selected file/folder"""
@@ -412,11 +498,6 @@ class EverythingCLI:
         
         selected_file = self.files[self.current_index]
         
-        # Calculate size if not done yet
-        if selected_file.is_dir and not selected_file.size_calculated:
-            print("Calculating directory size for deletion confirmation...")
-            self.calculate_dir_size_lazy(selected_file)
-        
         print(f"\n{'='*60}")
         print(f"DELETE CONFIRMATION")
         print(f"{'='*60}")
@@ -441,8 +522,8 @@ class EverythingCLI:
                 os.remove(selected_file.path)
                 print(f"File deleted: {selected_file.path}")
             
-            # Remove from list
-            del self.files[self.current_index]
+            # Remove it and anything inside it, and take its size off every parent directory
+            self.files.remove(self.current_index)
             
             # Adjust current index
             if self.current_index >= len(self.files) and len(self.files) > 0:
@@ -469,7 +550,7 @@ class EverythingCLI:
             if not self.files:
                 action = input("\nAction (r=rescan, q=quit): ").lower().strip()
             else:
-                action = input(f"\nAction (u=up, d=down, del=delete, c=calc dir, r=rescan, q=quit): ").lower().strip()
+                action = input(f"\nAction (u=up, d=down, del=delete, c=dir contents, r=rescan, q=quit): ").lower().strip()
             
             if action == 'q':
                 break
@@ -482,7 +563,7 @@ class EverythingCLI:
             elif action == 'del' and self.files:
                 self.force_delete_current()
             elif action == 'c' and self.files:
-                self.YOUR_CLIENT_SECRET_HEREe()
+                self.show_selected_directory()
 
     def run_interactive(self) -> None:
         """Run with live keyboard input"""
@@ -507,7 +588,7 @@ class EverythingCLI:
                     elif key == 'r':
                         self.scan_files()
                     elif key == 'c' and self.files:
-                        self.YOUR_CLIENT_SECRET_HEREe()
+                        self.show_selected_directory()
                         
             except KeyboardInterrupt:
                 break
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit tests for EntryStore, the column table behind the size-sorted listing
+Entries are added by hand, so no directory tree or keyboard module is needed
+"""
+import os
+import sys
+import random
+import unittest
+
+# Add the current directory to Python path to import everything_cli
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from everything_cli import EntryStore
+
+
+def build_store():
+    """root/
+         docs/ (a.txt 100, b.txt 50, deep/ (c.bin 400))
+         music/ (song.mp3 300)
+         top.log 70
+    """
+    store = EntryStore(os.path.join('data', 'root'))
+    docs = store.add(-1, 'docs', 0, True)
+    store.add(docs, 'a.txt', 100, False)
+    store.add(docs, 'b.txt', 50, False)
+    deep = store.add(docs, 'deep', 0, True)
+    store.add(deep, 'c.bin', 400, False)
+    music = store.add(-1, 'music', 0, True)
+    store.add(music, 'song.mp3', 300, False)
+    store.add(-1, 'top.log', 70, False)
+    store.add_size(music, 30)  # A filtered-out file still counts towards its folder
+    store.finish()
+    return store
+
+
+def listing(store):
+    return [(os.path.relpath(entry.path, store.root_path), entry.size) for entry in store]
+
+
+def rank_of(store, relative):
+    return next(rank for rank, entry in enumerate(store)
+                if os.path.relpath(entry.path, store.root_path) == relative)
+
+
+class TestFinish(unittest.TestCase):
+
+    def test_sizes_roll_up_and_sort(self):
+        store = build_store()
+        self.assertEqual(listing(store), [
+            ('docs', 550), (os.path.join('docs', 'deep'), 400), (os.path.join('docs', 'deep', 'c.bin'), 400),
+            ('music', 330), (os.path.join('music', 'song.mp3'), 300), (os.path.join('docs', 'a.txt'), 100),
+            ('top.log', 70), (os.path.join('docs', 'b.txt'), 50)])
+        self.assertEqual(store.root_size, 550 + 330 + 70)
+        self.assertTrue(store[0].is_dir)
+        self.assertFalse(store[2].is_dir)
+
+    def test_names_are_shared(self):
+        store = EntryStore('root')
+        first = store.add(-1, ''.join(['a', 'b']), 1, False)
+        second = store.add(-1, ''.join(['a', 'b']), 1, False)
+        self.assertIs(store.names[first], store.names[second])
+
+
+class TestChildren(unittest.TestCase):
+
+    def test_direct_children_largest_first(self):
+        store = build_store()
+        self.assertEqual([entry.name for entry in store.children(rank_of(store, 'docs'))], ['deep', 'a.txt', 'b.txt'])
+        self.assertEqual(store.children(rank_of(store, 'top.log')), [])
+
+
+class TestRemove(unittest.TestCase):
+
+    def test_removing_a_file_shrinks_every_parent(self):
+        store = build_store()
+        store.remove(rank_of(store, os.path.join('docs', 'deep', 'c.bin')))
+        sizes = dict(listing(store))
+        self.assertEqual(sizes['docs'], 150)
+        self.assertEqual(sizes[os.path.join('docs', 'deep')], 0)
+        self.assertEqual(store.root_size, 550)
+        self.assertEqual(len(store), 7)
+        # docs dropped below music
+        self.assertEqual([path for path, _ in listing(store)][:2], ['music', os.path.join('music', 'song.mp3')])
+
+    def test_removing_a_directory_drops_its_descendants(self):
+        store = build_store()
+        store.remove(rank_of(store, os.path.join('docs', 'deep')))
+        self.assertNotIn(os.path.join('docs', 'deep', 'c.bin'), dict(listing(store)))
+        self.assertEqual(dict(listing(store))['docs'], 150)
+        store.remove(rank_of(store, 'docs'))
+        self.assertEqual(listing(store), [('music', 330), (os.path.join('music', 'song.mp3'), 300), ('top.log', 70)])
+        self.assertEqual(store.root_size, 400)
+        flags = store.flags
+        self.assertTrue(all(flags[index] & EntryStore.DELETED for index in range(5)))
+
+    def test_order_matches_a_full_sort(self):
+        rng = random.Random(7)
+        store = EntryStore('root')
+        directories = [-1]
+        for _ in range(400):
+            parent = rng.choice(directories)
+            if rng.random() < 0.2:
+                directories.append(store.add(parent, f'd{len(store.sizes)}', 0, True))
+            else:
+                store.add(parent, f'f{len(store.sizes)}', rng.choice([0, 10, 10, 25, rng.randrange(1000)]), False)
+        store.finish()
+        while len(store):
+            store.remove(rng.randrange(len(store)))
+            removed_order = list(store.order)
+            store.sort()
+            self.assertEqual(removed_order, list(store.order))
+        self.assertEqual(store.root_size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
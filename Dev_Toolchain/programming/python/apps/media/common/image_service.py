@@ -0,0 +1,226 @@
+"""Poster and thumbnail loader shared by the movie and game browsers.
+
+Downloaded bytes go to a content-addressed disk cache (one file per distinct
+image, named by its SHA-256), so posters survive restarts and identical images
+behind different URLs are stored once. Decoding and scaling run on worker
+threads into QImages; the GUI thread only wraps the result in a QPixmap and
+keeps it in a small LRU sized to the cards that show it. Requests for an image
+that is already loading share the same job.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PyQt5 import QtCore, QtGui
+
+
+class ImageDiskCache:
+    """Content-addressed image bytes on disk.
+
+    Layout: ``blobs/ab/abcdef...`` holds the bytes under their SHA-256 and
+    ``urls/<sha1 of url>`` holds the digest a URL resolved to. Blobs are touched
+    on every hit, so trim() removes the least recently used ones first.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.url_dir = os.path.join(directory, "urls")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.url_dir, exist_ok=True)
+
+    def _url_path(self, url):
+        return os.path.join(self.url_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def get(self, url):
+        """Return the cached bytes for url, or None."""
+        try:
+            with open(self._url_path(url), encoding="ascii") as f:
+                blob_path = self._blob_path(f.read().strip())
+            with open(blob_path, "rb") as f:
+                data = f.read()
+            os.utime(blob_path)
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, data):
+        """Store data for url and return its digest; existing identical blobs are reused."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            self._write_atomic(blob_path, data)
+        self._write_atomic(self._url_path(url), digest.encode("ascii"))
+        return digest
+
+    @staticmethod
+    def _write_atomic(path, data):
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def trim(self):
+        """Delete least recently used blobs until the cache fits in max_bytes; returns bytes freed."""
+        blobs = []
+        total = 0
+        for entry_dir, _, names in os.walk(self.blob_dir):
+            for name in names:
+                path = os.path.join(entry_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        freed = 0
+        for _, size, path in sorted(blobs):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                freed += size
+            except OSError:
+                pass
+        # URL entries whose blob is gone simply miss in get() and are rewritten on the next download
+        return freed
+
+
+class ImageService(QtCore.QObject):
+    """Asynchronous, cached image loading for QLabel-based cards and galleries.
+
+    Create it on the GUI thread. request() and load_into() never block: the
+    callback runs on the GUI thread with a QPixmap scaled to fit width x height
+    (aspect ratio kept), or None if the image could not be loaded.
+    """
+
+    _decoded = QtCore.pyqtSignal(object, object)  # (url, width, height), QImage or None
+
+    def __init__(self, cache_dir, session=None, workers=6, memory_bytes=64 * 1024 * 1024,
+                 disk_bytes=512 * 1024 * 1024, timeout=10, parent=None):
+        super().__init__(parent)
+        self.disk = ImageDiskCache(cache_dir, disk_bytes)
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.memory_bytes = memory_bytes
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # (url, width, height) -> QPixmap, least recently used first
+        self._pending = {}  # (url, width, height) -> callbacks waiting for that job
+        self._url_locks = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image")
+        self._decoded.connect(self._deliver)
+        self._pool.submit(self.disk.trim)
+
+    def cached_pixmap(self, url, width, height):
+        """The scaled pixmap if it is already in memory, else None."""
+        key = (url, width, height)
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+        return pixmap
+
+    def request(self, url, width, height, callback):
+        """Call callback(pixmap_or_None) on the GUI thread once url is loaded at this size."""
+        pixmap = self.cached_pixmap(url, width, height) if url else None
+        if pixmap is not None or not url:
+            self.hits += pixmap is not None
+            callback(pixmap)
+            return
+        key = (url, width, height)
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            waiting.append(callback)  # Same image and size already loading
+            return
+        self.misses += 1
+        self._pending[key] = [callback]
+        self._pool.submit(self._load, key)
+
+    def load_into(self, label, url, width, height, fallback_text="No image", on_loaded=None):
+        """Fill a QLabel when the image arrives; labels deleted in the meantime are skipped."""
+        def apply(pixmap):
+            try:
+                if pixmap is None:
+                    label.setText(fallback_text)
+                    return
+                label.setPixmap(pixmap)
+                if on_loaded:
+                    on_loaded(label)
+            except RuntimeError:
+                pass  # The card was closed before its image arrived
+
+        self.request(url, width, height, apply)
+
+    def _url_lock(self, url):
+        with self._lock:
+            lock = self._url_locks.get(url)
+            if lock is None:
+                lock = self._url_locks[url] = threading.Lock()
+            return lock
+
+    def _fetch_bytes(self, url):
+        """Bytes from disk, or downloaded once even if several sizes are requested together."""
+        lock = self._url_lock(url)
+        with lock:
+            data = self.disk.get(url)
+            if data is None:
+                for attempt in range(2):
+                    try:
+                        response = self.session.get(url, timeout=self.timeout)
+                        response.raise_for_status()
+                        data = response.content
+                        self.disk.put(url, data)
+                        break
+                    except Exception as e:
+                        print(f"Error downloading image (attempt {attempt + 1}): {e}")
+        with self._lock:
+            self._url_locks.pop(url, None)
+        return data
+
+    def _load(self, key):
+        url, width, height = key
+        image = None
+        try:
+            data = self._fetch_bytes(url)
+            if data:
+                image = QtGui.QImage()
+                if not image.loadFromData(data) or image.isNull():
+                    image = None
+                elif width and height:
+                    image = image.scaled(width, height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        except Exception as e:
+            print(f"Error decoding image {url}: {e}")
+            image = None
+        self._decoded.emit(key, image)
+
+    def _deliver(self, key, image):
+        """GUI thread: convert to a pixmap, remember it and run the waiting callbacks."""
+        pixmap = None
+        if image is not None:
+            pixmap = QtGui.QPixmap.fromImage(image)
+            self._remember(key, pixmap)
+        for callback in self._pending.pop(key, []):
+            callback(pixmap)
+
+    def _remember(self, key, pixmap):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.memory_used -= old.width() * old.height() * 4
+        self._memory[key] = pixmap
+        self.memory_used += pixmap.width() * pixmap.height() * 4
+        while self.memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self.memory_used -= old.width() * old.height() * 4
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
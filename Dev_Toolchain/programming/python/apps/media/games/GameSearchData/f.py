@@ -6,11 +6,15 @@ import os
 from io import BytesIO
 import urllib.parse
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtCore import QUrl
 from PyQt5.QtWebEngineWidgets import QWebEngineView  # Requires PyQtWebEngine
 from howlongtobeatpy import HowLongToBeat
 
+# image_service is shared with the movie browser in media/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "common"))
+from image_service import ImageService
+
 # YOUR_CLIENT_SECRET_HERELIENT_SECRET_HERE
 # Giant Bomb API configuration
 GIANT_BOMB_API_KEY = "YOUR_API_KEY_HERE"
@@ -22,6 +26,10 @@ HEADERS = {
 # Global cache for game details to speed up repeated loads.
 game_details_cache = {}
 
+# Box art and screenshots are cached on disk and decoded off the GUI thread.
+IMAGE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".game_insight_cache", "image_cache")
+image_service = ImageService(IMAGE_CACHE_DIR, timeout=5)
+
 # YOUR_CLIENT_SECRET_HERELIENT_SECRET_HERE
 # Helper functions for API calls
 
@@ -93,19 +101,6 @@ def match_hltb_result(gb_name, hltb_results):
     return None
 
 
-def fetch_image(url):
-    """Download an image and return it as QPixmap."""
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.content
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(data)
-            return pixmap
-    except Exception as e:
-        print("Error downloading image:", e)
-    return None
-
 # YOUR_CLIENT_SECRET_HERELIENT_SECRET_HERE
 # Worker Threads for nonblocking network calls
 
@@ -169,13 +164,11 @@ class GalleryWidget(QtWidgets.QWidget):
         row = 0
         col = 0
         for url in self.image_urls:
-            pix = fetch_image(url)
             label = QtWidgets.QLabel()
             label.setAlignment(QtCore.Qt.AlignCenter)
-            if pix:
-                label.setPixmap(pix.scaled(220, 180, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-            else:
-                label.setText("No image")
+            label.setMinimumSize(220, 180)
+            # Filled in when the image has loaded, so the gallery opens without waiting for downloads
+            image_service.load_into(label, url, 220, 180)
             self.grid.addWidget(label, row, col)
             col += 1
             if col >= 3:
@@ -397,7 +390,9 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    image_service.shutdown()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
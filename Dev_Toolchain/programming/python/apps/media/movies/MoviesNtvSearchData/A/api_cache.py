@@ -0,0 +1,195 @@
+"""Persistent HTTP response cache shared by the TMDB and OMDb helpers in d.py.
+
+Responses are stored as JSON in SQLite with a time-to-live per endpoint and
+evicted least-recently-used first once the store grows past its byte budget.
+This module has no Qt dependency so it can be tested on its own.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Seconds a stored response stays fresh, per endpoint
+ENDPOINT_TTLS = {
+    "trending": 24 * 3600,
+    "details": 7 * 24 * 3600,
+    "credits": 7 * 24 * 3600,
+    "similar": 24 * 3600,
+    "external_ids": 30 * 24 * 3600,
+    "ratings": 7 * 24 * 3600,
+    "search": 3600,
+    "suggestions": 3600,
+}
+DEFAULT_TTL = 3600
+
+# Query parameters that identify the caller rather than the resource; kept out of cache keys
+SECRET_PARAMS = ("api_key", "apikey")
+
+MISSING = object()  # Returned by ResponseCache.get on a miss
+
+
+def make_session(pool_size=20, headers=None):
+    """Keep-alive Session whose connection pool is large enough for every worker thread."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def request_key(url, params=None):
+    """Cache key for a GET request: the URL plus its sorted, non-secret parameters."""
+    items = sorted((key, str(value)) for key, value in (params or {}).items()
+                   if key not in SECRET_PARAMS and value is not None)
+    return f"{url}?{urlencode(items)}" if items else url
+
+
+class ResponseCache:
+    """SQLite store of JSON values with per-endpoint TTLs and an LRU byte budget.
+
+    get() and put() take the endpoint name so hits and misses are counted per
+    endpoint (see stats()). Safe to share between threads.
+    """
+
+    def __init__(self, db_path, max_bytes=64 * 1024 * 1024, ttls=None, clock=time.time):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttls = dict(ENDPOINT_TTLS, **(ttls or {}))
+        self.clock = clock
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+            CREATE INDEX IF NOT EXISTS idx_responses_endpoint ON responses(endpoint);
+        """)
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, key, endpoint="default"):
+        """Return the stored value for key, or MISSING if absent or expired."""
+        now = self.clock()
+        with self._lock:
+            row = self.conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+                return MISSING
+            self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, value, endpoint="default", ttl=None):
+        """Store a JSON-serialisable value, then evict old entries if over budget."""
+        body = json.dumps(value, separators=(",", ":"))
+        size = len(body.encode("utf-8")) + len(key)
+        now = self.clock()
+        expires_at = now + (self.ttl_for(endpoint) if ttl is None else ttl)
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, endpoint, body, size, expires_at, now))
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now):
+        """Drop expired entries, then least recently used ones until under budget."""
+        cursor = self.conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        if cursor.rowcount:
+            self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if self.total_bytes <= self.max_bytes:
+            return
+        victims = []
+        freed = 0
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if self.total_bytes - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.total_bytes -= freed
+
+    def invalidate(self, endpoint=None):
+        """Forget every entry, or only those of one endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self.conn.execute("DELETE FROM responses")
+            else:
+                self.conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+            self.conn.commit()
+            self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def stats(self):
+        """Entry count, stored bytes and per-endpoint hits, misses and hit rate for this session."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            endpoints = {}
+            for endpoint in sorted(set(self.hits) | set(self.misses)):
+                hits = self.hits.get(endpoint, 0)
+                misses = self.misses.get(endpoint, 0)
+                endpoints[endpoint] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        return {"entries": entries, "bytes": self.total_bytes, "endpoints": endpoints}
+
+    def summary(self):
+        """One-line hit-rate report, e.g. for printing at exit."""
+        stats = self.stats()
+        parts = [f"{endpoint} {counts['hit_rate']:.0%} of {counts['hits'] + counts['misses']}"
+                 for endpoint, counts in stats["endpoints"].items()]
+        return (f"Response cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB"
+                + (f"; hit rates: {', '.join(parts)}" if parts else ""))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class CachedHttp:
+    """GET JSON through a ResponseCache and one pooled Session; only successful responses are stored."""
+
+    def __init__(self, cache, session=None, timeout=10):
+        self.cache = cache
+        self.session = session or make_session()
+        self.timeout = timeout
+
+    def get_json(self, url, params=None, endpoint="default", headers=None, timeout=None, ttl=None):
+        """Return the decoded JSON body, from the cache when fresh; HTTP errors raise as before."""
+        key = request_key(url, params)
+        value = self.cache.get(key, endpoint)
+        if value is not MISSING:
+            return value
+        response = self.session.get(url, headers=headers, params=params,
+                                    timeout=self.timeout if timeout is None else timeout)
+        response.raise_for_status()
+        value = response.json()
+        self.cache.put(key, value, endpoint, ttl)
+        return value
+
+    def close(self):
+        self.session.close()
@@ -1,14 +1,21 @@
 import sys
 import difflib
-import requests
 import urllib.parse
 import json
 import os
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QUrl, QTimer, QObject, QPropertyAnimation, pyqtProperty
 from PyQt5.QtWebEngineWidgets import QWebEngineView
+from api_cache import CachedHttp, ResponseCache, make_session
+from suggest_engine import SuggestionEngine
+
+# image_service is shared with the game browser in media/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, os.pardir, "common"))
+from image_service import ImageService
 
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # TMDB API configuration and cache
@@ -19,27 +26,31 @@ HEADERS = {
     "User-Agent": "MovieTVInsightApp/1.0",
     "Authorization": f"Bearer {TMDB_ACCESS_TOKEN}"
 }
-details_cache = {}
 
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # OMDB API configuration
 OMDB_API_KEY = "YOUR_API_KEY_HERE"  # Use your provided OMDB API key for faster/better results
 OMDB_BASE_URL = "http://www.omdbapi.com/"
 
-# YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
-# Add search results caching to speed up repeat searches
-search_cache = {}
-imdb_id_cache = {}
-imdb_rating_cache = {}
-
 # Set higher timeout for TMDB API requests to prevent timeouts
 DEFAULT_TIMEOUT = 10
 
+# Worker threads for the lookups a user is waiting on (detail page fan-out, search result enrichment)
+API_WORKERS = 8
+# Background work gets its own smaller pools, so a click never queues behind it: trending list pages,
+# and detail warm-ups ahead of a click
+LISTING_WORKERS = 4
+PREFETCH_WORKERS = 2
+# Trending items whose details are fetched ahead of a click (the first two rows of cards)
+TRENDING_WARM_COUNT = 8
+
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # Add persistent storage for watchlist and history
 USER_DATA_DIR = os.path.join(os.path.expanduser("~"), ".movietv_insight")
 WATCHLIST_FILE = os.path.join(USER_DATA_DIR, "watchlist.json")
 HISTORY_FILE = os.path.join(USER_DATA_DIR, "history.json")
+RESPONSE_CACHE_FILE = os.path.join(USER_DATA_DIR, "response_cache.sqlite")
+IMAGE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".movietv_insight_cache", "image_cache")
 
 # Ensure user data directory exists
 if not os.path.exists(USER_DATA_DIR):
@@ -48,6 +59,19 @@ if not os.path.exists(USER_DATA_DIR):
     except Exception as e:
         print(f"Error creating user data directory: {e}")
 
+# YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
+# Persistent response cache shared by every TMDB/OMDB helper (TTL per endpoint, LRU under a byte budget)
+response_cache = ResponseCache(RESPONSE_CACHE_FILE)
+# One keep-alive session for every request, so TMDB/OMDB connections are reused instead of re-handshaking
+http = CachedHttp(response_cache, session=make_session(pool_size=(API_WORKERS + LISTING_WORKERS + PREFETCH_WORKERS) * 2),
+                  timeout=DEFAULT_TIMEOUT)
+api_pool = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api")
+listing_pool = ThreadPoolExecutor(max_workers=LISTING_WORKERS, thread_name_prefix="listing")
+prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+warm_futures = []  # Detail warm-ups not yet known to be finished
+# Posters and stills: disk cache + scaled pixmap LRU, downloaded and decoded off the GUI thread
+image_service = ImageService(IMAGE_CACHE_DIR, session=http.session, timeout=DEFAULT_TIMEOUT)
+
 # Load watchlist from file
 def load_watchlist():
     if os.path.exists(WATCHLIST_FILE):
@@ -101,51 +125,34 @@ def add_to_history(item):
 
 def search_tmdb(query, content_type="multi"):
     """Search TMDB for movies/TV shows matching 'query'."""
-    # Check cache first for faster results
-    cache_key = f"{content_type}_{query.lower().strip()}"
-    if cache_key in search_cache:
-        print("Using cached search results")
-        return search_cache[cache_key]
-    
     url = f"{TMDB_BASE_URL}/search/{content_type}"
     params = {
         "api_key": TMDB_API_KEY,
-        "query": query,
+        "query": query.strip(),
         "language": "en-US",
         "page": 1,
         "include_adult": "false"
     }
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("results", [])
-        
-        # Cache the results for future use
-        search_cache[cache_key] = results
-        return results
+        data = http.get_json(url, params, "search", headers=HEADERS)
+        return data.get("results", [])
     except Exception as e:
         print(f"Error searching TMDB: {e}")
     return []
 
 def get_tmdb_details(item_id, media_type):
-    """Fetch detailed info for a movie/TV show from TMDB by ID (using caching)."""
-    cache_key = f"{media_type}_{item_id}"
-    if cache_key in details_cache:
-        return details_cache[cache_key]
-    
+    """Fetch detailed info for a movie/TV show from TMDB by ID (using caching).
+
+    Credits, videos, images, similar titles, reviews and external IDs come back in the same request.
+    """
     url = f"{TMDB_BASE_URL}/{media_type}/{item_id}"
     params = {
         "api_key": TMDB_API_KEY, 
         "language": "en-US",
-        "append_to_response": "credits,videos,images,similar,recommendations,reviews"
+        "append_to_response": "credits,videos,images,similar,recommendations,reviews,external_ids"
     }
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        details = response.json()
-        details_cache[cache_key] = details
-        return details
+        return http.get_json(url, params, "details", headers=HEADERS)
     except Exception as e:
         print(f"Error fetching details: {e}")
     return {}
@@ -155,9 +162,7 @@ def get_media_credits(item_id, media_type):
     url = f"{TMDB_BASE_URL}/{media_type}/{item_id}/credits"
     params = {"api_key": TMDB_API_KEY, "language": "en-US"}
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        return response.json()
+        return http.get_json(url, params, "credits", headers=HEADERS)
     except Exception as e:
         print(f"Error fetching credits: {e}")
     return {"cast": [], "crew": []}
@@ -174,9 +179,7 @@ def get_tmdb_ratings(title, year=None, media_type="movie"):
         params["y"] = year
         
     try:
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+        data = http.get_json(OMDB_BASE_URL, params, "ratings")
         
         if data.get("Response") == "True":
             ratings = {}
@@ -201,23 +204,12 @@ def get_tmdb_ratings(title, year=None, media_type="movie"):
 
 def get_imdb_id_for_tmdb(tmdb_id, media_type):
     """Get IMDB ID from TMDB ID to enable direct IMDB ratings lookup."""
-    cache_key = f"{media_type}_{tmdb_id}"
-    
-    # Check cache first
-    if cache_key in imdb_id_cache:
-        return imdb_id_cache[cache_key]
-        
     try:
         url = f"{TMDB_BASE_URL}/{media_type}/{tmdb_id}/external_ids"
         params = {"api_key": TMDB_API_KEY}
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        
-        imdb_id = data.get("imdb_id", "")
-        imdb_id_cache[cache_key] = imdb_id
-        return imdb_id
+        data = http.get_json(url, params, "external_ids", headers=HEADERS)
+        return data.get("imdb_id", "") or ""
     except Exception as e:
         print(f"Error fetching IMDB ID: {e}")
         return ""
@@ -226,10 +218,6 @@ def get_quick_imdb_rating(imdb_id):
     """Get IMDB rating directly by ID for faster results."""
     if not imdb_id:
         return "N/A"
-        
-    # Check cache first
-    if imdb_id in imdb_rating_cache:
-        return imdb_rating_cache[imdb_id]
     
     try:
         params = {
@@ -238,57 +226,23 @@ def get_quick_imdb_rating(imdb_id):
             "r": "json"
         }
         
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+        data = http.get_json(OMDB_BASE_URL, params, "ratings")
         
         if data.get("Response") == "True":
-            rating = data.get("imdbRating", "N/A")
-            imdb_rating_cache[imdb_id] = rating
-            return rating
+            return data.get("imdbRating", "N/A")
     except Exception as e:
         print(f"Error fetching quick IMDB rating: {e}")
     
     return "N/A"
 
-def fetch_image(url):
-    """Download an image and return it as QPixmap with error handling and retry."""
-    if not url:
-        return None
-        
-    # Implement retry logic for images
-    max_retries = 2
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, timeout=DEFAULT_TIMEOUT)
-            response.raise_for_status()
-            pixmap = QtGui.QPixmap()
-            success = pixmap.loadFromData(response.content)
-            
-            if success and not pixmap.isNull():
-                return pixmap
-            elif attempt < max_retries - 1:
-                print(f"Retrying image download for: {url}")
-                continue
-        except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"Error downloading image (retry {attempt+1}): {e}")
-            else:
-                print(f"Final error downloading image: {e}")
-    
-    # If we get here, we've failed - create a placeholder image
-    placeholder = QtGui.QPixmap(100, 150)
-    placeholder.fill(QtGui.QColor("#f0f0f0"))
-    painter = QtGui.QPainter(placeholder)
-    painter.setPen(QtGui.QColor("#999999"))
-    painter.drawText(placeholder.rect(), QtCore.Qt.AlignCenter, "No Image")
-    painter.end()
-    return placeholder
-
 def get_tmdb_suggestions(query):
-    """Get search suggestions as you type."""
+    """Get search suggestions as you type: (label, title) pairs and whether TMDB had no further matches.
+    
+    When nothing was cut off, any longer query can be answered by filtering these results.
+    Runs on the suggestion engine's worker threads, which report errors.
+    """
     if not query or len(query) < 2:
-        return []
+        return [], False
     
     url = f"{TMDB_BASE_URL}/search/multi"
     params = {
@@ -298,239 +252,118 @@ def get_tmdb_suggestions(query):
         "page": 1,
         "include_adult": "false"
     }
-    try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=2)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("results", [])[:10]  # Limit to top 10 suggestions
-        
-        suggestions = []
-        for item in results:
-            if item.get("media_type") in ["movie", "tv"]:
-                title = item.get("title", item.get("name", ""))
-                year = ""
-                if item.get("media_type") == "movie" and item.get("release_date"):
-                    year = f" ({item['release_date'][:4]})"
-                elif item.get("media_type") == "tv" and item.get("first_air_date"):
-                    year = f" ({item['first_air_date'][:4]})"
-                
-                media_type = "Movie" if item.get("media_type") == "movie" else "TV Show"
-                suggestions.append(f"{title}{year} - {media_type}")
-        
-        return suggestions
-    except Exception as e:
-        print(f"Error fetching suggestions: {e}")
-    return []
+    data = http.get_json(url, params, "suggestions", headers=HEADERS, timeout=2)
+    results = data.get("results", [])[:10]  # Limit to top 10 suggestions
+    complete = data.get("total_results", 0) <= len(results)
+    
+    suggestions = []
+    for item in results:
+        if item.get("media_type") in ["movie", "tv"]:
+            title = item.get("title", item.get("name", ""))
+            year = ""
+            if item.get("media_type") == "movie" and item.get("release_date"):
+                year = f" ({item['release_date'][:4]})"
+            elif item.get("media_type") == "tv" and item.get("first_air_date"):
+                year = f" ({item['first_air_date'][:4]})"
+            
+            media_type = "Movie" if item.get("media_type") == "movie" else "TV Show"
+            suggestions.append((f"{title}{year} - {media_type}", title))
+    
+    return suggestions, complete
+
+# As-you-type suggestions: off-thread lookups, narrowed prefixes filtered locally, recent titles in a trie
+suggestion_engine = SuggestionEngine(get_tmdb_suggestions)
+
+# Pages behind each trending list, in display order: today's trending, popular pages, then extras if still short
+TRENDING_PAGES = {
+    "movie": ("trending/movie/day", "movie/popular", [("movie/upcoming", "upcoming"), ("movie/top_rated", "top_rated")]),
+    "tv": ("trending/tv/day", "tv/popular", [("tv/top_rated", "top_rated"), ("tv/on_the_air", "on_air")]),
+}
+
+def fetch_trending_page(path, page=None):
+    """One page of a TMDB list endpoint."""
+    params = {
+        "api_key": TMDB_API_KEY,
+        "language": "en-US"
+    }
+    if page is not None:
+        params["page"] = page
+    return http.get_json(f"{TMDB_BASE_URL}/{path}", params, "trending", headers=HEADERS).get("results", [])
+
+def stream_trending(media_type, limit, on_chunk):
+    """Fetch the pages behind a trending list concurrently and pass new items to on_chunk in display order.
+    
+    Each page is handed over as soon as it and every page before it have arrived, so the first
+    cards can be shown while later pages are still loading. Returns the number of items delivered.
+    """
+    trending_path, popular_path, extras = TRENDING_PAGES[media_type]
+    pages = [(trending_path, None, None)]
+    # If we want more than 20 results (TMDB's default page size), add pages of popular titles
+    if limit > 20:
+        pages_needed = min(10, (limit // 20) + 1)  # Limit to 10 pages max to avoid abuse
+        pages += [(popular_path, page, "popular") for page in range(1, pages_needed + 1)]
+    
+    seen_ids = set()
+    delivered = 0
+    
+    def deliver(specs):
+        nonlocal delivered
+        futures = [listing_pool.submit(fetch_trending_page, path, page) for path, page, _ in specs]
+        for (path, page, source), future in zip(specs, futures):
+            if delivered >= limit:
+                future.cancel()
+                continue
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"Error fetching {path} page {page or 1}: {e}")
+                continue
+            chunk = []
+            for item in items:
+                if item['id'] not in seen_ids and delivered + len(chunk) < limit:
+                    seen_ids.add(item['id'])
+                    if source:
+                        # Mark where this came from when it is not today's trending list
+                        item['source'] = source
+                    chunk.append(item)
+            if chunk:
+                delivered += len(chunk)
+                on_chunk(chunk)
+    
+    deliver(pages)
+    # If still not enough, add the extra lists (upcoming/top rated or top rated/on the air)
+    if limit > 20 and delivered < limit:
+        deliver([(path, 1, source) for path, source in extras])
+    return delivered
 
 def get_trending_movies(limit=20):
     """Get currently trending/popular movies from TMDB."""
-    cache_key = f"trending_movies_{datetime.now().strftime('%Y-%m-%d')}"
-    if cache_key in search_cache:
-        print("Using cached trending movies")
-        return search_cache[cache_key][:limit]
-    
-    try:
-        # First try trending movies for today
-        url = f"{TMDB_BASE_URL}/trending/movie/day"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": "en-US"
-        }
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("results", [])
-        
-        # If we want more than 20 results (TMDB's default page size),
-        # we need to fetch additional pages of popular movies
-        if limit > 20:
-            # Get total number of pages needed (TMDB returns 20 per page)
-            pages_needed = min(10, (limit // 20) + 1)  # Limit to 10 pages max to avoid abuse
-            
-            # Fetch popular movies from multiple pages
-            popular_url = f"{TMDB_BASE_URL}/movie/popular"
-            
-            for page in range(1, pages_needed + 1):
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": page
-                }
-                
-                popular_response = requests.get(popular_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                popular_response.raise_for_status()
-                popular_data = popular_response.json()
-                
-                # Add only new movies not already in results
-                existing_ids = {movie['id'] for movie in results}
-                for movie in popular_data.get("results", []):
-                    if movie['id'] not in existing_ids and len(results) < limit:
-                        # Mark this as coming from popular rather than trending
-                        movie['source'] = 'popular'
-                        results.append(movie)
-            
-            # If still not enough, add upcoming and top rated movies
-            if len(results) < limit:
-                # Try upcoming movies
-                upcoming_url = f"{TMDB_BASE_URL}/movie/upcoming"
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": 1
-                }
-                
-                try:
-                    upcoming_response = requests.get(upcoming_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                    upcoming_response.raise_for_status()
-                    upcoming_data = upcoming_response.json()
-                    
-                    # Add only new movies not already in results
-                    existing_ids = {movie['id'] for movie in results}
-                    for movie in upcoming_data.get("results", []):
-                        if movie['id'] not in existing_ids and len(results) < limit:
-                            movie['source'] = 'upcoming'
-                            results.append(movie)
-                except Exception as e:
-                    print(f"Error fetching upcoming movies: {e}")
-                
-                # Try top rated movies
-                top_rated_url = f"{TMDB_BASE_URL}/movie/top_rated"
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": 1
-                }
-                
-                try:
-                    top_rated_response = requests.get(top_rated_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                    top_rated_response.raise_for_status()
-                    top_rated_data = top_rated_response.json()
-                    
-                    # Add only new movies not already in results
-                    existing_ids = {movie['id'] for movie in results}
-                    for movie in top_rated_data.get("results", []):
-                        if movie['id'] not in existing_ids and len(results) < limit:
-                            movie['source'] = 'top_rated'
-                            results.append(movie)
-                except Exception as e:
-                    print(f"Error fetching top rated movies: {e}")
-        
-        # Cache the results with today's date as cache key
-        search_cache[cache_key] = results
-        return results[:limit]
-    except Exception as e:
-        print(f"Error fetching trending movies: {e}")
-        return []
+    results = []
+    stream_trending("movie", limit, results.extend)
+    return results
 
 def get_trending_tv_shows(limit=20):
     """Get currently trending/popular TV shows from TMDB."""
-    cache_key = f"trending_tv_{datetime.now().strftime('%Y-%m-%d')}"
-    if cache_key in search_cache:
-        print("Using cached trending TV shows")
-        return search_cache[cache_key][:limit]
-    
-    try:
-        # First try trending TV shows for today
-        url = f"{TMDB_BASE_URL}/trending/tv/day"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": "en-US"
-        }
-        response = requests.get(url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("results", [])
-        
-        # If we want more than 20 results (TMDB's default page size),
-        # we need to fetch additional pages of popular TV shows
-        if limit > 20:
-            # Get total number of pages needed (TMDB returns 20 per page)
-            pages_needed = min(10, (limit // 20) + 1)  # Limit to 10 pages max to avoid abuse
-            
-            # Fetch popular TV shows from multiple pages
-            popular_url = f"{TMDB_BASE_URL}/tv/popular"
-            
-            for page in range(1, pages_needed + 1):
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": page
-                }
-                
-                popular_response = requests.get(popular_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                popular_response.raise_for_status()
-                popular_data = popular_response.json()
-                
-                # Add only new TV shows not already in results
-                existing_ids = {show['id'] for show in results}
-                for show in popular_data.get("results", []):
-                    if show['id'] not in existing_ids and len(results) < limit:
-                        # Mark this as coming from popular rather than trending
-                        show['source'] = 'popular'
-                        results.append(show)
-            
-            # If still not enough, add top rated and on the air TV shows
-            if len(results) < limit:
-                # Try top rated TV shows
-                top_rated_url = f"{TMDB_BASE_URL}/tv/top_rated"
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": 1
-                }
-                
-                try:
-                    top_rated_response = requests.get(top_rated_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                    top_rated_response.raise_for_status()
-                    top_rated_data = top_rated_response.json()
-                    
-                    # Add only new TV shows not already in results
-                    existing_ids = {show['id'] for show in results}
-                    for show in top_rated_data.get("results", []):
-                        if show['id'] not in existing_ids and len(results) < limit:
-                            show['source'] = 'top_rated'
-                            results.append(show)
-                except Exception as e:
-                    print(f"Error fetching top rated TV shows: {e}")
-                
-                # Try on the air TV shows
-                on_air_url = f"{TMDB_BASE_URL}/tv/on_the_air"
-                params = {
-                    "api_key": TMDB_API_KEY,
-                    "language": "en-US",
-                    "page": 1
-                }
-                
-                try:
-                    on_air_response = requests.get(on_air_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-                    on_air_response.raise_for_status()
-                    on_air_data = on_air_response.json()
-                    
-                    # Add only new TV shows not already in results
-                    existing_ids = {show['id'] for show in results}
-                    for show in on_air_data.get("results", []):
-                        if show['id'] not in existing_ids and len(results) < limit:
-                            show['source'] = 'on_air'
-                            results.append(show)
-                except Exception as e:
-                    print(f"Error fetching on the air TV shows: {e}")
-        
-        # Cache the results with today's date as cache key
-        search_cache[cache_key] = results
-        return results[:limit]
-    except Exception as e:
-        print(f"Error fetching trending TV shows: {e}")
-        return []
+    results = []
+    stream_trending("tv", limit, results.extend)
+    return results
+
+def warm_details(items, media_type, count=None):
+    """Fetch details for the first items in the background, so opening one of them hits the cache."""
+    warm_futures[:] = [future for future in warm_futures if not future.done()]
+    for item in items[:TRENDING_WARM_COUNT if count is None else count]:
+        warm_futures.append(prefetch_pool.submit(get_tmdb_details, item.get("id"), item.get("media_type", media_type)))
+
+def cancel_warm_ups():
+    """Drop queued detail warm-ups, e.g. when the user opens a title and its requests should go first."""
+    while warm_futures:
+        warm_futures.pop().cancel()  # Only succeeds while still queued
     
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # Enhanced API calls for better similar content and ratings
 
 def YOUR_CLIENT_SECRET_HERE(item_id, media_type):
     """Get better similar content recommendations with weighted scoring."""
-    similar_key = f"{media_type}_{item_id}_similar_enhanced"
-    if similar_key in search_cache:
-        return search_cache[similar_key]
-        
     try:
         # Get similar and recommended content
         similar_url = f"{TMDB_BASE_URL}/{media_type}/{item_id}/similar"
@@ -542,13 +375,8 @@ def YOUR_CLIENT_SECRET_HERE(item_id, media_type):
             "page": 1
         }
         
-        similar_response = requests.get(similar_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        similar_response.raise_for_status()
-        similar_data = similar_response.json().get("results", [])
-        
-        recommend_response = requests.get(recommend_url, headers=HEADERS, params=params, timeout=DEFAULT_TIMEOUT)
-        recommend_response.raise_for_status()
-        recommend_data = recommend_response.json().get("results", [])
+        similar_data = http.get_json(similar_url, params, "similar", headers=HEADERS).get("results", [])
+        recommend_data = http.get_json(recommend_url, params, "similar", headers=HEADERS).get("results", [])
         
         # Get the original item's details for better comparison
         original_details = get_tmdb_details(item_id, media_type)
@@ -593,9 +421,6 @@ def YOUR_CLIENT_SECRET_HERE(item_id, media_type):
         
         # Sort by relevance score
         enhanced_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        
-        # Cache the results
-        search_cache[similar_key] = enhanced_results
         return enhanced_results
         
     except Exception as e:
@@ -604,10 +429,6 @@ def YOUR_CLIENT_SECRET_HERE(item_id, media_type):
 
 def YOUR_CLIENT_SECRET_HERE(imdb_id, title, year=None, media_type="movie"):
     """Get comprehensive ratings from multiple sources with cache."""
-    cache_key = f"ratings_{imdb_id}_{title}_{year}_{media_type}"
-    if cache_key in search_cache:
-        return search_cache[cache_key]
-    
     all_ratings = {
         "TMDB": {"value": "N/A", "source": "TMDB", "icon": "🌟"},
         "IMDB": {"value": "N/A", "source": "IMDB", "icon": "⭐"},
@@ -629,9 +450,7 @@ def YOUR_CLIENT_SECRET_HERE(imdb_id, title, year=None, media_type="movie"):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
         
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+        data = http.get_json(OMDB_BASE_URL, params, "ratings")
         
         if data.get("Response") == "True":
             # IMDB rating
@@ -654,8 +473,6 @@ def YOUR_CLIENT_SECRET_HERE(imdb_id, title, year=None, media_type="movie"):
     except Exception as e:
         print(f"Error fetching OMDB ratings: {e}")
     
-    # Cache the results
-    search_cache[cache_key] = all_ratings
     return all_ratings
 
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
@@ -690,8 +507,19 @@ class DetailThread(QtCore.QThread):
 
     def run(self):
         try:
+            # The OMDB title lookup does not depend on TMDB, so it overlaps the details request
+            ratings_future = api_pool.submit(get_tmdb_ratings, self.title, self.year, self.media_type)
             details = get_tmdb_details(self.item_id, self.media_type)
-            ratings = get_tmdb_ratings(self.title, self.year, self.media_type)
+            
+            # Warm the IMDB ID lookup the ratings tab makes, so building the tabs only hits the cache
+            imdb_id = (details.get("external_ids") or {}).get("imdb_id") or ""
+            title = details.get("title", details.get("name", self.title))
+            date = details.get("release_date" if self.media_type == "movie" else "first_air_date")
+            year = date.split("-")[0] if date else None
+            tab_ratings_future = api_pool.submit(YOUR_CLIENT_SECRET_HERE, imdb_id, title, year, self.media_type)
+            
+            ratings = ratings_future.result()
+            tab_ratings_future.result()
             self.detail_signal.emit(details, ratings)
         except Exception as e:
             self.error_signal.emit(str(e))
@@ -710,26 +538,21 @@ class EnhancedSearchThread(QtCore.QThread):
         try:
             results = search_tmdb(self.query, self.content_type)
             
-            # Add IMDB IDs and ratings for faster display
-            enhanced_results = []
-            
-            # Process in batches for better responsiveness
-            batch_size = 5
-            for i in range(0, len(results), batch_size):
-                batch = results[i:i+batch_size]
-                for item in batch:
-                    if item.get("media_type") in ["movie", "tv"] or self.content_type in ["movie", "tv"]:
-                        media_type = item.get("media_type", self.content_type)
-                        imdb_id = get_imdb_id_for_tmdb(item.get("id"), media_type)
-                        imdb_rating = get_quick_imdb_rating(imdb_id) if imdb_id else "N/A"
-                        item["imdb_id"] = imdb_id
-                        item["imdb_rating"] = imdb_rating
-                    enhanced_results.append(item)
+            # Add IMDB IDs and ratings for faster display; each result is looked up concurrently
+            enhanced_results = list(api_pool.map(self.add_imdb_data, results))
             
             self.results_signal.emit(enhanced_results)
         except Exception as e:
             self.error_signal.emit(str(e))
 
+    def add_imdb_data(self, item):
+        if item.get("media_type") in ["movie", "tv"] or self.content_type in ["movie", "tv"]:
+            media_type = item.get("media_type", self.content_type)
+            imdb_id = get_imdb_id_for_tmdb(item.get("id"), media_type)
+            item["imdb_id"] = imdb_id
+            item["imdb_rating"] = get_quick_imdb_rating(imdb_id) if imdb_id else "N/A"
+        return item
+
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # Class for rotatable label (fixes QPropertyAnimation rotation issue)
 class RotatableLabel(QtWidgets.QLabel):
@@ -760,11 +583,17 @@ class RotatableLabel(QtWidgets.QLabel):
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # AutoCompleteLineEdit: provides search suggestions as you type
 class AutoCompleteLineEdit(QtWidgets.QLineEdit):
+    # Suggestions arrive on the engine's worker threads; this hands them to the GUI thread
+    suggestions_ready = QtCore.pyqtSignal(str, list)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         self.completer = QtWidgets.QCompleter(self)
         self.completer.setCompletionMode(QtWidgets.QCompleter.PopupCompletion)
+        # Titles match on any word ("dark kni" finds "The Dark Knight"), as the engine does
+        self.completer.setFilterMode(QtCore.Qt.MatchContains)
+        self.completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
         self.setCompleter(self.completer)
         
         # Set up a model for the completer
@@ -779,16 +608,30 @@ class AutoCompleteLineEdit(QtWidgets.QLineEdit):
         
         # Connect text changed signal to trigger suggestion timer
         self.textChanged.connect(self.start_suggestion_timer)
+        self.suggestions_ready.connect(self.show_suggestions)
         
     def start_suggestion_timer(self, text):
-        if len(text) >= 3:  # Only trigger suggestions for 3+ characters
+        # Recently seen titles and narrowed earlier results show immediately, without waiting for the timer
+        local, exact = suggestion_engine.local(text)
+        if local or exact:
+            self.show_suggestions(text.strip(), local)
+        if len(text) >= 3 and not exact:  # Only trigger suggestions for 3+ characters
             self.suggestion_timer.start()
+        else:
+            self.suggestion_timer.stop()
+            suggestion_engine.cancel()
         
     def get_suggestions(self):
         query = self.text().strip()
         if query:
-            suggestions = get_tmdb_suggestions(query)
-            self.completion_model.setStringList(suggestions)
+            suggestion_engine.request(query, self.suggestions_ready.emit)
+    
+    def show_suggestions(self, query, suggestions):
+        if query != self.text().strip():
+            return  # The user kept typing; a newer request is on its way
+        self.completion_model.setStringList(suggestions)
+        if suggestions and self.hasFocus():
+            self.completer.complete()
 
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # GalleryWidget: displays a scrollable grid of images
@@ -846,24 +689,9 @@ class GalleryWidget(QtWidgets.QWidget):
                 padding: 5px;
             """)
             
-            pix = fetch_image(url)
-            if pix:
-                # Create a fade-in effect
-                opacity = QtWidgets.QGraphicsOpacityEffect()
-                label.setGraphicsEffect(opacity)
-                opacity.setOpacity(0)
-                
-                label.setPixmap(pix.scaled(220, 180, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-                
-                # Animation for fade-in
-                anim = QtCore.QPropertyAnimation(opacity, b"opacity")
-                anim.setStartValue(0.0)
-                anim.setEndValue(1.0)
-                anim.setDuration(500)
-                anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-                anim.start()
-            else:
-                label.setText("Image unavailable")
+            # Cells are laid out right away and fill in as each image finishes loading
+            label.setText("Loading...")
+            image_service.load_into(label, url, 220, 180, "Image unavailable", on_loaded=self.fade_in)
                 
             self.grid.addWidget(label, row, col)
             col += 1
@@ -871,6 +699,19 @@ class GalleryWidget(QtWidgets.QWidget):
                 col = 0
                 row += 1
 
+    def fade_in(self, label):
+        opacity = QtWidgets.QGraphicsOpacityEffect()
+        label.setGraphicsEffect(opacity)
+        opacity.setOpacity(0)
+        
+        # Animation for fade-in; kept on the label so it is not garbage collected mid-run
+        label.fade_animation = QtCore.QPropertyAnimation(opacity, b"opacity")
+        label.fade_animation.setStartValue(0.0)
+        label.fade_animation.setEndValue(1.0)
+        label.fade_animation.setDuration(500)
+        label.fade_animation.setEasingCurve(QtCore.QEasingCurve.OutCubic)
+        label.fade_animation.start()
+
 # YOUR_CLIENT_SECRET_HERECLIENT_SECRET_HERE
 # DetailTabs: displays tabs for Details, Cast, Gallery, Trailers, and Ratings
 
@@ -1112,8 +953,9 @@ class DetailTabs(QtWidgets.QTabWidget):
 
     def create_ratings_tab(self):
         """Enhanced ratings tab with visual indicators and more sources."""
-        # Get the IMDB ID for this content
-        imdb_id = get_imdb_id_for_tmdb(self.details.get("id"), self.media_type) 
+        # Get the IMDB ID for this content (appended to the details response when available)
+        imdb_id = (self.details.get("external_ids") or {}).get("imdb_id") or \
+            get_imdb_id_for_tmdb(self.details.get("id"), self.media_type)
         
         # Get comprehensive ratings
         title = self.details.get("title", self.details.get("name", ""))
@@ -1374,11 +1216,7 @@ class DetailTabs(QtWidgets.QTabWidget):
         
         if poster_path:
             poster_url = f"https://image.tmdb.org/t/p/w342{poster_path}"
-            pix = fetch_image(poster_url)
-            if pix:
-                img_label.setPixmap(pix.scaled(150, 225, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-            else:
-                img_label.setText("No image")
+            image_service.load_into(img_label, poster_url, 150, 225)
         else:
             img_label.setText("No image")
             
@@ -1506,10 +1344,19 @@ class StyledComponents:
 class TrendingContentWidget(QtWidgets.QWidget):
     item_clicked = QtCore.pyqtSignal(dict)
     
+    # Cards built per event-loop turn, so the first rows paint before the rest are created
+    CARDS_PER_TICK = 8
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.trending_movies = []
         self.trending_tv_shows = []
+        self.load_generation = 0
+        self.loader_threads = []
+        self.pending_cards = {"movie": deque(), "tv": deque()}
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(0)
+        self.render_timer.timeout.connect(self.render_pending_cards)
         self.init_ui()
         
     def init_ui(self):
@@ -1557,6 +1404,7 @@ class TrendingContentWidget(QtWidgets.QWidget):
         # Add tabs
         self.tabs.addTab(self.movies_widget, "Popular Movies")
         self.tabs.addTab(self.tv_widget, "Popular TV Shows")
+        self.grids = {"movie": self.movies_grid, "tv": self.tv_grid}
         
         # Add a refresh button
         refresh_layout = QtWidgets.QHBoxLayout()
@@ -1603,47 +1451,64 @@ class TrendingContentWidget(QtWidgets.QWidget):
         QtCore.QTimer.singleShot(100, self.load_content)
     
     def load_content(self):
-        """Load trending content using a thread to avoid freezing the UI."""
-        self.movie_thread = QtCore.QThread()
-        self.tv_thread = QtCore.QThread()
+        """Stream trending content in from background threads; cards are added as pages arrive."""
+        # Chunks still arriving from an earlier load are ignored
+        self.load_generation += 1
+        generation = self.load_generation
+        self.trending_movies = []
+        self.trending_tv_shows = []
+        for pending in self.pending_cards.values():
+            pending.clear()
+        self.loader_threads = [thread for thread in self.loader_threads if thread.isRunning()]
         
-        # Movie worker
-        class MovieWorker(QtCore.QObject):
-            finished = QtCore.pyqtSignal(list)
+        class TrendingWorker(QtCore.QObject):
+            chunk_ready = QtCore.pyqtSignal(list)
+            finished = QtCore.pyqtSignal()
             
-            def run(self):
-                results = get_trending_movies(limit=200)  # modified: increased limit to 200 titles
-                self.finished.emit(results)
-        
-        # TV worker
-        class TvWorker(QtCore.QObject):
-            finished = QtCore.pyqtSignal(list)
+            def __init__(self, media_type):
+                super().__init__()
+                self.media_type = media_type
             
             def run(self):
-                results = get_trending_tv_shows(limit=200)  # modified: increased limit to 200 titles
-                self.finished.emit(results)
-        
-        # Set up movie worker
-        self.movie_worker = MovieWorker()
-        self.movie_worker.moveToThread(self.movie_thread)
-        self.movie_thread.started.connect(self.movie_worker.run)
-        self.movie_worker.finished.connect(lambda results: self.populate_movies(results))
-        self.movie_worker.finished.connect(self.movie_thread.quit)
-        
-        # Set up TV worker
-        self.tv_worker = TvWorker()
-        self.tv_worker.moveToThread(self.tv_thread)
-        self.tv_thread.started.connect(self.tv_worker.run)
-        self.tv_worker.finished.connect(lambda results: self.populate_tv_shows(results))
-        self.tv_worker.finished.connect(self.tv_thread.quit)
-        
-        # Start threads
-        self.movie_thread.start()
-        self.tv_thread.start()
+                stream_trending(self.media_type, 200, self.chunk_ready.emit)  # modified: increased limit to 200 titles
+                self.finished.emit()
+        
+        for media_type in ("movie", "tv"):
+            thread = QtCore.QThread()
+            worker = TrendingWorker(media_type)
+            worker.moveToThread(thread)
+            thread.started.connect(worker.run)
+            worker.chunk_ready.connect(
+                lambda items, media_type=media_type: self.add_trending_chunk(generation, media_type, items))
+            worker.finished.connect(lambda media_type=media_type: self.finish_trending(generation, media_type))
+            worker.finished.connect(thread.quit)
+            thread.worker = worker
+            self.loader_threads.append(thread)
+            thread.start()
         
         # Update the timestamp
         self.update_time_label.setText(f"Last updated: {datetime.now().strftime('%H:%M:%S')}")
     
+    def trending_items(self, media_type):
+        return self.trending_movies if media_type == "movie" else self.trending_tv_shows
+    
+    def add_trending_chunk(self, generation, media_type, items):
+        """Queue cards for a page of trending items as soon as it arrives."""
+        if generation != self.load_generation:
+            return
+        loaded = self.trending_items(media_type)
+        if not loaded:
+            # First page: replace the loading message and fetch details for the first rows ahead of a click
+            self.clear_grid(self.grids[media_type])
+            self.pending_cards[media_type].clear()
+            warm_details(items, media_type)
+        loaded.extend(items)
+        self.queue_cards(media_type, items)
+    
+    def finish_trending(self, generation, media_type):
+        if generation == self.load_generation and not self.trending_items(media_type):
+            self.show_no_results(media_type)
+    
     def clear_grid(self, grid):
         """Clear all items from a grid layout."""
         while grid.count():
@@ -1651,53 +1516,45 @@ class TrendingContentWidget(QtWidgets.QWidget):
             if item.widget():
                 item.widget().deleteLater()
     
+    def show_no_results(self, media_type):
+        no_results = QtWidgets.QLabel("No movies available right now" if media_type == "movie"
+                                      else "No TV shows available right now")
+        no_results.setAlignment(QtCore.Qt.AlignCenter)
+        no_results.setStyleSheet("color: #888; font-style: italic; margin: 40px 0;")
+        self.grids[media_type].addWidget(no_results, 0, 0)
+    
+    def populate_grid(self, media_type, items):
+        """Replace a grid's cards with cards for items (built incrementally)."""
+        self.clear_grid(self.grids[media_type])
+        self.pending_cards[media_type].clear()
+        if not items:
+            self.show_no_results(media_type)
+            return
+        self.queue_cards(media_type, items)
+    
     def populate_movies(self, movies):
         """Populate the movies grid with movie cards."""
-        self.trending_movies = movies
-        self.clear_grid(self.movies_grid)
-        
-        if not movies:
-            no_results = QtWidgets.QLabel("No movies available right now")
-            no_results.setAlignment(QtCore.Qt.AlignCenter)
-            no_results.setStyleSheet("color: #888; font-style: italic; margin: 40px 0;")
-            self.movies_grid.addWidget(no_results, 0, 0)
-            return
-        
-        # Create a card for each movie
-        row, col = 0, 0
-        for movie in movies:
-            card = self.create_content_card(movie, "movie")
-            self.movies_grid.addWidget(card, row, col)
-            
-            # Move to next column or row
-            col += 1
-            if col >= 4:  # 4 columns
-                col = 0
-                row += 1
+        self.populate_grid("movie", movies)
     
     def populate_tv_shows(self, tv_shows):
         """Populate the TV shows grid with TV show cards."""
-        self.trending_tv_shows = tv_shows
-        self.clear_grid(self.tv_grid)
-        
-        if not tv_shows:
-            no_results = QtWidgets.QLabel("No TV shows available right now")
-            no_results.setAlignment(QtCore.Qt.AlignCenter)
-            no_results.setStyleSheet("color: #888; font-style: italic; margin: 40px 0;")
-            self.tv_grid.addWidget(no_results, 0, 0)
-            return
-        
-        # Create a card for each TV show
-        row, col = 0, 0
-        for show in tv_shows:
-            card = self.create_content_card(show, "tv")
-            self.tv_grid.addWidget(card, row, col)
-            
-            # Move to next column or row
-            col += 1
-            if col >= 4:  # 4 columns
-                col = 0
-                row += 1
+        self.populate_grid("tv", tv_shows)
+    
+    def queue_cards(self, media_type, items):
+        self.pending_cards[media_type].extend(items)
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+    
+    def render_pending_cards(self):
+        """Add the next few queued cards to each grid; stops once both queues are empty."""
+        for media_type, pending in self.pending_cards.items():
+            grid = self.grids[media_type]
+            for _ in range(min(self.CARDS_PER_TICK, len(pending))):
+                # Cards fill 4 columns, row by row
+                index = grid.count()
+                grid.addWidget(self.create_content_card(pending.popleft(), media_type), index // 4, index % 4)
+        if not any(self.pending_cards.values()):
+            self.render_timer.stop()
     
     def create_content_card(self, item, media_type):
         """Create a clickable card for a movie or TV show."""
@@ -1740,13 +1597,7 @@ class TrendingContentWidget(QtWidgets.QWidget):
         poster_path = item.get("poster_path")
         if poster_path:
             poster_url = f"https://image.tmdb.org/t/p/w342{poster_path}"
-            pixmap = fetch_image(poster_url)
-            if pixmap and not pixmap.isNull():
-                poster_label.setPixmap(pixmap.scaled(
-                    164, 240, 
-                    QtCore.Qt.KeepAspectRatio, 
-                    QtCore.Qt.SmoothTransformation
-                ))
+            image_service.load_into(poster_label, poster_url, 164, 240)
         else:
             poster_label.setText("No image")
         
@@ -1844,12 +1695,8 @@ class TrendingContentWidget(QtWidgets.QWidget):
     
     def refresh_content(self):
         """Refresh the trending content."""
-        # Clear the cache keys for today's trending content
-        today = datetime.now().strftime('%Y-%m-%d')
-        if f"trending_movies_{today}" in search_cache:
-            del search_cache[f"trending_movies_{today}"]
-        if f"trending_tv_{today}" in search_cache:
-            del search_cache[f"trending_tv_{today}"]
+        # Forget the cached trending pages so they are fetched again
+        response_cache.invalidate("trending")
         
         # Show loading indicators
         self.clear_grid(self.movies_grid)
@@ -2401,9 +2248,7 @@ class MainWindow(QtWidgets.QMainWindow):
             """)
             
             if poster_url:
-                pixmap = fetch_image(poster_url)
-                if pixmap and not pixmap.isNull():
-                    poster_label.setPixmap(pixmap.scaled(50, 75, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+                image_service.load_into(poster_label, poster_url, 50, 75, fallback_text="")
             
             # Info widget
             info_widget = QtWidgets.QWidget()
@@ -2511,6 +2356,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.statusBar().showMessage(f"Loading details for {item_data['title']}...")
         self.progress_bar.setVisible(True)
         
+        cancel_warm_ups()
         self.detail_thread = DetailThread(
             item_data["id"], 
             item_data["media_type"],
@@ -3390,10 +3236,6 @@ def main():
     # Set application style
     app.setStyle("Fusion")
     
-    # Clear any existing caches at startup
-    if hasattr(requests, 'session'):
-        requests.session().close()
-    
     # Pre-create application cache directories if they don't exist
     cache_dir = os.path.join(os.path.expanduser("~"), ".movietv_insight_cache")
     if not os.path.exists(cache_dir):
@@ -3423,9 +3265,6 @@ def main():
         # Preload trending movies and shows to speed up first display
         get_trending_movies(limit=8)
         get_trending_tv_shows(limit=8)
-        # Initialize connection pool for requests
-        session = requests.Session()
-        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20))
     
     # Start preloading in background
     preload_thread = QtCore.QThread()
@@ -3437,14 +3276,6 @@ def main():
     
     # Initialize application cache to improve performance
     if not hasattr(MainWindow, '_initialized'):
-        # Create persistent disk cache for images
-        cache_path = os.path.join(cache_dir, "image_cache")
-        if not os.path.exists(cache_path):
-            try:
-                os.makedirs(cache_path)
-            except:
-                print("Could not create image cache directory")
-        
         # Set up memory cache for frequently accessed data
         global_cache = {}
         MainWindow._initialized = True
@@ -3468,7 +3299,16 @@ def main():
     
     QtCore.QTimer.singleShot(500, delayed_init)
     
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    api_pool.shutdown(wait=False, cancel_futures=True)
+    listing_pool.shutdown(wait=False, cancel_futures=True)
+    prefetch_pool.shutdown(wait=False, cancel_futures=True)
+    image_service.shutdown()
+    suggestion_engine.shutdown()
+    http.close()
+    print(response_cache.summary())
+    print(suggestion_engine.summary())
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     import os
@@ -0,0 +1,213 @@
+"""As-you-type suggestion engine behind AutoCompleteLineEdit in d.py.
+
+Remote lookups run on worker threads; a newer query cancels queued lookups and
+discards the answers of ones already in flight. Results are remembered per
+query, so a query that only narrows an exhaustive earlier result is answered by
+filtering it, and a small trie of recently seen titles gives instant local
+completions while a lookup is pending. No Qt dependency, so it can be tested on
+its own.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Lower-case words joined by single spaces, punctuation dropped."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def matches(query_words, title):
+    """True if every query word starts some word of title (so 'dark kni' matches 'The Dark Knight')."""
+    title_words = normalize(title).split()
+    return all(any(word.startswith(part) for word in title_words) for part in query_words)
+
+
+class TitleTrie:
+    """Prefix tree over recently seen titles, indexed from the start of every word.
+
+    Holds at most max_titles entries; the least recently seen title is dropped first.
+    """
+
+    def __init__(self, max_titles=500):
+        self.max_titles = max_titles
+        self.root = {}
+        self.titles = OrderedDict()  # label -> normalized title, least recently seen first
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _keys(self, normalized):
+        words = normalized.split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def add(self, label, title):
+        normalized = normalize(title)
+        if not normalized:
+            return
+        if label in self.titles:
+            self.titles.move_to_end(label)
+            return
+        self.titles[label] = normalized
+        for key in self._keys(normalized):
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+                node.setdefault("", set()).add(label)
+        if len(self.titles) > self.max_titles:
+            self._remove(*self.titles.popitem(last=False))
+
+    def _remove(self, label, normalized):
+        for key in self._keys(normalized):
+            path = []
+            node = self.root
+            for char in key:
+                if char not in node:
+                    break  # Shared with a key of this title that was already pruned
+                path.append((node, char))
+                node = node[char]
+                node[""].discard(label)
+            # Prune branches no title passes through any more
+            for parent, char in reversed(path):
+                if parent[char][""]:
+                    break
+                del parent[char]
+
+    def complete(self, prefix, limit=10):
+        """Labels whose title has a word sequence starting with prefix, most recently seen first."""
+        node = self.root
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        found = node.get("", ())
+        return [label for label in reversed(self.titles) if label in found][:limit]
+
+
+class SuggestionEngine:
+    """Cancellable, prefix-reusing suggestion lookups.
+
+    fetch(query) runs on a worker thread and returns ([(label, title), ...], complete),
+    where complete means the remote side has no further matches, so any narrower
+    query can be answered by filtering these results.
+    """
+
+    def __init__(self, fetch, max_results=10, cache_size=128, trie_size=500, workers=2, latency_window=200):
+        self.fetch = fetch
+        self.max_results = max_results
+        self.cache_size = cache_size
+        self.trie = TitleTrie(trie_size)
+        self.requests = 0
+        self.local_answers = 0
+        self.remote_fetches = 0
+        self.discarded = 0
+        self._cache = OrderedDict()  # normalized query -> (records, complete)
+        self._latencies = deque(maxlen=latency_window)  # seconds per remote fetch
+        self._generation = 0
+        self._future = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="suggest")
+
+    def _remember(self, key, records, complete):
+        self._cache[key] = (records, complete)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, key):
+        """Cached records for key, or filtered records of an exhaustive shorter query, or None."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached[0]
+        words = key.split()
+        for length in range(len(key) - 1, 0, -1):
+            parent = self._cache.get(key[:length])
+            if parent is not None and parent[1]:
+                records = [record for record in parent[0] if matches(words, record[1])]
+                self._remember(key, records, True)
+                return records
+        return None
+
+    def local(self, query):
+        """Answer without the network: (labels, exact). exact=False means trie guesses only."""
+        key = normalize(query)
+        if not key:
+            return [], True
+        with self._lock:
+            records = self._lookup(key)
+            if records is not None:
+                return [label for label, _ in records[:self.max_results]], True
+            return self.trie.complete(key, self.max_results), False
+
+    def request(self, query, callback):
+        """Deliver suggestions for query via callback(query, labels); older requests are superseded.
+
+        Answers that need no network are delivered before this returns; others
+        arrive on a worker thread.
+        """
+        self.requests += 1
+        labels, exact = self.local(query)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._future is not None:
+                self._future.cancel()  # Only succeeds while still queued
+                self._future = None
+        if exact:
+            self.local_answers += 1
+            callback(query, labels)
+            return
+        with self._lock:
+            self._future = self._pool.submit(self._fetch, query, generation, callback)
+
+    def cancel(self):
+        """Drop any pending request, e.g. when the text is cleared."""
+        with self._lock:
+            self._generation += 1
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+
+    def _fetch(self, query, generation, callback):
+        start = time.perf_counter()
+        try:
+            records, complete = self.fetch(query)
+        except Exception as e:
+            print(f"Error fetching suggestions: {e}")
+            return
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+            self.remote_fetches += 1
+            self._remember(normalize(query), records, complete)
+            for label, title in records:
+                self.trie.add(label, title)
+            current = generation == self._generation
+            if not current:
+                self.discarded += 1
+        if current:
+            callback(query, [label for label, _ in records[:self.max_results]])
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """Remote fetch latency in milliseconds at each percentile (nearest rank) over recent fetches."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {}
+        return {f"p{p}": round(samples[min(len(samples) - 1, max(0, -(-p * len(samples) // 100) - 1))] * 1000, 1)
+                for p in percentiles}
+
+    def summary(self):
+        """One-line report, e.g. for choosing the debounce interval."""
+        latencies = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.latency_percentiles().items())
+        return (f"Suggestions: {self.requests} requests, {self.local_answers} answered locally, "
+                f"{self.remote_fetches} fetched, {self.discarded} superseded"
+                + (f"; fetch latency {latencies}" if latencies else ""))
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
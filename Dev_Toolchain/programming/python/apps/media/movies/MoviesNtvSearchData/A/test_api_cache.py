@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent response cache used by d.py
+A stub HTTP server on localhost stands in for TMDB/OMDb, so no API key or PyQt5 is needed
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# Add the current directory to Python path to import api_cache
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_cache import MISSING, CachedHttp, ResponseCache, make_session, request_key
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Echoes the path and query back as JSON; /error/... answers 500, /slow/... waits first."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled connections are reused
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        self.server.requests.append(self.path)
+        if parsed.path.startswith("/error"):
+            self.send_error(500)
+            return
+        if parsed.path.startswith("/slow"):
+            time.sleep(0.3)
+        body = json.dumps({"path": parsed.path, "query": parse_qs(parsed.query),
+                           "results": [{"id": len(self.server.requests)}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ApiCacheTestCase(unittest.TestCase):
+    """Starts the stub server and opens a cache in a temporary directory."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.requests = []
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.test_dir = tempfile.mkdtemp(prefix="api_cache_test_")
+        self.db_path = os.path.join(self.test_dir, "response_cache.sqlite")
+        self.clock = FakeClock()
+        self.caches = []
+        self.session = make_session(pool_size=8)
+
+    def tearDown(self):
+        self.session.close()
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def open_cache(self, **kwargs):
+        cache = ResponseCache(self.db_path, clock=self.clock, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def client(self, cache):
+        return CachedHttp(cache, session=self.session, timeout=5)
+
+    def url(self, path):
+        return self.base_url + path
+
+
+class TestCachedHttp(ApiCacheTestCase):
+
+    def test_repeat_request_is_served_from_cache(self):
+        http = self.client(self.open_cache())
+        first = http.get_json(self.url("/movie/1"), {"language": "en-US"}, "details")
+        second = http.get_json(self.url("/movie/1"), {"language": "en-US"}, "details")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.server.requests), 1)
+        other = http.get_json(self.url("/movie/1"), {"language": "de-DE"}, "details")
+        self.assertNotEqual(other, first)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_entries_expire_after_endpoint_ttl(self):
+        http = self.client(self.open_cache(ttls={"search": 60}))
+        http.get_json(self.url("/search/multi"), {"query": "alien"}, "search")
+        http.get_json(self.url("/movie/2"), None, "details")
+        self.clock.now += 61
+        http.get_json(self.url("/search/multi"), {"query": "alien"}, "search")
+        http.get_json(self.url("/movie/2"), None, "details")
+        self.assertEqual(self.server.requests, ["/search/multi?query=alien", "/movie/2", "/search/multi?query=alien"])
+
+    def test_explicit_ttl_overrides_endpoint(self):
+        http = self.client(self.open_cache())
+        http.get_json(self.url("/trending/movie/day"), None, "trending", ttl=5)
+        self.clock.now += 6
+        http.get_json(self.url("/trending/movie/day"), None, "trending")
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_errors_are_not_cached(self):
+        cache = self.open_cache()
+        http = self.client(cache)
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                http.get_json(self.url("/error/movie/3"), None, "details")
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_secret_params_are_sent_but_not_keyed(self):
+        http = self.client(self.open_cache())
+        http.get_json(self.url("/movie/4"), {"api_key": "one", "page": 1}, "details")
+        http.get_json(self.url("/movie/4"), {"page": 1, "api_key": "two"}, "details")
+        self.assertEqual(self.server.requests, ["/movie/4?api_key=one&page=1"])
+        self.assertEqual(request_key("u", {"apikey": "k", "i": "tt1", "y": None}), "u?i=tt1")
+
+    def test_cache_survives_reopening(self):
+        self.client(self.open_cache()).get_json(self.url("/movie/5/credits"), None, "credits")
+        self.caches.pop().close()
+        cache = self.open_cache()
+        self.client(cache).get_json(self.url("/movie/5/credits"), None, "credits")
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertGreater(cache.total_bytes, 0)
+
+    def test_concurrent_requests_take_the_slowest_not_the_sum(self):
+        http = self.client(self.open_cache())
+        urls = [self.url(f"/slow/movie/{n}") for n in range(6)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda url: http.get_json(url, None, "details"), urls))
+        elapsed = time.perf_counter() - start
+        self.assertEqual([result["path"] for result in results], [f"/slow/movie/{n}" for n in range(6)])
+        self.assertLess(elapsed, 6 * 0.3 / 2)
+        self.assertEqual(len(self.server.requests), 6)
+
+
+class TestResponseCacheBudget(ApiCacheTestCase):
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self.open_cache(max_bytes=250)
+        for name in ("a", "b", "c"):
+            cache.put(name, "x" * 70)
+            self.clock.now += 1
+        cache.get("a")  # "b" is now the least recently used
+        self.clock.now += 1
+        cache.put("d", "x" * 70)
+        self.assertIs(cache.get("b"), MISSING)
+        for name in ("a", "c", "d"):
+            self.assertEqual(cache.get(name), "x" * 70)
+        self.assertLessEqual(cache.total_bytes, 250)
+
+    def test_expired_entries_are_evicted_first(self):
+        cache = self.open_cache(max_bytes=250, ttls={"short": 10})
+        cache.put("old", "x" * 70, "short")
+        self.clock.now += 1
+        cache.put("b", "x" * 70)
+        cache.put("c", "x" * 70)
+        self.clock.now += 20
+        cache.put("d", "x" * 70)
+        self.assertEqual(cache.stats()["entries"], 3)
+        self.assertEqual(cache.get("b"), "x" * 70)
+
+    def test_replacing_an_entry_keeps_byte_count(self):
+        cache = self.open_cache()
+        cache.put("a", [1, 2, 3])
+        size = cache.total_bytes
+        cache.put("a", [1, 2, 3])
+        self.assertEqual(cache.total_bytes, size)
+
+    def test_invalidate_endpoint(self):
+        cache = self.open_cache()
+        cache.put("t", {"page": 1}, "trending")
+        cache.put("d", {"id": 1}, "details")
+        cache.invalidate("trending")
+        self.assertIs(cache.get("t", "trending"), MISSING)
+        self.assertEqual(cache.get("d", "details"), {"id": 1})
+        cache.invalidate()
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_hit_rate_counters(self):
+        cache = self.open_cache()
+        http = self.client(cache)
+        for _ in range(4):
+            http.get_json(self.url("/search/multi"), {"query": "heat"}, "search")
+        http.get_json(self.url("/movie/6"), None, "details")
+        stats = cache.stats()
+        self.assertEqual(stats["endpoints"]["search"], {"hits": 3, "misses": 1, "hit_rate": 0.75})
+        self.assertEqual(stats["endpoints"]["details"]["hit_rate"], 0.0)
+        self.assertEqual(stats["entries"], 2)
+        self.assertIn("search 75% of 4", cache.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
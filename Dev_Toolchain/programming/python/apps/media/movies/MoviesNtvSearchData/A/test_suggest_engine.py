@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the as-you-type suggestion engine used by AutoCompleteLineEdit
+A fake fetch function stands in for TMDB, so no network or PyQt5 is needed
+"""
+import os
+import sys
+import threading
+import unittest
+
+# Add the current directory to Python path to import suggest_engine
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from suggest_engine import SuggestionEngine, TitleTrie, matches, normalize
+
+CATALOGUE = [
+    "The Dark Knight", "The Dark Knight Rises", "Dark", "Darkest Hour", "Alien", "Aliens",
+    "Alien: Romulus", "The Darjeeling Limited", "Dune", "Dunkirk",
+]
+
+
+class FakeTmdb:
+    """Returns catalogue titles matching the query, at most page_size of them."""
+
+    def __init__(self, page_size=10):
+        self.page_size = page_size
+        self.queries = []
+        self.gates = {}  # query -> Event the fetch waits on
+
+    def __call__(self, query):
+        self.queries.append(query)
+        gate = self.gates.get(query)
+        if gate is not None:
+            gate.wait(5)
+        if query == "boom":
+            raise ConnectionError("timeout")
+        words = normalize(query).split()
+        found = [title for title in CATALOGUE if matches(words, title)]
+        return [(f"{title} - Movie", title) for title in found[:self.page_size]], len(found) <= self.page_size
+
+
+class Collector:
+    def __init__(self):
+        self.results = []
+        self.done = threading.Event()
+
+    def __call__(self, query, labels):
+        self.results.append((query, labels))
+        self.done.set()
+
+    def wait(self):
+        if not self.done.wait(5):
+            raise AssertionError("no suggestions were delivered")
+        self.done.clear()
+        return self.results[-1]
+
+
+class SuggestionEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmdb = FakeTmdb()
+        self.engine = SuggestionEngine(self.tmdb)
+        self.collect = Collector()
+
+    def tearDown(self):
+        self.engine.shutdown()
+
+    def fetch(self, query):
+        self.engine.request(query, self.collect)
+        return self.collect.wait()[1]
+
+
+class TestPrefixReuse(SuggestionEngineTestCase):
+
+    def test_narrowed_query_is_filtered_locally(self):
+        self.assertEqual(len(self.fetch("dar")), 5)
+        self.assertEqual(self.fetch("dark kni"), ["The Dark Knight - Movie", "The Dark Knight Rises - Movie"])
+        self.assertEqual(self.fetch("dark knight ri"), ["The Dark Knight Rises - Movie"])
+        self.assertEqual(self.tmdb.queries, ["dar"])
+        self.assertEqual(self.engine.local_answers, 2)
+
+    def test_truncated_results_are_not_reused(self):
+        self.tmdb.page_size = 2
+        self.fetch("dar")
+        self.assertEqual(self.fetch("dark"), ["The Dark Knight - Movie", "The Dark Knight Rises - Movie"])
+        self.assertEqual(self.tmdb.queries, ["dar", "dark"])
+
+    def test_repeated_query_is_not_refetched(self):
+        self.fetch("Alien")
+        self.assertEqual(self.fetch("  alien "), self.fetch("ALIEN"))
+        self.assertEqual(self.tmdb.queries, ["Alien"])
+
+    def test_local_answers_while_typing(self):
+        self.assertEqual(self.engine.local("dun"), ([], False))
+        self.fetch("alie")
+        self.assertEqual(self.engine.local("alien rom"), (["Alien: Romulus - Movie"], True))
+        # Titles seen for other queries complete from any word through the trie
+        self.assertEqual(self.engine.local("rom"), (["Alien: Romulus - Movie"], False))
+
+
+class TestCancellation(SuggestionEngineTestCase):
+
+    def test_superseded_answer_is_discarded(self):
+        gate = self.tmdb.gates["dun"] = threading.Event()
+        self.engine.request("dun", self.collect)
+        self.engine.request("ali", self.collect)
+        self.assertEqual(self.collect.wait(), ("ali", ["Alien - Movie", "Aliens - Movie", "Alien: Romulus - Movie"]))
+        gate.set()
+        self.engine.shutdown()
+        self.engine._pool.shutdown(wait=True)
+        self.assertEqual([query for query, _ in self.collect.results], ["ali"])
+        self.assertEqual(self.engine.discarded, 1)
+        # The late answer is still cached for later prefixes
+        self.assertEqual(self.engine.local("dune"), (["Dune - Movie"], True))
+
+    def test_queued_request_is_cancelled(self):
+        engine = SuggestionEngine(self.tmdb, workers=1)
+        gate = self.tmdb.gates["dun"] = threading.Event()
+        engine.request("dun", self.collect)
+        engine.request("dar", self.collect)
+        engine.request("ali", self.collect)
+        gate.set()
+        self.collect.wait()
+        engine.shutdown()
+        engine._pool.shutdown(wait=True)
+        self.assertNotIn("dar", self.tmdb.queries)
+        self.assertEqual([query for query, _ in self.collect.results], ["ali"])
+
+    def test_fetch_errors_are_not_cached(self):
+        self.engine.request("boom", self.collect)
+        self.engine.shutdown()
+        self.engine._pool.shutdown(wait=True)
+        self.assertEqual(self.collect.results, [])
+        self.assertEqual(self.engine.local("boom"), ([], False))
+
+
+class TestLatencyStats(SuggestionEngineTestCase):
+
+    def test_percentiles(self):
+        self.assertEqual(self.engine.latency_percentiles(), {})
+        self.engine._latencies.extend(n / 1000 for n in range(1, 101))
+        self.assertEqual(self.engine.latency_percentiles(), {"p50": 50.0, "p90": 90.0, "p99": 99.0})
+        self.assertEqual(self.engine.latency_percentiles((0, 100)), {"p0": 1.0, "p100": 100.0})
+
+    def test_summary_counts_requests(self):
+        self.fetch("dar")
+        self.fetch("dark")
+        summary = self.engine.summary()
+        self.assertIn("2 requests, 1 answered locally, 1 fetched", summary)
+        self.assertIn("p50", summary)
+
+
+class TestTitleTrie(unittest.TestCase):
+
+    def test_completes_from_any_word(self):
+        trie = TitleTrie()
+        trie.add("The Dark Knight (2008) - Movie", "The Dark Knight")
+        trie.add("Dark (2017) - TV Show", "Dark")
+        self.assertEqual(trie.complete("dark"), ["Dark (2017) - TV Show", "The Dark Knight (2008) - Movie"])
+        self.assertEqual(trie.complete("KNIGHT"), ["The Dark Knight (2008) - Movie"])
+        self.assertEqual(trie.complete("dark kn"), ["The Dark Knight (2008) - Movie"])
+        self.assertEqual(trie.complete("light"), [])
+
+    def test_oldest_titles_are_dropped(self):
+        trie = TitleTrie(max_titles=2)
+        trie.add("A", "Alpha Beta")
+        trie.add("B", "Beta Beta")
+        trie.add("A", "Alpha Beta")  # Seen again, so B is now the oldest
+        trie.add("C", "Gamma")
+        self.assertEqual(len(trie), 2)
+        self.assertEqual(trie.complete("beta"), ["A"])
+        node = trie.root
+        for char in "beta":
+            node = node[char]
+        self.assertNotIn(" ", node)  # "beta beta" went with B
+        self.assertEqual(trie.complete("gam"), ["C"])
+
+
+if __name__ == "__main__":
+    unittest.main()